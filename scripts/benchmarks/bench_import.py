@@ -0,0 +1,93 @@
+"""
+import-time 回歸檢查：`import pdfize.__main__` (即 `pdfize --help`、`--version` 的啟動成本)
+
+以 `python -X importtime` 量測 (取多次中的最小值)，超過時間預算，
+或 import 了應延後到子命令才載入的模組 (fitz、PIL、tqdm、處理器等) 時，以 exit code 1 結束
+
+Usage
+-----
+    python scripts/benchmarks/bench_import.py [-b BUDGET_MS] [-r REPEAT] [-v]
+"""
+
+# standard library
+import argparse
+import re
+import subprocess
+import sys
+
+TARGET = "pdfize.__main__"
+
+# 啟動時不應載入的模組 (前綴)
+DEFERRED = [
+    "fitz",
+    "pymupdf",
+    "PIL",
+    "tqdm",
+    "multiprocessing",
+    "pdfize.processor",
+    "pdfize.aio",
+    "pdfize.cache",
+    "pdfize.checkpoint",
+    "pdfize.discovery",
+    "pdfize.tracing",
+    "pdfize.new_process",
+    "pdfize.server",
+    "pdfize.progress_bar.cli",
+]
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure() -> dict[str, tuple[int, int, int]]:
+    """
+    Returns
+    -------
+    + dict[str, tuple[int, int, int]]
+        {模組: (self (us), cumulative (us), 深度)}
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {TARGET}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    modules = {}
+    for match in LINE.finditer(result.stderr):
+        self_us, cumulative_us, indent, module = match.groups()
+        modules[module] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-b", "--budget", type=float, default=100.0, help="ms")
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("-v", "--verbose", action="store_true", help="show slowest imports")
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.repeat)]
+    best = min(runs, key=lambda modules: modules[TARGET][1])
+    elapsed = best[TARGET][1] / 1000
+
+    if args.verbose:
+        slowest = sorted(best.items(), key=lambda item: -item[1][1])[:20]
+        for module, (_, cumulative_us, depth) in slowest:
+            print(f"{cumulative_us / 1000:>8.1f}ms {'  ' * depth}{module}")
+        print()
+
+    deferred = sorted(
+        module
+        for module in best
+        if any(module == prefix or module.startswith(f"{prefix}.") for prefix in DEFERRED)
+    )
+    print(f"import {TARGET}: {elapsed:.1f}ms (budget {args.budget:.0f}ms)")
+    failed = elapsed > args.budget
+    if deferred:
+        print(f"imported at startup (should be deferred): {', '.join(deferred)}")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+memory budget benchmark：高 DPI 的 `pdf-to-img --parallel`，有無 `--memory-budget`、
+`--band-size` 的時間與所有進程 RSS 總和的峰值 (每 50ms 取樣 /proc，僅限 Linux)
+
++ huge  : A0 頁面 (每頁 pixmap 數百 MB，預算限制同時渲染的頁數；分條帶時只需容納幾條帶)
++ mixed : 一般大小的頁面 (預算足夠時應與不限制一樣快)
+
+Usage
+-----
+    python scripts/benchmarks/bench_memory.py [--corpus DIR] [-d DPI] [-w WORKERS] [-b BUDGET ...]
+        [--band-size BAND]
+"""
+
+# standard library
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# local module
+from corpus import make_corpus
+
+
+def tree_rss(pid: int) -> int:
+    """
+    進程 (與所有子進程) 的 RSS 總和 (KB)
+    """
+    total = 0
+    pids = [pid]
+    while pids:
+        current = pids.pop()
+        try:
+            with open(f"/proc/{current}/status", encoding="utf-8") as status:
+                total += next(int(line.split()[1]) for line in status if line.startswith("VmRSS:"))
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children", encoding="utf-8") as children:
+                    pids += [int(child) for child in children.read().split()]
+        except (OSError, StopIteration):  # 進程已結束
+            continue
+    return total
+
+
+def run(args: list[str]) -> tuple[float, float]:
+    """
+    以新的子進程執行 CLI (輸出寫到暫時目錄)
+
+    Returns
+    -------
+    + tuple[float, float]
+        (秒數, 所有進程 RSS 總和的峰值 (MB))
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        command = [sys.executable, "-m", "pdfize", "--no-pbar", *args, "-o", temp_dir]
+        begin = time.perf_counter()
+        process = subprocess.Popen(command)
+        peak = 0
+        while process.poll() is None:
+            peak = max(peak, tree_rss(process.pid))
+            time.sleep(0.05)
+        elapsed = time.perf_counter() - begin
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command)
+    return elapsed, peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", type=Path, help="corpus directory (generated if missing)")
+    parser.add_argument("-d", "--dpi", type=int, default=300)
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("-b", "--budget", type=int, nargs="+", default=[2048, 4096], help="MB")
+    parser.add_argument("--band-size", type=int, default=64, help="MB")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        corpus = make_corpus(args.corpus or Path(temp_dir) / "corpus", ["huge", "mixed"])
+        print(f"{'corpus':<7} {'budget':>9} {'band':>7} {'time':>8} {'peak RSS':>10}")
+        for kind in ("huge", "mixed"):
+            cases: list[tuple[int | None, int | None]] = [
+                *((budget, None) for budget in [None, *args.budget]),
+                (None, args.band_size),
+            ]
+            for budget, band_size in cases:
+                options = ["--parallel", "-w", str(args.workers), "-d", str(args.dpi)]
+                if budget is not None:
+                    options += ["--memory-budget", str(budget)]
+                if band_size is not None:
+                    options += ["--band-size", str(band_size)]
+                elapsed, peak = run(["pdf-to-img", str(corpus[kind]), *options])
+                budget_label = "none" if budget is None else f"{budget}MB"
+                band_label = "none" if band_size is None else f"{band_size}MB"
+                print(
+                    f"{kind:<7} {budget_label:>9} {band_label:>7} {elapsed:>7.2f}s {peak:>8.1f}MB",
+                    flush=True,
+                )
+
+
+if __name__ == "__main__":
+    main()
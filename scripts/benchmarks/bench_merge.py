@@ -0,0 +1,101 @@
+"""
+merge benchmark：單進程 `merge` vs 平行分組合併 (`merge --parallel`)，比較時間與 peak RSS
+
+Usage
+-----
+    python scripts/benchmarks/bench_merge.py [-n COUNT ...] [-w WORKERS] [-g GROUP_SIZE]
+"""
+
+# standard library
+import argparse
+import io
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# third party library
+import fitz
+from PIL import Image
+
+
+def make_invoices(invoice_dir: Path, count: int) -> None:
+    """
+    產生模擬發票的小 PDF (每份 1 ~ 2 頁，含文字與一張 logo)
+    """
+    invoice_dir.mkdir()
+    logo = io.BytesIO()
+    Image.effect_noise((300, 120), 60).convert("RGB").save(logo, "JPEG", quality=90)
+
+    for i in range(count):
+        with fitz.open() as doc:
+            for page_number in range(1 + i % 2):
+                page = doc.new_page()
+                page.insert_image(fitz.Rect(40, 40, 190, 100), stream=logo.getvalue())
+                page.insert_text((40, 140), f"Invoice #{i:0>6} page {page_number + 1}")
+                page.insert_textbox(fitz.Rect(40, 160, 560, 760), f"item {i} " * 400)
+            doc.save(invoice_dir / f"invoice-{i:0>6}.pdf")
+
+
+RUN_CODE = """
+import resource, sys
+from pdfize.__main__ import pdfize
+try:
+    pdfize(sys.argv[1:])
+except SystemExit as exit:
+    assert not exit.code
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+print(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+"""
+
+
+def run(args: list[str]) -> tuple[float, float, float]:
+    """
+    以新的子進程執行 CLI
+
+    Returns
+    -------
+    + tuple[float, float, float]
+        (秒數, 主進程 peak RSS (MB), worker 中最大的 peak RSS (MB))
+    """
+    begin = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", RUN_CODE, "--no-pbar", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - begin
+    main_rss, worker_rss = (int(line) / 1024 for line in result.stdout.split())  # Linux: KB
+    return elapsed, main_rss, worker_rss
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--count", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument("-w", "--workers", type=int, default=4)
+    parser.add_argument("-g", "--group-size", type=int, default=4, help="MB")
+    args = parser.parse_args()
+
+    print(f"{'inputs':>7} {'mode':>9} {'time':>8} {'main RSS':>10} {'worker RSS':>11}")
+    for count in args.count:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            make_invoices(root / "invoices", count)
+            modes = {
+                "single": [],
+                "parallel": ["--parallel", "-w", str(args.workers), "-g", str(args.group_size)],
+            }
+            for label, options in modes.items():
+                elapsed, main_rss, worker_rss = run(
+                    ["merge", str(root / "invoices"), "-o", str(root / f"{label}.pdf"), *options]
+                )
+                print(
+                    f"{count:>7} {label:>9} {elapsed:>7.2f}s "
+                    f"{main_rss:>8.1f}MB {worker_rss:>9.1f}MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
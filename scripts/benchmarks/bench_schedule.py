@@ -0,0 +1,145 @@
+"""
+排程策略 benchmark：靜態連續分塊 (`divide`) vs 成本排序的小工作單元 (`make_work_units`)
+
+Usage
+-----
+    python scripts/benchmarks/bench_schedule.py [-w WORKERS] [-d DPI]
+"""
+
+# standard library
+import argparse
+import concurrent.futures as future
+import heapq
+import io
+import tempfile
+import time
+from pathlib import Path
+
+# third party library
+import fitz
+from PIL import Image
+
+# local module
+from pdfize.processor.pdf_processor import PdfSingleProcessor
+from pdfize.util import path_util, pdf_util
+
+
+def make_skewed_pdf(pdf_path: Path) -> None:
+    """
+    產生偏斜的文件：前段為純文字章節，後段為圖片與向量繁重的附錄
+    """
+    noise = io.BytesIO()
+    Image.effect_noise((2000, 2000), 80).convert("RGB").save(noise, "PNG")
+
+    with fitz.open() as doc:
+        for i in range(48):  # 純文字章節
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Chapter page {i + 1}", fontsize=12)
+            page.insert_textbox(fitz.Rect(72, 100, 520, 760), "lorem ipsum dolor sit amet " * 80)
+        for _ in range(8):  # 圖片附錄
+            page = doc.new_page()
+            for k in range(3):
+                rect = fitz.Rect(50, 50 + k * 240, 550, 280 + k * 240)
+                page.insert_image(rect, stream=noise.getvalue())
+        for _ in range(8):  # 向量附錄
+            page = doc.new_page()
+            for k in range(1500):
+                page.draw_line((k % 600, k % 800), ((k * 7) % 600, (k * 13) % 800), width=0.3)
+        doc.save(pdf_path)
+
+
+def divide(page_count: int, workers: int) -> list[range]:
+    """
+    靜態連續分塊 (原本的排程)：頁面依序平均切成 `workers` 份，餘數分給前面的 workers
+
+    Returns
+    -------
+    + list[range]
+        每個 worker 負責的頁碼 (0-based indexing)
+
+    Example
+    -------
+    >>> divide(254, 5)
+    [range(0, 51), range(51, 102), range(102, 153), range(153, 204), range(204, 254)]
+    """
+    workers = min(workers, page_count)
+    units = []
+    start = 0
+    for i in range(workers):
+        end = start + page_count // workers + (i < page_count % workers)
+        units.append(range(start, end))
+        start = end
+    return units
+
+
+def run(pdf_path: Path, units: list[range], workers: int, dpi: int, out_dir: Path) -> float:
+    """實際以 process pool 執行，回傳 wall-clock 秒數"""
+    processor = PdfSingleProcessor(str(pdf_path))
+    path_util.try_makedir(out_dir)
+    begin = time.perf_counter()
+    with future.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                processor._one_pdf_to_images, pdf_path, out_dir / "page", dpi, "png", pages=pages
+            )
+            for pages in units
+        ]
+        for done in future.as_completed(futures):
+            done.result()
+    return time.perf_counter() - begin
+
+
+def simulate(page_times: list[float], units: list[range], workers: int) -> float:
+    """以實測的單頁時間模擬共享佇列 (list scheduling)，回傳 makespan 秒數"""
+    finish_times = [0.0] * workers
+    for pages in units:
+        earliest = heapq.heappop(finish_times)
+        heapq.heappush(finish_times, earliest + sum(page_times[i] for i in pages))
+    return max(finish_times)
+
+
+def measure_page_times(pdf_path: Path, dpi: int, out_dir: Path) -> list[float]:
+    """單進程逐頁實測渲染 + 存檔時間"""
+    processor = PdfSingleProcessor(str(pdf_path))
+    path_util.try_makedir(out_dir)
+    page_times = []
+    for page_index in range(pdf_util.get_pdf_page_count(pdf_path)):
+        begin = time.perf_counter()
+        processor._one_pdf_to_images(pdf_path, out_dir / "page", dpi, "png", pages=[page_index])
+        page_times.append(time.perf_counter() - begin)
+    return page_times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-w", "--workers", type=int, default=4)
+    parser.add_argument("-d", "--dpi", type=int, default=150)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        pdf_path = root / "skewed.pdf"
+        make_skewed_pdf(pdf_path)
+        page_count = pdf_util.get_pdf_page_count(pdf_path)
+
+        strategies = {
+            "divide": divide(page_count, args.workers),
+            "cost-units": pdf_util.make_work_units(
+                pdf_util.estimate_page_costs(pdf_path, args.dpi), args.workers
+            ),
+        }
+        page_times = measure_page_times(pdf_path, args.dpi, root / "serial")
+
+        print(f"{page_count} pages, {args.workers} workers, {args.dpi} dpi")
+        print(f"serial total: {sum(page_times):.2f}s")
+        for label, units in strategies.items():
+            wall = run(pdf_path, units, args.workers, args.dpi, root / label)
+            simulated = simulate(page_times, units, args.workers)
+            print(
+                f"{label:>10}: {len(units):>3} units, "
+                f"wall-clock {wall:.2f}s, simulated makespan {simulated:.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+benchmark suite：以合成語料 (見 corpus.py) 執行每個 CLI 命令與處理路徑，
+記錄 pages/sec、輸出大小、peak RSS 與啟動時間 (JSON)，並可與儲存的 baseline 比較，標出退步的項目
+
++ pdf-to-img : 各語料 × DPI × 格式 × (單進程 / 各 worker 數)
++ encode     : text、mixed × 格式 × 編碼 profile × (單進程 / 最多 worker 數)，
+               最後列出各 profile 相對於 balanced 的吞吐量與輸出大小
++ img-to-pdf : photos × (單進程 / 各 worker 數)
++ merge      : tiny × (單進程 / 各 worker 數)
++ split      : text、mixed 每頁拆分 × (單進程 / 各 worker 數)
+
+Usage
+-----
+    python scripts/benchmarks/bench_suite.py [-o RESULT_JSON] [-b BASELINE_JSON] [-t THRESHOLD]
+        [--corpus DIR] [-s SCALE] [-d DPI ...] [-f FORMAT ...] [-w WORKERS ...] [-p PROFILE ...]
+        [-r REPEAT] [-k PATTERN] [--list]
+
+Example
+-------
+    python scripts/benchmarks/bench_suite.py -o baseline.json
+    python scripts/benchmarks/bench_suite.py -o result.json -b baseline.json
+"""
+
+# standard library
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from importlib.metadata import version
+from pathlib import Path
+
+# third party library
+import fitz
+
+# local module
+from corpus import make_corpus
+
+RUN_CODE = """
+import resource, sys
+from pdfize.__main__ import pdfize
+try:
+    pdfize(sys.argv[1:])
+except SystemExit as exit:
+    assert not exit.code
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+print(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+"""
+
+PDF_KINDS = ["text", "images", "mixed", "huge", "tiny"]
+SPLIT_KINDS = ["text", "mixed"]
+ENCODE_KINDS = ["text", "mixed"]
+
+
+def count_pages(path: Path) -> int:
+    """
+    pdf 的頁數 (目錄則為其中所有 pdf 頁數的總和；圖片目錄則為圖片數)
+    """
+    if path.is_dir():
+        return sum(count_pages(child) if child.suffix == ".pdf" else 1 for child in path.iterdir())
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+def build_cases(
+    corpus: dict[str, Path],
+    dpis: list[int],
+    formats: list[str],
+    workers: list[int],
+    profiles: list[str],
+) -> list[tuple[str, list[str], int]]:
+    """
+    Returns
+    -------
+    + list[tuple[str, list[str], int]]
+        (名稱, CLI 參數 (`{output}` 為輸出路徑), 頁數)
+    """
+    modes = [("single", [])] + [(f"w{w}", ["--parallel", "-w", str(w)]) for w in workers]
+    cases = []
+    for kind in PDF_KINDS:
+        pages = count_pages(corpus[kind])
+        for dpi in dpis:
+            for format in formats:
+                for label, options in modes:
+                    args = ["pdf-to-img", str(corpus[kind]), "-o", "{output}"]
+                    args += ["-d", str(dpi), "-f", format, *options]
+                    cases.append((f"pdf-to-img/{kind}/{dpi}dpi/{format}/{label}", args, pages))
+
+    cases += build_encode_cases(corpus, max(dpis), formats, [modes[0], modes[-1]], profiles)
+
+    for label, options in modes:
+        args = ["img-to-pdf", str(corpus["photos"]), "-o", "{output}.pdf", *options]
+        cases.append((f"img-to-pdf/photos/{label}", args, count_pages(corpus["photos"])))
+
+    for label, options in modes:
+        args = ["merge", str(corpus["tiny"]), "-o", "{output}.pdf", *options]
+        cases.append((f"merge/tiny/{label}", args, count_pages(corpus["tiny"])))
+
+    for kind in SPLIT_KINDS:
+        for label, options in modes:
+            args = ["split", str(corpus[kind]), "-b", "1", "-o", "{output}.pdf", *options]
+            cases.append((f"split/{kind}/{label}", args, count_pages(corpus[kind])))
+
+    return cases
+
+
+def build_encode_cases(
+    corpus: dict[str, Path],
+    dpi: int,
+    formats: list[str],
+    modes: list[tuple[str, list[str]]],
+    profiles: list[str],
+) -> list[tuple[str, list[str], int]]:
+    """
+    各編碼 profile 的 pdf-to-img 項目 (同一語料、格式、模式下只有 profile 不同)
+    """
+    cases = []
+    for kind in ENCODE_KINDS:
+        pages = count_pages(corpus[kind])
+        for format in formats:
+            for profile in profiles:
+                for label, options in modes:
+                    args = ["pdf-to-img", str(corpus[kind]), "-o", "{output}", "-d", str(dpi)]
+                    args += ["-f", format, "--encode-profile", profile, *options]
+                    cases.append((f"encode/{kind}/{format}/{profile}/{label}", args, pages))
+    return cases
+
+
+def run(args: list[str]) -> tuple[float, float, float, float]:
+    """
+    以新的子進程執行 CLI (輸出寫到暫時目錄)
+
+    Returns
+    -------
+    + tuple[float, float, float, float]
+        (秒數, 主進程 peak RSS (MB), worker 中最大的 peak RSS (MB), 輸出大小 (MB))
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        args = [arg.replace("{output}", str(Path(temp_dir) / "output")) for arg in args]
+        begin = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", RUN_CODE, "--no-pbar", *args],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        elapsed = time.perf_counter() - begin
+        output_size = sum(
+            path.stat().st_size for path in Path(temp_dir).rglob("*") if path.is_file()
+        )
+    main_rss, worker_rss = (int(line) / 1024 for line in result.stdout.split())  # Linux: KB
+    return elapsed, main_rss, worker_rss, output_size / 1024 / 1024
+
+
+def measure_startup(repeat: int = 5) -> dict[str, float]:
+    """
+    啟動時間 (取最小值)：直譯器本身，以及 `python -m pdfize --version`
+    """
+
+    def best(command: list[str]) -> float:
+        elapsed = []
+        for _ in range(repeat):
+            begin = time.perf_counter()
+            subprocess.run(command, check=True, capture_output=True)
+            elapsed.append(time.perf_counter() - begin)
+        return min(elapsed)
+
+    return {
+        "interpreter_seconds": best([sys.executable, "-c", "pass"]),
+        "startup_seconds": best([sys.executable, "-m", "pdfize", "--version"]),
+    }
+
+
+def run_suite(cases: list[tuple[str, list[str], int]], repeat: int) -> dict[str, dict]:
+    """
+    執行每個項目 `repeat` 次 (時間取中位數，RSS 取最大值)
+    """
+    results = {}
+    for name, args, pages in cases:
+        runs = [run(args) for _ in range(repeat)]
+        seconds = statistics.median(elapsed for elapsed, _, _, _ in runs)
+        results[name] = {
+            "pages": pages,
+            "seconds": round(seconds, 4),
+            "pages_per_second": round(pages / seconds, 2),
+            "output_mb": round(runs[0][3], 2),
+            "peak_rss_mb": round(max(main_rss for _, main_rss, _, _ in runs), 1),
+            "worker_peak_rss_mb": round(max(worker_rss for _, _, worker_rss, _ in runs), 1),
+        }
+        result = results[name]
+        print(
+            f"{name:<44} {result['pages_per_second']:>9.2f} pages/s "
+            f"{result['output_mb']:>9.2f}MB out "
+            f"{result['peak_rss_mb']:>8.1f}MB {result['worker_peak_rss_mb']:>8.1f}MB",
+            flush=True,
+        )
+    return results
+
+
+def summarize_profiles(results: dict[str, dict]) -> None:
+    """
+    各編碼 profile 相對於 balanced 的吞吐量與輸出大小 (encode 項目)
+    """
+    rows = []
+    for name, result in results.items():
+        command, kind, format, profile, label = (name.split("/") + [""] * 5)[:5]
+        balanced = results.get(f"{command}/{kind}/{format}/balanced/{label}")
+        if command != "encode" or balanced is None:
+            continue
+        speed = result["pages_per_second"] / balanced["pages_per_second"]
+        size = result["output_mb"] / balanced["output_mb"] if balanced["output_mb"] else 1.0
+        rows.append(
+            f"{kind + '/' + format + '/' + label:<24} {profile:<10} "
+            f"{result['pages_per_second']:>9.2f} pages/s ({speed:>5.2f}x) "
+            f"{result['output_mb']:>9.2f}MB ({size:>5.2f}x)"
+        )
+    if rows:
+        print("\nencode profiles (relative to balanced)")
+        print("\n".join(rows))
+
+
+def compare(result: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    與 baseline 比較
+
+    Returns
+    -------
+    + list[str]
+        退步的項目 (吞吐量下降、peak RSS 或啟動時間增加超過 `threshold` 比例)
+    """
+    regressions = []
+
+    def check(name: str, metric: str, new: float, old: float, *, higher_is_better: bool) -> None:
+        change = (new - old) / old if old else 0.0
+        worse = -change if higher_is_better else change
+        flag = "REGRESSION" if worse > threshold else ""
+        print(f"{name:<44} {metric:<18} {old:>10.2f} -> {new:>10.2f} ({change:+7.1%}) {flag}")
+        if flag:
+            regressions.append(f"{name} {metric}")
+
+    check(
+        "startup",
+        "startup_seconds",
+        result["startup"]["startup_seconds"],
+        baseline["startup"]["startup_seconds"],
+        higher_is_better=False,
+    )
+    for name, new in result["cases"].items():
+        old = baseline["cases"].get(name)
+        if old is None:
+            continue
+        check(
+            name,
+            "pages_per_second",
+            new["pages_per_second"],
+            old["pages_per_second"],
+            higher_is_better=True,
+        )
+        for metric in ("output_mb", "peak_rss_mb", "worker_peak_rss_mb"):
+            if metric in new and metric in old:  # 舊的 baseline 沒有 output_mb
+                check(name, metric, new[metric], old[metric], higher_is_better=False)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("-o", "--output", type=Path, help="result JSON")
+    parser.add_argument("-b", "--baseline", type=Path, help="baseline JSON to compare with")
+    parser.add_argument("-t", "--threshold", type=float, default=0.1, help="regression ratio")
+    parser.add_argument("--corpus", type=Path, help="corpus directory (generated if missing)")
+    parser.add_argument("-s", "--scale", type=int, default=1, help="corpus scale")
+    parser.add_argument("-d", "--dpi", type=int, nargs="+", default=[72, 150])
+    parser.add_argument("-f", "--format", nargs="+", default=["png", "jpeg"])
+    parser.add_argument("-w", "--workers", type=int, nargs="+", default=[2, os.cpu_count() or 1])
+    parser.add_argument(
+        "-p", "--profile", nargs="+", default=["fast", "balanced", "small"], help="encode profiles"
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=1)
+    parser.add_argument("-k", "--filter", default="*", help="case name pattern (fnmatch)")
+    parser.add_argument("--list", action="store_true", help="list cases and exit")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        corpus = make_corpus(args.corpus or Path(temp_dir) / "corpus", scale=args.scale)
+        workers = sorted(set(args.workers))
+        cases = [
+            case
+            for case in build_cases(corpus, args.dpi, args.format, workers, args.profile)
+            if fnmatch.fnmatch(case[0], args.filter)
+        ]
+        if args.list:
+            for name, _, pages in cases:
+                print(f"{name:<44} {pages:>6} pages")
+            return
+
+        result = {
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "pymupdf": version("pymupdf"),
+                "pillow": version("pillow"),
+                "pdfize": version("pdfize"),
+                "scale": args.scale,
+            },
+            "startup": measure_startup(),
+            "cases": run_suite(cases, args.repeat),
+        }
+    print(f"{'startup':<44} {result['startup']['startup_seconds']:>9.3f}s")
+    summarize_profiles(result["cases"])
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        print()
+        regressions = compare(result, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+transport benchmark：`PdfParallelProcessor.iter_images(format="raw")` 將 RGB pixel 傳回主進程的方式
+
++ pickle : workers 將 pixel 複製成 bytes，經由 ProcessPoolExecutor 的 result pipe 傳回
++ shm    : workers 寫入共享記憶體中的 page buffer (ring)，主進程直接讀取 (zero-copy)
+
+每種方式以新的子進程執行 (互不影響 peak RSS)，主進程對每一頁做一次加總 (模擬消費者讀取資料)
+
+Usage
+-----
+    python scripts/benchmarks/bench_transport.py [PDF] [-d DPI] [-w WORKERS] [-r REPEAT]
+"""
+
+# standard library
+import argparse
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# local module
+from corpus import make_corpus
+
+RUN_CODE = """
+import resource, sys, time
+from pdfize.processor.pdf_processor import PdfParallelProcessor
+pdf, dpi, workers, transport = sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), sys.argv[4]
+processor = PdfParallelProcessor(pdf, workers=workers)
+begin = time.perf_counter()
+pages = pixels = 0
+for _, view in processor.iter_images(dpi, "raw", transport=transport):
+    pixels += sum(view.cast("B")[::4096])  # 讀取資料 (取樣，避免消費者本身成為瓶頸)
+    pages += 1
+print(time.perf_counter() - begin)
+print(pages)
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def run(pdf: Path, dpi: int, workers: int, transport: str) -> tuple[float, int, float]:
+    """
+    Returns
+    -------
+    + tuple[float, int, float]
+        (秒數, 頁數, 主進程 peak RSS (MB))
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", RUN_CODE, str(pdf), str(dpi), str(workers), transport],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    elapsed, pages, main_rss = result.stdout.split()
+    return float(elapsed), int(pages), int(main_rss) / 1024  # Linux: KB
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("pdf", nargs="?", type=Path, help="default: synthetic 'text' corpus")
+    parser.add_argument("-d", "--dpi", type=int, default=300)
+    parser.add_argument("-w", "--workers", type=int, default=2)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        pdf = args.pdf or make_corpus(Path(temp_dir), ["text"])["text"]
+        print(f"{pdf.name} @ {args.dpi} dpi, {args.workers} workers")
+        for transport in ("pickle", "shm"):
+            runs = [run(pdf, args.dpi, args.workers, transport) for _ in range(args.repeat)]
+            elapsed, pages, _ = min(runs)
+            main_rss = max(rss for _, _, rss in runs)
+            print(
+                f"{transport:<8} {elapsed:>8.2f}s {pages / elapsed:>8.2f} pages/s "
+                f"{main_rss:>8.1f}MB (main peak RSS)"
+            )
+
+
+if __name__ == "__main__":
+    main()
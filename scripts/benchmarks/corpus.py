@@ -0,0 +1,190 @@
+"""
+產生 benchmark 用的合成語料 (deterministic：相同 seed 與 scale 產生完全相同的檔案)
+
++ text   : 純文字 (每頁數十行小字)
++ images : 大量點陣圖 (每頁數張雜訊圖片)
++ mixed  : 複雜度不一 (文字頁、向量圖頁、圖片頁交錯)
++ huge   : 超大頁面 (A0，含大量向量路徑)
++ tiny   : 許多一頁的小 PDF (目錄)
++ photos : JPEG / PNG 圖片 (目錄，給 `img-to-pdf` 使用)
+
+Usage
+-----
+    python scripts/benchmarks/corpus.py OUTPUT_DIR [-k KIND ...] [-s SCALE] [--seed SEED]
+"""
+
+# standard library
+import argparse
+import io
+import random
+from collections.abc import Callable
+from pathlib import Path
+
+# third party library
+import fitz
+from PIL import Image
+
+WORDS = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor".split()
+
+
+def noise_image(rng: random.Random, width: int, height: int, format: str) -> bytes:
+    """
+    以 `rng` 產生的雜訊圖片 (PIL 的 effect_noise 無法指定 seed)
+    """
+    image = Image.frombytes("RGB", (width, height), rng.randbytes(width * height * 3))
+    image = image.resize((width * 4, height * 4), Image.Resampling.BILINEAR)  # 較接近照片
+    buffer = io.BytesIO()
+    image.save(buffer, format, **({"quality": 85} if format == "JPEG" else {}))
+    return buffer.getvalue()
+
+
+def text_page(doc: fitz.Document, rng: random.Random) -> None:
+    page = doc.new_page()
+    lines = [" ".join(rng.choices(WORDS, k=14)) for _ in range(60)]
+    page.insert_textbox(fitz.Rect(36, 36, 576, 756), "\n".join(lines), fontsize=8)
+
+
+def vector_page(doc: fitz.Document, rng: random.Random, *, paths: int = 400) -> None:
+    page = doc.new_page()
+    shape = page.new_shape()
+    width, height = page.rect.width, page.rect.height
+    for _ in range(paths):
+        points = [fitz.Point(rng.uniform(0, width), rng.uniform(0, height)) for _ in range(4)]
+        shape.draw_bezier(*points)
+        shape.finish(color=(rng.random(), rng.random(), rng.random()), width=rng.uniform(0.2, 2))
+    shape.commit()
+
+
+def image_page(doc: fitz.Document, rng: random.Random, *, count: int = 4) -> None:
+    page = doc.new_page()
+    for i in range(count):
+        stream = noise_image(rng, 160, 120, "JPEG")
+        top = 36 + i * 180
+        page.insert_image(fitz.Rect(36, top, 336, top + 170), stream=stream)
+
+
+def save(doc: fitz.Document, path: Path) -> None:
+    """
+    儲存 (不寫入時間與隨機 ID，使檔案內容固定)
+    """
+    doc.set_metadata({})
+    doc.save(path, garbage=3, deflate=True, no_new_id=True)
+
+
+def make_text(root: Path, rng: random.Random, scale: int) -> Path:
+    path = root / "text.pdf"
+    with fitz.open() as doc:
+        for _ in range(40 * scale):
+            text_page(doc, rng)
+        save(doc, path)
+    return path
+
+
+def make_images(root: Path, rng: random.Random, scale: int) -> Path:
+    path = root / "images.pdf"
+    with fitz.open() as doc:
+        for _ in range(20 * scale):
+            image_page(doc, rng)
+        save(doc, path)
+    return path
+
+
+def make_mixed(root: Path, rng: random.Random, scale: int) -> Path:
+    path = root / "mixed.pdf"
+    builders = [text_page, vector_page, image_page, text_page]
+    with fitz.open() as doc:
+        for i in range(40 * scale):
+            builders[i % len(builders)](doc, rng)
+        save(doc, path)
+    return path
+
+
+def make_huge(root: Path, rng: random.Random, scale: int) -> Path:
+    path = root / "huge.pdf"
+    with fitz.open() as doc:
+        for _ in range(2 * scale):
+            vector_page(doc, rng, paths=2000)
+            doc[-1].set_mediabox(fitz.paper_rect("a0"))  # 路徑仍畫在左上角的 letter 區域
+            text_page(doc, rng)
+            doc[-1].set_mediabox(fitz.paper_rect("a0"))
+        save(doc, path)
+    return path
+
+
+def make_tiny(root: Path, rng: random.Random, scale: int) -> Path:
+    path = root / "tiny"
+    path.mkdir()
+    for i in range(200 * scale):
+        with fitz.open() as doc:
+            page = doc.new_page(width=300, height=200)
+            page.insert_text((20, 40), f"#{i:0>6} " + " ".join(rng.choices(WORDS, k=5)))
+            save(doc, path / f"tiny-{i:0>6}.pdf")
+    return path
+
+
+def make_photos(root: Path, rng: random.Random, scale: int) -> Path:
+    path = root / "photos"
+    path.mkdir()
+    for i in range(20 * scale):
+        format, suffix = ("JPEG", "jpg") if i % 4 else ("PNG", "png")
+        (path / f"photo-{i:0>4}.{suffix}").write_bytes(noise_image(rng, 300, 200, format))
+    return path
+
+
+KINDS: dict[str, Callable[[Path, random.Random, int], Path]] = {
+    "text": make_text,
+    "images": make_images,
+    "mixed": make_mixed,
+    "huge": make_huge,
+    "tiny": make_tiny,
+    "photos": make_photos,
+}
+
+
+def make_corpus(
+    root: Path, kinds: list[str] | None = None, *, scale: int = 1, seed: int = 0
+) -> dict[str, Path]:
+    """
+    產生語料 (已存在的種類直接沿用)
+
+    Parameters
+    ----------
+    + `root` : Path
+        輸出目錄
+    + `kinds` : list[str] | None
+        語料種類 (預設: 全部)
+    + `scale` : int
+        頁數 (檔案數) 倍率
+    + `seed` : int
+        亂數種子 (每種語料各自以 `(seed, kind)` 初始化，互不影響)
+
+    Returns
+    -------
+    + dict[str, Path]
+        {種類: 路徑}
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    corpus = {}
+    for kind in kinds or KINDS:
+        existing = [path for path in root.iterdir() if path.stem == kind]
+        if existing:
+            corpus[kind] = existing[0]
+        else:
+            corpus[kind] = KINDS[kind](root, random.Random(f"{seed}-{kind}"), scale)
+    return corpus
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output", type=Path)
+    parser.add_argument("-k", "--kind", nargs="+", choices=list(KINDS))
+    parser.add_argument("-s", "--scale", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for kind, path in make_corpus(args.output, args.kind, scale=args.scale, seed=args.seed).items():
+        print(f"{kind:>7} {path}")
+
+
+if __name__ == "__main__":
+    main()
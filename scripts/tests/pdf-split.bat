@@ -20,4 +20,12 @@
 
 %EXE_NAME% split "%TEST_DATA_DIR%\pdfs\result.pdf" -r -2 3 -o "%TEST_RESULTS_DIR%\test_pdf_split\test.pdf"
 @timeout %WAITING%
+@call "scripts\tests\clear.bat" %TEST_RESULTS_DIR%
+
+%EXE_NAME% split "%TEST_DATA_DIR%\pdfs\result.pdf" -r 1 2 -r -1 3 -o "%TEST_RESULTS_DIR%\test_pdf_split\test.pdf"
+@timeout %WAITING%
+@call "scripts\tests\clear.bat" %TEST_RESULTS_DIR%
+
+%EXE_NAME% split "%TEST_DATA_DIR%\pdfs\result.pdf" -b 2 -o "%TEST_RESULTS_DIR%\test_pdf_split\test.pdf" --parallel
+@timeout %WAITING%
 @call "scripts\tests\clear.bat" %TEST_RESULTS_DIR%
\ No newline at end of file
@@ -1,6 +1,8 @@
 # standard library
-import multiprocessing as mp
+import contextlib
+from collections.abc import Callable, Iterator
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 # third party library
 import click
@@ -8,20 +10,17 @@ from click_help_colors import HelpColorsGroup, version_option
 
 # local module
 from .info import __project__, __version__
-from .new_process import init, lock
-from .processor.image_processor import ImageSingleProcessor
-from .processor.pdf_processor import (
-    PdfParallelProcessor,
-    PdfProcessor,
-    PdfSingleProcessor,
-)
-from .progress_bar.base import NoPbar
-from .progress_bar.cli import CLIPbar
 from .progress_bar.enums import PbarStyle
 
+# 處理器 (fitz、PIL、tqdm 等) 於子命令中才 import，讓 `--help`、`--version` 快速啟動
+if TYPE_CHECKING:
+    from .discovery.finder import FileFinder
+    from .progress_bar.base import Pbar
+    from .tracing.tracer import Tracer
+
 
 class ColorChoice(click.Choice):
-    def get_metavar(self, param):
+    def get_metavar(self, param, ctx=None):  # click >= 8.2 才傳入 ctx
         return "[PbarStyle]"
 
     def get_help_record(self):
@@ -31,6 +30,267 @@ class ColorChoice(click.Choice):
 color_choice_type = ColorChoice([item.name for item in PbarStyle])
 
 
+class OutputSpec(click.ParamType):
+    name = "DPI:FORMAT[:SUFFIX]"
+
+    def convert(self, value, param, ctx):
+        """
+        "150:webp:-web" -> (150, "webp", "-web")；省略後綴時為 "-{dpi}dpi"
+        """
+        if isinstance(value, tuple):
+            return value
+        dpi, _, rest = value.partition(":")
+        format, _, suffix = rest.partition(":")
+        if not dpi.isdigit() or int(dpi) <= 0 or not format:
+            self.fail(f"{value!r} is not of the form DPI:FORMAT[:SUFFIX].", param, ctx)
+        if format == "npy":
+            self.fail("'npy' cannot be used as an additional output.", param, ctx)
+        return int(dpi), format, suffix or f"-{dpi}dpi"
+
+
+output_spec_type = OutputSpec()
+
+
+class EncodeOption(click.ParamType):
+    name = "FORMAT.KEY=VALUE"
+
+    def convert(self, value, param, ctx):
+        """
+        "png.compress_level=3" -> ("png", "compress_level", 3)；VALUE 為整數或 true / false
+        (參數名稱於建立處理器時才檢查)
+        """
+        if isinstance(value, tuple):
+            return value
+        target, _, option_value = value.partition("=")
+        format, _, key = target.partition(".")
+        if not format or not key or not option_value:
+            self.fail(f"{value!r} is not of the form FORMAT.KEY=VALUE.", param, ctx)
+        if option_value.lower() in ("true", "false"):
+            return format, key, option_value.lower() == "true"
+        try:
+            return format, key, int(option_value)
+        except ValueError:
+            self.fail(f"{option_value!r} is not an integer, 'true' or 'false'.", param, ctx)
+
+
+encode_option_type = EncodeOption()
+
+ENCODE_PROFILES = ["fast", "balanced", "small"]  # 同 image_util.ENCODE_PROFILES (不 import PIL)
+
+trace_option = click.option(
+    "--trace",
+    "trace_path",
+    type=click.Path(exists=False, file_okay=True, dir_okay=False, resolve_path=True),
+    help="""
+    Record timed spans of every stage (in every worker) to a Chrome trace-event JSON file,
+    and print a summary of stage totals and page latency.
+    """,
+)
+
+
+def discovery_options(command: Callable) -> Callable:
+    """
+    輸入目錄的搜尋選項 (遞迴、glob 過濾、平行讀取目錄)
+    """
+    options = [
+        click.option(
+            "-R",
+            "--recursive",
+            "recursive",
+            is_flag=True,
+            default=False,
+            show_default=True,
+            help="""
+            Also search the subdirectories of the input directory.
+            """,
+        ),
+        click.option(
+            "--include",
+            "include",
+            multiple=True,
+            help="""
+            Only use input files whose relative path matches this glob (e.g. 'scan-*').
+            Repeat this option to match any of several globs.
+            """,
+        ),
+        click.option(
+            "--exclude",
+            "exclude",
+            multiple=True,
+            help="""
+            Skip input files and directories whose relative path matches this glob.
+            Repeat this option to skip several globs.
+            """,
+        ),
+        click.option(
+            "--walkers",
+            "walkers",
+            type=click.IntRange(min=1),
+            default=4,
+            show_default=True,
+            help="""
+            Number of threads reading directories ahead (helps on network filesystems).
+            """,
+        ),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def encode_options(command: Callable) -> Callable:
+    """
+    image 編碼選項 (profile 與個別格式的參數)
+    """
+    options = [
+        click.option(
+            "--encode-profile",
+            "encode_profile",
+            type=click.Choice(ENCODE_PROFILES),
+            default="balanced",
+            show_default=True,
+            help="""
+            Encoder settings: 'fast' (low compression effort, bigger files),
+            'balanced' (Pillow defaults) or 'small' (high compression effort, slower).
+            """,
+        ),
+        click.option(
+            "--encode-option",
+            "encode_option_values",
+            type=encode_option_type,
+            multiple=True,
+            help="""
+            Override one encoder parameter of a format on top of the profile
+            (e.g. 'png.compress_level=3', 'webp.quality=90', 'jpg.progressive=true').
+            Repeat this option for several parameters.
+            """,
+        ),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def get_encode_params(
+    profile: str, options: tuple[tuple[str, str, int | bool], ...]
+) -> dict[str, dict[str, int | bool]]:
+    """
+    依編碼選項建立各格式的編碼參數
+    """
+    from .util.image_util import build_encode_params
+
+    try:
+        return build_encode_params(profile, options)
+    except ValueError as error:
+        raise click.BadParameter(str(error), param_hint="'--encode-option'") from error
+
+
+def check_formats(format: str, specs: tuple[tuple[int, str, str], ...] = ()) -> None:
+    """
+    檢查 `-f` 與 `--spec` 的 image 格式 (未知格式在開始轉換前回報，而非在 encoder thread 中失敗)
+    """
+    from .util.image_util import get_pil_format
+
+    outputs = [("'-f' / '--format'", format)]
+    outputs += [("'--spec'", spec_format) for _, spec_format, _ in specs]
+    for param_hint, output_format in outputs:
+        if output_format == "npy":  # 陣列輸出，不經 PIL 編碼
+            continue
+        try:
+            get_pil_format(output_format)
+        except ValueError as error:
+            raise click.BadParameter(str(error), param_hint=param_hint) from error
+
+
+def get_finder(
+    recursive: bool, include: tuple[str, ...], exclude: tuple[str, ...], walkers: int
+) -> "FileFinder":
+    """
+    依搜尋選項建立 FileFinder
+    """
+    from .discovery.finder import FileFinder
+
+    return FileFinder(recursive=recursive, include=include, exclude=exclude, walkers=walkers)
+
+
+@contextlib.contextmanager
+def input_errors() -> Iterator[None]:
+    """
+    將找不到輸入檔案的錯誤 (例如 `--include` 沒有符合的檔案) 轉為 CLI 錯誤 (非零結束碼)
+    """
+    try:
+        yield
+    except FileNotFoundError as error:
+        raise click.ClickException(str(error)) from error
+
+
+def get_pbar_class(ctx: click.Context) -> "type[Pbar]":
+    """
+    設定進度條 (輸出鎖與樣式)，回傳進度條類型
+    """
+    from .new_process import init, lock
+    from .progress_bar.base import NoPbar
+    from .progress_bar.cli import CLIPbar
+
+    init.initializer(lock.get_pbar_output_lock(), ctx.obj["PBAR_STYLE"])
+    return CLIPbar if ctx.obj["HAS_PBAR"] else NoPbar
+
+
+def check_pool_options(
+    parallel: bool,
+    workers: int | None,
+    memory_budget: int | None,
+    server_address: str | None,
+    trace_path: str | None,
+) -> None:
+    """
+    檢查 process pool 相關選項的搭配 (`pdf-to-img`)
+    """
+    if workers is not None and not parallel:
+        raise click.UsageError("The '--workers' option requires '--parallel' to be enabled.")
+    if memory_budget is not None and not parallel and server_address is None:
+        raise click.UsageError(
+            "The '--memory-budget' option requires '--parallel' or '--server' to be specified."
+        )
+    if server_address is not None and (workers is not None or trace_path is not None):
+        raise click.UsageError(
+            "The '--workers' and '--trace' options cannot be used with '--server'."
+        )
+
+
+def submit_to_server(address: str, job: dict) -> None:
+    """
+    client mode：將 job 交給 `pdfize serve` daemon 執行，等待完成
+    """
+    from .server.client import submit_job
+
+    try:
+        result = submit_job(address, job)
+    except OSError as error:
+        raise click.ClickException(f"Cannot connect to server '{address}': {error}") from error
+    if not result["ok"]:
+        raise click.ClickException(result["error"])
+
+
+@contextlib.contextmanager
+def tracing(trace_path: str | None, command: str) -> "Iterator[Tracer | None]":
+    """
+    建立 tracer，結束時 (即使出錯) 寫出 trace 並印出摘要 (沒有指定 `--trace` 時為 None)
+    """
+    if trace_path is None:
+        yield None
+        return
+
+    from .tracing.tracer import Tracer
+
+    tracer = Tracer(trace_path)
+    try:
+        with tracer.span(command):
+            yield tracer
+    finally:
+        click.echo(tracer.close(), err=True)
+
+
 @click.group(
     cls=HelpColorsGroup,
     help_headers_color="bright_cyan",
@@ -67,7 +327,7 @@ color_choice_type = ColorChoice([item.name for item in PbarStyle])
 def pdfize(ctx: click.Context, has_pbar: bool, pbar_style: str) -> None:
     ctx.ensure_object(dict)
     ctx.obj["HAS_PBAR"] = has_pbar
-    init.initializer(lock.PBAR_OUTPUT_LOCK, pbar_style)
+    ctx.obj["PBAR_STYLE"] = pbar_style
 
 
 @pdfize.command("pdf-to-img", short_help="Convert PDF to image.")
@@ -75,7 +335,7 @@ def pdfize(ctx: click.Context, has_pbar: bool, pbar_style: str) -> None:
     "-w",
     "--workers",
     "workers",
-    type=int,
+    type=click.IntRange(min=1),
     help="""
     Specifies the number of worker processes to use for multiprocessing.
     [default: the number of CPU cores]
@@ -91,6 +351,38 @@ def pdfize(ctx: click.Context, has_pbar: bool, pbar_style: str) -> None:
     Enable parallel processing to speed up PDF processing tasks.
     """,
 )
+@click.option(
+    "-e",
+    "--encoders",
+    "encoders",
+    type=click.IntRange(min=1),
+    help="""
+    Specifies the number of threads per process used for image encoding and file writing.
+    [default: the number of CPU cores, or 2 per worker with '--parallel']
+    """,
+)
+@click.option(
+    "--memory-budget",
+    "memory_budget",
+    type=click.IntRange(min=1),
+    help="""
+    Specifies the memory budget (MB) for rendering in all workers.
+    Pages are estimated from page size x DPI^2 x channels, and work is only started
+    while the estimated total fits (small pages still use every worker).
+    Requires '--parallel' or '--server'. [default: no limit]
+    """,
+)
+@click.option(
+    "--band-size",
+    "band_size",
+    type=click.IntRange(min=1),
+    help="""
+    Render pages whose pixmap exceeds this size (MB) in horizontal bands, stitched into
+    one PNG by a streaming encoder, so memory holds only a few bands.
+    With '--parallel', the bands of a single PDF are rendered and compressed by all workers.
+    Only for 'png' without '--spec'. [default: render whole pages]
+    """,
+)
 @click.option(
     "--subdir",
     "subdir",
@@ -101,6 +393,54 @@ def pdfize(ctx: click.Context, has_pbar: bool, pbar_style: str) -> None:
     Use the original PDF filename as the name of subdirectory.
     """,
 )
+@click.option(
+    "--cache",
+    "cache_path",
+    type=click.Path(exists=False, file_okay=False, dir_okay=True, resolve_path=True),
+    help="""
+    Cache directory. Pages already rendered with the same content, DPI and format are reused.
+    """,
+)
+@click.option(
+    "--cache-max-size",
+    "cache_max_size",
+    type=click.IntRange(min=1),
+    help="""
+    Specifies the maximum size (MB) of the cache. The least recently used pages are evicted.
+    """,
+)
+@click.option(
+    "--cache-max-age",
+    "cache_max_age",
+    type=click.FloatRange(min=0),
+    help="""
+    Specifies the maximum age (days) of cached pages.
+    """,
+)
+@click.option(
+    "--resume",
+    "resume",
+    is_flag=True,
+    default=False,
+    show_default=True,
+    help="""
+    Record finished pages in a journal in the output directory.
+    Rerun with the same options to resume an interrupted conversion.
+    """,
+)
+@click.option(
+    "--server",
+    "server_address",
+    envvar="PDFIZE_SERVER",
+    type=click.Path(exists=False, file_okay=True, dir_okay=False, resolve_path=True),
+    help="""
+    Send the job to a running 'pdfize serve' daemon listening on this socket
+    instead of starting new worker processes. [env: PDFIZE_SERVER]
+    """,
+)
+@trace_option
+@discovery_options
+@encode_options
 @click.option("-d", "--dpi", "dpi", type=int, default=100, show_default=True, help="Image DPI.")
 @click.option(
     "-f",
@@ -110,6 +450,20 @@ def pdfize(ctx: click.Context, has_pbar: bool, pbar_style: str) -> None:
     show_default=True,
     help="""
     Image file format.
+    Use 'npy' to write raw RGB pixels of each PDF to one NumPy array file
+    (with a JSON index of page offsets and shapes), skipping image encoding.
+    """,
+)
+@click.option(
+    "--spec",
+    "specs",
+    type=output_spec_type,
+    multiple=True,
+    help="""
+    Also write every page at another DPI / format in the same pass, named with SUFFIX after
+    the main filename [default SUFFIX: '-{DPI}dpi'] (e.g. '150:webp:-web').
+    Each page is interpreted once and rasterized at every resolution.
+    Repeat this option for several outputs.
     """,
 )
 @click.option(
@@ -146,31 +500,147 @@ def pdf_to_img(
     subdir: bool,
     parallel: bool,
     workers: int | None,
+    encoders: int | None,
+    memory_budget: int | None,
+    band_size: int | None,
+    cache_path: str | None,
+    cache_max_size: int | None,
+    cache_max_age: float | None,
+    resume: bool,
+    server_address: str | None,
+    trace_path: str | None,
+    recursive: bool,
+    include: tuple[str, ...],
+    exclude: tuple[str, ...],
+    walkers: int,
+    encode_profile: str,
+    encode_option_values: tuple[tuple[str, str, int | bool], ...],
     dpi: int,
     format: str,
+    specs: tuple[tuple[int, str, str], ...],
     name: str | None = None,
 ) -> None:
-    has_pbar: bool = ctx.obj["HAS_PBAR"]
-    pbar_class = CLIPbar if has_pbar else NoPbar
-
-    # multiprorocessing
-    pdf: PdfProcessor
-    if parallel:
-        pdf = PdfParallelProcessor(input_path, pbar_class=pbar_class, workers=workers)
-    elif workers is not None:
-        raise click.UsageError("The '--workers' option requires '--parallel' to be enabled.")
-    else:
-        pdf = PdfSingleProcessor(input_path, pbar_class=pbar_class)
-
     # mutual exclusion check
+    if cache_path is None and (cache_max_size is not None or cache_max_age is not None):
+        raise click.UsageError("The '--cache-max-*' options require '--cache' to be specified.")
     if name and subdir:
         raise click.UsageError("The '--name' and '--subdir' options cannot be used together.")
+    if format == "npy" and (cache_path is not None or resume or specs):
+        raise click.UsageError(
+            "The '--cache', '--resume' and '--spec' options cannot be used with 'npy'."
+        )
+    if band_size is not None and (format != "png" or specs):
+        raise click.UsageError("The '--band-size' option requires 'png' without '--spec'.")
+    outputs = [("", format)] + [(suffix, spec_format) for _, spec_format, suffix in specs]
+    if len(set(outputs)) < len(outputs):  # 輸出檔名重複
+        raise click.UsageError("Every '--spec' must have a different SUFFIX or FORMAT.")
+    check_pool_options(parallel, workers, memory_budget, server_address, trace_path)
+
+    cache_max_size_bytes = cache_max_size * 1024 * 1024 if cache_max_size is not None else None
+    cache_max_age_seconds = cache_max_age * 24 * 60 * 60 if cache_max_age is not None else None
+    memory_budget_bytes = memory_budget * 1024 * 1024 if memory_budget is not None else None
+    band_size_bytes = band_size * 1024 * 1024 if band_size is not None else None
+
+    # client mode：交給 daemon 執行 (不需 import 處理器)
+    if server_address is not None:
+        job = {
+            "command": "pdf-to-img",
+            "input": input_path,
+            "output": output_path,
+            "dpi": dpi,
+            "format": format,
+            "specs": specs,
+            "name": name,
+            "subdir": subdir,
+            "encoders": encoders,
+            "encode_profile": encode_profile,
+            "encode_options": encode_option_values,
+            "memory_budget": memory_budget_bytes,
+            "band_size": band_size_bytes,
+            "cache": cache_path,
+            "cache_max_size": cache_max_size_bytes,
+            "cache_max_age": cache_max_age_seconds,
+            "resume": resume,
+            "recursive": recursive,
+            "include": include,
+            "exclude": exclude,
+            "walkers": walkers,
+        }
+        submit_to_server(server_address, job)
+        return
+
+    from .cache.render_cache import RenderCache
+    from .processor.pdf_processor import PdfParallelProcessor, PdfProcessor, PdfSingleProcessor
+
+    check_formats(format, specs)
+    encode_params = get_encode_params(encode_profile, encode_option_values)
+    pbar_class = get_pbar_class(ctx)
+    finder = get_finder(recursive, include, exclude, walkers)
+
+    # render cache
+    cache = None
+    if cache_path is not None:
+        cache = RenderCache(
+            cache_path, max_size=cache_max_size_bytes, max_age=cache_max_age_seconds
+        )
+
+    with tracing(trace_path, "pdf-to-img") as tracer:
+        # multiprorocessing
+        pdf: PdfProcessor
+        if parallel:
+            pdf = PdfParallelProcessor(
+                input_path,
+                pbar_class=pbar_class,
+                finder=finder,
+                workers=workers,
+                encoders=2 if encoders is None else encoders,
+                encode_params=encode_params,
+                memory_budget=memory_budget_bytes,
+                band_size=band_size_bytes,
+                cache=cache,
+                resume=resume,
+                tracer=tracer,
+            )
+        else:
+            pdf = PdfSingleProcessor(
+                input_path,
+                pbar_class=pbar_class,
+                finder=finder,
+                encoders=encoders,
+                encode_params=encode_params,
+                band_size=band_size_bytes,
+                cache=cache,
+                resume=resume,
+                tracer=tracer,
+            )
 
-    image = Path(output_path)
-    pdf.to_images(image, dpi, format, name=name, subdir=subdir)
+        image = Path(output_path)
+        with input_errors():
+            pdf.to_images(image, dpi, format, name=name, subdir=subdir, specs=specs)
 
 
 @pdfize.command("img-to-pdf", short_help="Convert image to PDF.")
+@click.option(
+    "-w",
+    "--workers",
+    "workers",
+    type=click.IntRange(min=1),
+    help="""
+    Specifies the number of worker processes to use for multiprocessing.
+    [default: the number of CPU cores]
+    """,
+)
+@click.option(
+    "--parallel",
+    "parallel",
+    is_flag=True,
+    default=False,
+    show_default=True,
+    help="""
+    Enable parallel processing to speed up image processing tasks.
+    """,
+)
+@discovery_options
 @click.option(
     "-o",
     "--output",
@@ -189,11 +659,220 @@ def pdf_to_img(
     type=click.Path(exists=True, file_okay=True, dir_okay=True, readable=True, resolve_path=True),
 )
 @click.pass_context
-def img_to_pdf(ctx: click.Context, input_path: str, output_path: str):
-    has_pbar: bool = ctx.obj["HAS_PBAR"]
-    image = ImageSingleProcessor(input_path, pbar_class=CLIPbar if has_pbar else NoPbar)
+def img_to_pdf(
+    ctx: click.Context,
+    input_path: str,
+    output_path: str,
+    parallel: bool,
+    workers: int | None,
+    recursive: bool,
+    include: tuple[str, ...],
+    exclude: tuple[str, ...],
+    walkers: int,
+) -> None:
+    from .processor.image_processor import (
+        ImageParallelProcessor,
+        ImageProcessor,
+        ImageSingleProcessor,
+    )
+
+    pbar_class = get_pbar_class(ctx)
+    finder = get_finder(recursive, include, exclude, walkers)
+
+    # multiprorocessing
+    image: ImageProcessor
+    if parallel:
+        image = ImageParallelProcessor(
+            input_path, pbar_class=pbar_class, finder=finder, workers=workers
+        )
+    elif workers is not None:
+        raise click.UsageError("The '--workers' option requires '--parallel' to be enabled.")
+    else:
+        image = ImageSingleProcessor(input_path, pbar_class=pbar_class, finder=finder)
+
     pdf = Path(output_path)
-    image.to_pdf(pdf)
+    with input_errors():
+        image.to_pdf(pdf)
+
+
+@pdfize.command("thumbnail", short_help="Convert PDF to thumbnails.")
+@click.option(
+    "-w",
+    "--workers",
+    "workers",
+    type=click.IntRange(min=1),
+    help="""
+    Specifies the number of worker processes to use for multiprocessing.
+    [default: the number of CPU cores]
+    """,
+)
+@click.option(
+    "--parallel",
+    "parallel",
+    is_flag=True,
+    default=False,
+    show_default=True,
+    help="""
+    Enable parallel processing to speed up PDF processing tasks.
+    """,
+)
+@click.option(
+    "--subdir",
+    "subdir",
+    is_flag=True,
+    default=False,
+    show_default=True,
+    help="""
+    Use the original PDF filename as the name of subdirectory.
+    """,
+)
+@trace_option
+@discovery_options
+@encode_options
+@click.option(
+    "-b",
+    "--box",
+    "box",
+    type=(click.IntRange(min=1), click.IntRange(min=1)),
+    default=(200, 200),
+    show_default=True,
+    metavar="WIDTH HEIGHT",
+    help="""
+    Maximum thumbnail size in pixels. Pages are scaled to fit, keeping the aspect ratio.
+    """,
+)
+@click.option(
+    "-f",
+    "--format",
+    "format",
+    default="png",
+    show_default=True,
+    help="""
+    Image file format.
+    """,
+)
+@click.option(
+    "--sprite",
+    "sprite",
+    is_flag=True,
+    default=False,
+    show_default=True,
+    help="""
+    Pack all thumbnails of each PDF into one sprite sheet (one cell of BOX per page),
+    with a JSON index of page offsets and sizes.
+    """,
+)
+@click.option(
+    "--columns",
+    "columns",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="""
+    Number of cells per row of the sprite sheet.
+    """,
+)
+@click.option(
+    "--aa",
+    "aa_level",
+    type=click.IntRange(min=0, max=8),
+    default=2,
+    show_default=True,
+    help="""
+    Antialiasing level (0: off, 8: best). Low levels are faster and enough for small images.
+    """,
+)
+@click.option(
+    "--annots/--no-annots",
+    "annots",
+    default=False,
+    show_default=True,
+    help="""
+    Also render annotations.
+    """,
+)
+@click.option(
+    "-o",
+    "--output",
+    "output_path",
+    required=True,
+    prompt="Output path",
+    type=click.Path(exists=False, file_okay=False, dir_okay=True, resolve_path=True),
+    help="""
+    Output directory.
+    """,
+)
+@click.argument(
+    "input_path",
+    nargs=1,
+    required=True,
+    type=click.Path(exists=True, file_okay=True, dir_okay=True, readable=True, resolve_path=True),
+)
+@click.pass_context
+def pdf_thumbnail(
+    ctx: click.Context,
+    input_path: str,
+    output_path: str,
+    subdir: bool,
+    parallel: bool,
+    workers: int | None,
+    trace_path: str | None,
+    recursive: bool,
+    include: tuple[str, ...],
+    exclude: tuple[str, ...],
+    walkers: int,
+    encode_profile: str,
+    encode_option_values: tuple[tuple[str, str, int | bool], ...],
+    box: tuple[int, int],
+    format: str,
+    sprite: bool,
+    columns: int,
+    aa_level: int,
+    annots: bool,
+) -> None:
+    from .processor.pdf_processor import PdfParallelProcessor, PdfProcessor, PdfSingleProcessor
+
+    if workers is not None and not parallel:
+        raise click.UsageError("The '--workers' option requires '--parallel' to be enabled.")
+
+    check_formats(format)
+    encode_params = get_encode_params(encode_profile, encode_option_values)
+    pbar_class = get_pbar_class(ctx)
+    finder = get_finder(recursive, include, exclude, walkers)
+
+    with tracing(trace_path, "thumbnail") as tracer:
+        # multiprorocessing
+        pdf: PdfProcessor
+        if parallel:
+            pdf = PdfParallelProcessor(
+                input_path,
+                pbar_class=pbar_class,
+                finder=finder,
+                workers=workers,
+                encode_params=encode_params,
+                tracer=tracer,
+            )
+        else:
+            pdf = PdfSingleProcessor(
+                input_path,
+                pbar_class=pbar_class,
+                finder=finder,
+                encode_params=encode_params,
+                tracer=tracer,
+            )
+
+        image = Path(output_path)
+        with input_errors():
+            pdf.to_thumbnails(
+                image,
+                box,
+                format,
+                subdir=subdir,
+                sprite=sprite,
+                columns=columns,
+                aa_level=aa_level,
+                annots=annots,
+            )
 
 
 @pdfize.command("split", short_help="Split PDF.")
@@ -211,15 +890,46 @@ def img_to_pdf(ctx: click.Context, input_path: str, output_path: str):
 @click.option(
     "-r",
     "--range",
-    "page_range",
+    "page_ranges",
     type=(int, int),
-    prompt="Page range",
+    multiple=True,
     help="""
     Specifies the range of pages to copy using 1-based indexing, with support for negative indices.
     If the start page is greater than the end page, the pages will be copied in reverse order.
     Note: '-1' represents the last page.
+    Repeat this option to write several files (with serial numbers) in one pass.
+    """,
+)
+@click.option(
+    "-b",
+    "--burst",
+    "every",
+    type=click.IntRange(min=1),
+    help="""
+    Split the PDF into one file every N pages (with serial numbers).
+    """,
+)
+@click.option(
+    "-w",
+    "--workers",
+    "workers",
+    type=click.IntRange(min=1),
+    help="""
+    Specifies the number of worker processes to use for multiprocessing.
+    [default: the number of CPU cores]
     """,
 )
+@click.option(
+    "--parallel",
+    "parallel",
+    is_flag=True,
+    default=False,
+    show_default=True,
+    help="""
+    Enable parallel processing to speed up PDF processing tasks.
+    """,
+)
+@trace_option
 @click.argument(
     "input_path",
     nargs=1,
@@ -228,16 +938,78 @@ def img_to_pdf(ctx: click.Context, input_path: str, output_path: str):
 )
 @click.pass_context
 def pdf_split(
-    ctx: click.Context, input_path: str, output_path: str, page_range: tuple[int, int]
+    ctx: click.Context,
+    input_path: str,
+    output_path: str,
+    page_ranges: tuple[tuple[int, int], ...],
+    every: int | None,
+    parallel: bool,
+    workers: int | None,
+    trace_path: str | None,
 ) -> None:
-    has_pbar: bool = ctx.obj["HAS_PBAR"]
-    input_pdf = PdfSingleProcessor(input_path, pbar_class=CLIPbar if has_pbar else NoPbar)
-    output_pdf = Path(output_path)
-    from_page, to_page = page_range
-    input_pdf.split(output_pdf, from_page, to_page)
+    from .processor.pdf_processor import PdfParallelProcessor, PdfProcessor, PdfSingleProcessor
+
+    pbar_class = get_pbar_class(ctx)
+
+    # mutual exclusion check
+    if page_ranges and every is not None:
+        raise click.UsageError("The '--range' and '--burst' options cannot be used together.")
+    if not page_ranges and every is None:
+        raise click.UsageError("Either '--range' or '--burst' must be specified.")
+    if workers is not None and not parallel:
+        raise click.UsageError("The '--workers' option requires '--parallel' to be enabled.")
+
+    with tracing(trace_path, "split") as tracer:
+        # multiprorocessing
+        input_pdf: PdfProcessor
+        if parallel:
+            input_pdf = PdfParallelProcessor(
+                input_path, pbar_class=pbar_class, workers=workers, tracer=tracer
+            )
+        else:
+            input_pdf = PdfSingleProcessor(input_path, pbar_class=pbar_class, tracer=tracer)
+
+        output_pdf = Path(output_path)
+        if every is not None:
+            input_pdf.burst(output_pdf, every)
+        else:
+            input_pdf.split_ranges(output_pdf, page_ranges)
 
 
 @pdfize.command("merge", short_help="Merge PDF.")
+@click.option(
+    "-w",
+    "--workers",
+    "workers",
+    type=click.IntRange(min=1),
+    help="""
+    Specifies the number of worker processes to use for multiprocessing.
+    [default: the number of CPU cores]
+    """,
+)
+@click.option(
+    "--parallel",
+    "parallel",
+    is_flag=True,
+    default=False,
+    show_default=True,
+    help="""
+    Enable parallel processing to speed up PDF processing tasks.
+    """,
+)
+@click.option(
+    "-g",
+    "--group-size",
+    "group_size",
+    type=click.IntRange(min=1),
+    help="""
+    Specifies the maximum total file size (MB) of the input PDFs each worker merges
+    in the first round. The partial results are then merged in pairs, so the last
+    merge loads the whole output. [default: 256]
+    """,
+)
+@trace_option
+@discovery_options
 @click.option(
     "-o",
     "--output",
@@ -256,13 +1028,100 @@ def pdf_split(
     type=click.Path(exists=True, file_okay=True, dir_okay=True, readable=True, resolve_path=True),
 )
 @click.pass_context
-def pdf_merge(ctx: click.Context, input_path: str, output_path: str) -> None:
-    has_pbar: bool = ctx.obj["HAS_PBAR"]
-    input_pdfs = PdfSingleProcessor(input_path, pbar_class=CLIPbar if has_pbar else NoPbar)
-    output_pdf = Path(output_path)
-    input_pdfs.merge(output_pdf)
+def pdf_merge(
+    ctx: click.Context,
+    input_path: str,
+    output_path: str,
+    parallel: bool,
+    workers: int | None,
+    group_size: int | None,
+    trace_path: str | None,
+    recursive: bool,
+    include: tuple[str, ...],
+    exclude: tuple[str, ...],
+    walkers: int,
+) -> None:
+    from .processor.pdf_processor import PdfParallelProcessor, PdfProcessor, PdfSingleProcessor
+
+    pbar_class = get_pbar_class(ctx)
+    finder = get_finder(recursive, include, exclude, walkers)
+
+    if workers is not None and not parallel:
+        raise click.UsageError("The '--workers' option requires '--parallel' to be enabled.")
+    if group_size is not None and not parallel:
+        raise click.UsageError("The '--group-size' option requires '--parallel' to be enabled.")
+
+    with tracing(trace_path, "merge") as tracer:
+        # multiprorocessing
+        input_pdfs: PdfProcessor
+        if parallel:
+            input_pdfs = PdfParallelProcessor(
+                input_path,
+                pbar_class=pbar_class,
+                finder=finder,
+                workers=workers,
+                merge_group_size=(group_size or 256) * 1024 * 1024,
+                tracer=tracer,
+            )
+        else:
+            input_pdfs = PdfSingleProcessor(
+                input_path, pbar_class=pbar_class, finder=finder, tracer=tracer
+            )
+
+        output_pdf = Path(output_path)
+        with input_errors():
+            input_pdfs.merge(output_pdf)
+
+
+@pdfize.command("serve", short_help="Run a worker pool daemon.")
+@click.option(
+    "-w",
+    "--workers",
+    "workers",
+    type=click.IntRange(min=1),
+    help="""
+    Specifies the number of worker processes shared by all jobs.
+    [default: the number of CPU cores]
+    """,
+)
+@click.option(
+    "--max-jobs",
+    "max_jobs",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="""
+    Specifies the maximum number of jobs running at the same time. Further jobs wait in line.
+    """,
+)
+@click.argument(
+    "socket_path",
+    nargs=1,
+    required=True,
+    type=click.Path(exists=False, file_okay=True, dir_okay=False, resolve_path=True),
+)
+def serve(socket_path: str, workers: int | None, max_jobs: int) -> None:
+    """
+    Keep warm worker processes behind a Unix domain socket.
+    Send jobs with 'pdf-to-img --server SOCKET_PATH'. Stop with Ctrl+C or SIGTERM
+    (running jobs are finished first).
+    """
+    from .server.daemon import Server
+
+    server = Server(
+        socket_path,
+        workers=workers,
+        max_jobs=max_jobs,
+        log=lambda message: click.echo(message, err=True),
+    )
+    try:
+        server.serve_forever()
+    except FileExistsError as error:
+        raise click.ClickException(str(error)) from error
 
 
 if __name__ == "__main__":
+    import multiprocessing as mp
+
     mp.freeze_support()  # support freeze executable on Windows (if using multiprocessing)
     pdfize()
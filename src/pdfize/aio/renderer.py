@@ -0,0 +1,191 @@
+# standard library
+import asyncio
+import concurrent.futures as future
+import multiprocessing as mp
+import os
+from collections import deque
+from collections.abc import AsyncIterator, Sequence
+from pathlib import Path
+from types import TracebackType
+
+# local module
+from ..processor.pdf_processor import PdfSingleProcessor
+from ..util import array_util, image_util, pdf_util
+
+
+def render_chunk(
+    pdf_path: str,
+    pages: Sequence[int],
+    dpi: int,
+    format: str,
+    encode_params: image_util.EncodeParams | None = None,
+) -> list[bytes]:
+    """
+    渲染並編碼一段頁面 (在 worker 中執行；與處理器共用 `iter_images` 的渲染與編碼)
+
+    Parameters
+    ----------
+    + `pages` : Sequence[int]
+        頁碼 (0-based indexing)
+    + `encode_params` : EncodeParams | None
+        各格式的編碼參數 (見 `image_util.build_encode_params`)
+
+    Returns
+    -------
+    + list[bytes]
+        每一頁編碼後的 image (`"raw"` 為 RGB pixel)
+    """
+    processor = PdfSingleProcessor(pdf_path, encoders=1, encode_params=encode_params)
+    return [
+        image if isinstance(image, bytes) else image.tobytes()
+        for _, image in processor.iter_images(dpi, format, pages=pages)
+    ]
+
+
+class AsyncRenderer:
+    def __init__(
+        self,
+        *,
+        workers: int | None = None,
+        max_jobs: int = 4,
+        window: int | None = None,
+        chunk: int = 4,
+        mp_context: str | None = None,
+        encode_params: image_util.EncodeParams | None = None,
+    ) -> None:
+        """
+        asyncio 介面的 pdf 渲染 (多個請求共用一個長期存在的 process pool)
+
+        + 同時進行的 job 數上限為 `max_jobs`，其餘 job 等待 (不另外建立 process)
+        + 每個 job 最多有 `window` 段頁面在處理中，消費者未取走結果時不再提交 (backpressure)
+        + 取消 job (task 被 cancel 或提早離開 `async for`) 時，尚未開始的頁面不再渲染
+
+        Parameters
+        ----------
+        + `workers` : int | None
+            worker process 數 (預設: CPU 核心數)
+        + `max_jobs` : int
+            同時進行的 job 數上限
+        + `window` : int | None
+            每個 job 處理中的頁面段數上限 (預設: `2 * workers`)
+        + `chunk` : int
+            每個任務渲染的頁數 (越大排程開銷越小，但延遲與取消的粒度越大)
+        + `mp_context` : str | None
+            multiprocessing start method (於多 thread 的服務中建議使用 "forkserver" 或 "spawn")
+        + `encode_params` : EncodeParams | None
+            各格式的編碼參數 (見 `image_util.build_encode_params`)，預設使用 PIL 預設值
+
+        Example
+        -------
+        >>> async with AsyncRenderer(max_jobs=8) as renderer:
+        ...     async for page_index, image in renderer.render_pages("input.pdf", 150, "png"):
+        ...         await response.write(image)
+        """
+        if workers is None:
+            cpu_count = os.cpu_count()
+            assert cpu_count is not None
+            self.workers = cpu_count
+        else:
+            self.workers = workers
+        assert max_jobs > 0 and chunk > 0
+        self.window = window or 2 * self.workers
+        self.chunk = chunk
+        self.mp_context = mp_context
+        self.encode_params = encode_params
+        self._jobs = asyncio.Semaphore(max_jobs)
+        self._pool: future.ProcessPoolExecutor | None = None
+
+    async def __aenter__(self) -> "AsyncRenderer":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    @property
+    def pool(self) -> future.ProcessPoolExecutor:
+        """
+        process pool (第一次使用時建立)
+        """
+        if self._pool is None:
+            context = None if self.mp_context is None else mp.get_context(self.mp_context)
+            self._pool = future.ProcessPoolExecutor(self.workers, mp_context=context)
+        return self._pool
+
+    async def close(self) -> None:
+        """
+        關閉 process pool (取消尚未開始的任務，不阻塞 event loop)
+        """
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.to_thread(pool.shutdown, cancel_futures=True)
+
+    async def render_pages(
+        self,
+        pdf_path: str | Path,
+        dpi: int = 100,
+        format: str = "png",
+        *,
+        pages: Sequence[int] | None = None,
+    ) -> AsyncIterator[tuple[int, bytes]]:
+        """
+        依頁碼順序非同步地回傳每一頁的 image
+
+        Parameters
+        ----------
+        + `pages` : Sequence[int] | None
+            只渲染這些頁碼 (0-based indexing)，預設為全部頁面
+
+        Returns
+        -------
+        + AsyncIterator[tuple[int, bytes]]
+            (頁碼 (0-based indexing), 編碼後的 image)
+
+        Raises
+        ------
+        + ValueError
+            未知的 image 格式所引起的錯誤 (在提交任何頁面前拋出)
+        """
+        if format != array_util.RAW_FORMAT:
+            image_util.get_pil_format(format)
+        loop = asyncio.get_running_loop()
+        pdf_path = os.path.abspath(pdf_path)
+
+        async with self._jobs:  # 超過 job 數上限時在此等待
+            if pages is None:
+                page_count = await loop.run_in_executor(
+                    self.pool, pdf_util.get_pdf_page_count, pdf_path
+                )
+                pages = range(page_count)
+
+            # (頁碼, 渲染任務)
+            pending: deque[tuple[Sequence[int], asyncio.Future[list[bytes]]]] = deque()
+            try:
+                for begin in range(0, len(pages), self.chunk):
+                    chunk_pages = pages[begin : begin + self.chunk]
+                    rendering = loop.run_in_executor(
+                        self.pool,
+                        render_chunk,
+                        pdf_path,
+                        chunk_pages,
+                        dpi,
+                        format,
+                        self.encode_params,
+                    )
+                    pending.append((chunk_pages, rendering))
+                    if len(pending) >= self.window:  # 佇列已滿，先交出最早的一段
+                        chunk_pages, rendering = pending.popleft()
+                        for page in zip(chunk_pages, await rendering, strict=True):
+                            yield page
+
+                while pending:
+                    chunk_pages, rendering = pending.popleft()
+                    for page in zip(chunk_pages, await rendering, strict=True):
+                        yield page
+            finally:  # 取消或提早離開：尚未開始的任務不再執行
+                for _, rendering in pending:
+                    rendering.cancel()
@@ -0,0 +1,188 @@
+# standard library
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+
+MANIFEST_NAME = "manifest.json"
+OBJECTS_DIR = "objects"
+
+
+class RenderCache:
+    def __init__(
+        self,
+        root: str | Path,
+        *,
+        max_size: int | None = None,
+        max_age: float | None = None,
+    ) -> None:
+        """
+        渲染快取 (content-addressed)
+
+        每一頁以 (pdf 內容 hash, 頁碼, dpi, 格式, ...) 為 key，
+        命中時直接以 hard link (或複製) 取代渲染
+
+        Parameters
+        ----------
+        + `root` : str | Path
+            快取目錄
+        + `max_size` : int | None
+            快取大小上限 (bytes)，超過時刪除最久未使用的頁面
+        + `max_age` : float | None
+            頁面最久保存時間 (seconds)
+        """
+        self.root = Path(root)
+        self.max_size = max_size
+        self.max_age = max_age
+        self._documents: dict[str, list] | None = None  # manifest (只在主進程載入)
+
+    def __getstate__(self) -> dict:
+        """傳給 worker 時不帶 manifest"""
+        state = self.__dict__.copy()
+        state["_documents"] = None
+        return state
+
+    @property
+    def documents(self) -> dict[str, list]:
+        """
+        manifest：{pdf 絕對路徑: [檔案大小, 修改時間 (ns), sha256]}
+        """
+        if self._documents is None:
+            try:
+                with open(self.root / MANIFEST_NAME, encoding="utf-8") as manifest:
+                    self._documents = json.load(manifest)["documents"]
+            except (FileNotFoundError, json.JSONDecodeError, KeyError):
+                self._documents = {}
+        return self._documents
+
+    def document_key(self, pdf_path: str | Path) -> str:
+        """
+        pdf 內容的 sha256 (檔案大小與修改時間未變時直接沿用 manifest 中的紀錄)
+
+        Returns
+        -------
+        + str
+        """
+        pdf_path = os.path.abspath(pdf_path)
+        stat = os.stat(pdf_path)
+        record = self.documents.get(pdf_path)
+        if record is not None and record[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return record[2]
+
+        digest = hashlib.sha256()
+        with open(pdf_path, "rb") as pdf_file:
+            while chunk := pdf_file.read(1024 * 1024):
+                digest.update(chunk)
+        self.documents[pdf_path] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return digest.hexdigest()
+
+    @staticmethod
+    def page_key(document_key: str, page_index: int, **options) -> str:
+        """
+        一頁渲染結果的 key
+
+        Parameters
+        ----------
+        + `document_key` : str
+            pdf 內容 hash
+        + `page_index` : int
+            頁碼 (0-based indexing)
+        + `options` :
+            影響輸出的渲染參數 (dpi、格式等)
+
+        Returns
+        -------
+        + str
+        """
+        payload = json.dumps([document_key, page_index, options], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _object_path(self, page_key: str, suffix: str) -> Path:
+        return self.root / OBJECTS_DIR / page_key[:2] / f"{page_key}{suffix}"
+
+    def contains(self, page_key: str, suffix: str) -> bool:
+        return self._object_path(page_key, suffix).is_file()
+
+    def fetch(self, page_key: str, image_path: Path) -> bool:
+        """
+        若快取命中，將頁面連結 (或複製) 到 `image_path`
+
+        Returns
+        -------
+        + bool
+            是否命中
+        """
+        object_path = self._object_path(page_key, image_path.suffix)
+        try:
+            _link_or_copy(object_path, image_path)
+        except FileNotFoundError:
+            return False
+        os.utime(object_path)  # 更新使用時間 (LRU)
+        return True
+
+    def store(self, page_key: str, image_path: Path) -> None:
+        """
+        將剛渲染完成的頁面加入快取 (原子性地放入，可由多個 worker 同時呼叫)
+        """
+        object_path = self._object_path(page_key, image_path.suffix)
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = object_path.with_name(f".{uuid.uuid4().hex}{image_path.suffix}")
+        _link_or_copy(image_path, temp_path)
+        os.replace(temp_path, object_path)
+
+    def close(self) -> None:
+        """
+        寫回 manifest 並依大小與時間上限淘汰頁面 (只在主進程呼叫)
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        if self._documents is not None:
+            documents = {  # 移除已不存在的 pdf
+                pdf_path: record
+                for pdf_path, record in self._documents.items()
+                if os.path.exists(pdf_path)
+            }
+            temp_path = self.root / f".{MANIFEST_NAME}.{uuid.uuid4().hex}"
+            with open(temp_path, "w", encoding="utf-8") as manifest:
+                json.dump({"documents": documents}, manifest)
+            os.replace(temp_path, self.root / MANIFEST_NAME)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        刪除超過保存時間的頁面，再由最久未使用的頁面開始刪除，直到不超過大小上限
+        """
+        if self.max_size is None and self.max_age is None:
+            return
+
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root / OBJECTS_DIR):
+            for filename in filenames:
+                object_path = os.path.join(dirpath, filename)
+                stat = os.stat(object_path)
+                entries.append((stat.st_mtime, stat.st_size, object_path))
+        entries.sort()  # 最久未使用的在前
+
+        now = time.time()
+        total_size = sum(size for _, size, _ in entries)
+        for mtime, size, object_path in entries:
+            expired = self.max_age is not None and now - mtime > self.max_age
+            oversize = self.max_size is not None and total_size > self.max_size
+            if not (expired or oversize):
+                continue
+            os.remove(object_path)
+            total_size -= size
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """
+    建立 hard link (跨檔案系統等無法連結時改為複製)
+    """
+    try:
+        os.link(src, dst)
+    except FileNotFoundError:
+        raise
+    except OSError:
+        shutil.copyfile(src, dst)
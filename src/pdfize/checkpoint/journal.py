@@ -0,0 +1,123 @@
+# standard library
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+
+JOURNAL_NAME = ".pdfize-journal.jsonl"
+_OPEN_LOCK = threading.Lock()  # encoder threads 同時紀錄時，只開啟一次紀錄檔
+
+
+class Journal:
+    def __init__(self, directory: str | Path, job: dict) -> None:
+        """
+        續傳紀錄 (checkpoint journal)
+
+        第一行為工作參數，之後每完成一頁附加一行 `[相對路徑, 檔案大小]`，
+        每一行都以一次 `O_APPEND` 寫入，因此多個 worker 可同時寫入，
+        中斷時最多只會留下一行不完整的紀錄 (載入時忽略)
+
+        Parameters
+        ----------
+        + `directory` : str | Path
+            輸出目錄 (紀錄檔存放於其中)
+        + `job` : dict
+            工作參數 (續傳時需與紀錄相同)
+        """
+        self.directory = Path(directory)
+        self.job = job
+        self.done: set[str] = set()  # 已完成的頁面 (只在主進程載入)
+        self._fd: int | None = None
+
+    def __getstate__(self) -> dict:
+        """傳給 worker 時不帶已完成頁面與 file descriptor"""
+        state = self.__dict__.copy()
+        state["done"] = set()
+        state["_fd"] = None
+        return state
+
+    @property
+    def path(self) -> Path:
+        return self.directory / JOURNAL_NAME
+
+    def begin(self) -> None:
+        """
+        開始 (或續傳) 工作
+
+        若目錄中已有紀錄，驗證已完成的頁面 (檔案存在且大小相符)，
+        並以驗證後的紀錄原子性地取代舊紀錄；否則目錄需為空目錄
+
+        Raises
+        ------
+        + FileExistsError
+            目錄不為空目錄且沒有紀錄，或紀錄屬於不同的工作所引起的錯誤
+        """
+        records: dict[str, int] = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as journal:
+                header = journal.readline()
+                if not header.endswith("\n") or json.loads(header) != self.job:
+                    raise FileExistsError(
+                        f"Journal '{self.path.resolve()}' belongs to a different job."
+                    )
+                for line in journal:
+                    if not line.endswith("\n"):  # 中斷時寫到一半的紀錄
+                        break
+                    relpath, size = json.loads(line)
+                    records[relpath] = size
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+            if os.listdir(self.directory):
+                raise FileExistsError(
+                    f"Directory '{self.directory.resolve()}' not empty and has no journal."
+                )
+
+        self.done = {
+            relpath
+            for relpath, size in records.items()
+            if _file_size(self.directory / relpath) == size
+        }
+
+        temp_path = self.directory / f".{JOURNAL_NAME}.{uuid.uuid4().hex}"
+        with open(temp_path, "w", encoding="utf-8") as journal:
+            journal.write(json.dumps(self.job) + "\n")
+            for relpath in sorted(self.done):
+                journal.write(json.dumps([relpath, records[relpath]]) + "\n")
+        os.replace(temp_path, self.path)
+
+    def is_done(self, image_path: Path) -> bool:
+        return os.path.relpath(image_path, self.directory) in self.done
+
+    def record(self, image_path: Path) -> None:
+        """
+        紀錄一頁已完成 (檔案需已完整寫入，可由多個 thread 同時呼叫)
+        """
+        with _OPEN_LOCK:
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+        relpath = os.path.relpath(image_path, self.directory)
+        line = json.dumps([relpath, os.path.getsize(image_path)]) + "\n"
+        os.write(self._fd, line.encode())
+
+    def close(self) -> None:
+        """
+        關閉紀錄檔 (之後仍可繼續紀錄)
+        """
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def finish(self) -> None:
+        """
+        工作完成，刪除紀錄
+        """
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+def _file_size(path: Path) -> int | None:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
@@ -0,0 +1,176 @@
+# standard library
+import concurrent.futures as future
+import os
+import re
+from collections.abc import Iterator, Sequence
+from pathlib import Path, PurePosixPath
+
+DIGITS = re.compile(r"(\d+)")
+LOOKAHEAD = 4  # 每個 walker thread 最多預先讀取的目錄數
+
+
+def natural_key(name: str) -> tuple:
+    """
+    自然排序的 key (`page-2` 排在 `page-10` 之前，不分大小寫)
+
+    Returns
+    -------
+    + tuple
+        (交錯的字串與整數, 原名稱)，原名稱用以使排序結果唯一
+    """
+    parts = tuple(int(part) if part.isdigit() else part.casefold() for part in DIGITS.split(name))
+    return parts, name
+
+
+class _Listing:
+    def __init__(self, entries: list[tuple[Path, bool]]) -> None:
+        """
+        遍歷中的一個目錄
+
+        Parameters
+        ----------
+        + `entries` : list[tuple[Path, bool]]
+            目錄內容 (見 `FileFinder._scan`)
+        """
+        self.entries = entries
+        self.position = 0  # 下一個要回傳的項目
+        self.ahead = 0  # 下一個要檢查是否預先讀取的項目
+        self.scans: dict[
+            int, future.Future
+        ] = {}  # 已提交、尚未取用的子目錄讀取 (項目索引 -> Future)
+
+
+class FileFinder:
+    def __init__(
+        self,
+        *,
+        recursive: bool = False,
+        include: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+        walkers: int = 4,
+    ) -> None:
+        """
+        尋找輸入檔案 (依自然排序，結果與檔案系統無關)
+
+        Parameters
+        ----------
+        + `recursive` : bool
+            是否遞迴搜尋子目錄
+        + `include` : Sequence[str]
+            只保留符合任一 glob 的檔案 (比對相對路徑，由右側開始，例如 `*.pdf`、`scan/*`)
+        + `exclude` : Sequence[str]
+            略過符合任一 glob 的檔案與目錄
+        + `walkers` : int
+            平行讀取目錄的 thread 數 (遞迴時依遍歷順序預先讀取接下來的子目錄，
+            最多 `walkers * LOOKAHEAD` 個，適用於網路檔案系統)
+        """
+        self.recursive = recursive
+        self.include = tuple(include)
+        self.exclude = tuple(exclude)
+        self.walkers = walkers
+
+    def find(self, path: Path, *, suffix: set[str] | str | None = None) -> Iterator[Path]:
+        """
+        若為檔案，回傳檔案路徑。
+        若為目錄，依序回傳目錄 (與子目錄) 中的檔案 (lazy evaluation，邊找邊回傳)。
+
+        Parameters
+        ----------
+        + `suffix` : set[str] | str | None
+            限定副檔名 (for example: ".pdf" or {".jpg", ".png"})
+
+        Raises
+        ------
+        + FileNotFoundError
+            路徑不存在，或目錄中沒有任何檔案符合 `include` 所引起的錯誤
+        """
+        if isinstance(suffix, str):
+            suffix = {suffix}
+
+        if os.path.isfile(path):
+            if suffix is None or path.suffix in suffix:
+                yield path
+            return
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"'{path.resolve()}' does not exist.")
+
+        walker = future.ThreadPoolExecutor(self.walkers, thread_name_prefix="walker")
+        found = False
+        try:
+            stack = [_Listing(self._scan(path, path, suffix))]
+            self._prefetch(walker, stack, path, suffix)
+            while stack:  # 深度優先 (不使用遞迴，目錄層數不受限制)
+                listing = stack[-1]
+                if listing.position == len(listing.entries):
+                    stack.pop()
+                    self._prefetch(walker, stack, path, suffix)
+                    continue
+                entry_path, is_dir = listing.entries[listing.position]
+                scan = listing.scans.pop(listing.position, None)
+                listing.position += 1
+                if is_dir:  # 子目錄
+                    if scan is None:  # 不在 look-ahead window 內，現在才讀取
+                        scan = walker.submit(self._scan, path, entry_path, suffix)
+                    stack.append(_Listing(scan.result()))
+                    self._prefetch(walker, stack, path, suffix)
+                else:
+                    found = True
+                    yield entry_path
+        finally:
+            walker.shutdown(wait=False, cancel_futures=True)
+        if not found and self.include:  # 多半是 glob 寫錯，不要靜靜地什麼都不做
+            patterns = ", ".join(repr(pattern) for pattern in self.include)
+            raise FileNotFoundError(f"No files in '{path.resolve()}' match include {patterns}.")
+
+    def _prefetch(
+        self,
+        walker: future.ThreadPoolExecutor,
+        stack: list[_Listing],
+        root: Path,
+        suffix: set[str] | None,
+    ) -> None:
+        """
+        依遍歷順序預先讀取接下來的子目錄 (由最深的目錄開始)，
+        讀取中與已讀取但尚未取用的目錄最多 `walkers * LOOKAHEAD` 個
+        """
+        budget = self.walkers * LOOKAHEAD - sum(len(listing.scans) for listing in stack)
+        for listing in reversed(stack):
+            if budget <= 0:
+                return
+            listing.ahead = max(listing.ahead, listing.position)
+            while budget > 0 and listing.ahead < len(listing.entries):
+                entry_path, is_dir = listing.entries[listing.ahead]
+                if is_dir:
+                    listing.scans[listing.ahead] = walker.submit(
+                        self._scan, root, entry_path, suffix
+                    )
+                    budget -= 1
+                listing.ahead += 1
+
+    def _scan(
+        self, root: Path, directory: Path, suffix: set[str] | None
+    ) -> list[tuple[Path, bool]]:
+        """
+        讀取一個目錄 (過濾並依自然排序)
+
+        Returns
+        -------
+        + list[tuple[Path, bool]]
+            [(路徑, 是否為子目錄)]
+        """
+        entries = []
+        with os.scandir(directory) as scanner:
+            for entry in scanner:
+                entry_path = Path(entry.path)
+                relpath = PurePosixPath(entry_path.relative_to(root).as_posix())
+                if any(relpath.match(pattern) for pattern in self.exclude):
+                    continue
+                if entry.is_dir():
+                    if self.recursive and not entry.is_symlink():  # 不跟隨目錄連結 (避免循環)
+                        entries.append((entry_path, True))
+                elif (suffix is None or entry_path.suffix in suffix) and (
+                    not self.include or any(relpath.match(pattern) for pattern in self.include)
+                ):
+                    entries.append((entry_path, False))
+        entries.sort(key=lambda entry: natural_key(entry[0].name))
+        return entries
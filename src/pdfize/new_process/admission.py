@@ -0,0 +1,74 @@
+# standard library
+import concurrent.futures as future
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+
+
+def admit(
+    tasks: Iterable[tuple[int, Callable[[], future.Future]]],
+    budget: int,
+    *,
+    lookahead: int,
+) -> Iterator[future.Future]:
+    """
+    依記憶體預算提交任務：已提交但尚未完成的任務，預估記憶體總和不超過 `budget`
+
+    + 依序提交放得進剩餘預算的任務；排在前面的大任務放不下時，後面放得下的小任務先提交
+      (first-fit，小頁面仍可用滿所有 workers)
+    + 最前面的任務被略過 `lookahead` 次後，不再讓後面的任務插隊，等待預算釋出 (避免飢餓)
+    + 單一任務超過整個預算時，等到沒有其他任務在執行後單獨提交
+
+    Parameters
+    ----------
+    + `tasks` : Iterable[tuple[int, Callable[[], Future]]]
+        (預估記憶體 (bytes), 提交此任務的函式)，可為 lazy 的序列
+    + `budget` : int
+        記憶體預算 (bytes)
+    + `lookahead` : int
+        最多同時考慮幾個尚未提交的任務
+
+    Returns
+    -------
+    + Iterator[Future]
+        已提交的任務 (依提交順序)；未完成的任務出錯時於此拋出
+    """
+    assert budget > 0 and lookahead > 0
+    tasks = iter(tasks)
+    waiting: deque[tuple[int, Callable[[], future.Future]]] = deque()
+    running: dict[future.Future, int] = {}  # 任務 -> 預估記憶體
+    used = 0
+    bypassed = 0  # 最前面的任務被略過的次數
+
+    def release(done: Iterable[future.Future]) -> None:
+        nonlocal used
+        for finished in done:
+            used -= running.pop(finished)
+            finished.result()  # 若 worker 出錯，於此拋出
+
+    exhausted = False
+    while True:
+        while not exhausted and len(waiting) < lookahead:
+            task = next(tasks, None)
+            if task is None:
+                exhausted = True
+            else:
+                waiting.append(task)
+        if not waiting:
+            return
+
+        release([running_task for running_task in running if running_task.done()])
+        candidates = list(waiting)[: 1 if bypassed >= lookahead else None]
+        chosen = next((task for task in candidates if used + task[0] <= budget), None)
+        if chosen is None and not running:  # 超過整個預算的任務
+            chosen = waiting[0]
+        if chosen is None:  # 等待任一任務完成，釋出預算
+            done, _ = future.wait(running, return_when=future.FIRST_COMPLETED)
+            release(done)
+            continue
+
+        bypassed = 0 if chosen is waiting[0] else bypassed + 1
+        waiting.remove(chosen)
+        submitted = chosen[1]()
+        running[submitted] = chosen[0]
+        used += chosen[0]
+        yield submitted
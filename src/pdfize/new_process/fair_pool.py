@@ -0,0 +1,149 @@
+# standard library
+import concurrent.futures as future
+import threading
+from collections import deque
+from collections.abc import Callable
+
+
+class FairSession(future.Executor):
+    def __init__(self, pool: "FairPool") -> None:
+        """
+        一個 job 使用的 executor (由 `FairPool.session` 建立)
+
+        介面同 `ProcessPoolExecutor`；離開 context manager 時等待此 job 的任務完成，
+        不會關閉共用的 process pool
+        """
+        self.pool = pool
+        self.queue: deque[tuple[future.Future, Callable, tuple, dict]] = deque()
+        self.futures: set[future.Future] = set()
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> future.Future:
+        submitted: future.Future = future.Future()
+        self.futures.add(submitted)
+        submitted.add_done_callback(self.futures.discard)
+        self.pool._enqueue(self, (submitted, fn, args, kwargs))
+        return submitted
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        結束此 job (`cancel_futures` 時取消尚未開始的任務)
+        """
+        if cancel_futures:
+            self.pool._cancel(self)
+        if wait:
+            future.wait(list(self.futures))
+
+
+class FairPool:
+    def __init__(self, executor: future.ProcessPoolExecutor, *, window: int) -> None:
+        """
+        多個 job 公平共用一個長期存在的 process pool
+
+        每個 job 的任務先放在各自的佇列，由 dispatcher thread 以 round-robin 的方式
+        依序從每個 job 取一個任務送進 pool，且最多只有 `window` 個任務在 pool 中
+        (大 job 不會佔滿 pool 的佇列，小 job 不必等大 job 全部做完)
+
+        Parameters
+        ----------
+        + `executor` : ProcessPoolExecutor
+            共用的 process pool (已 warm up 的 workers)
+        + `window` : int
+            同時送進 pool 的任務數上限 (建議為 worker 數的 1 ~ 2 倍)
+        """
+        assert window > 0
+        self.executor = executor
+        self.window = window
+        self._sessions: deque[FairSession] = deque()  # 有任務在排隊的 job (round-robin)
+        self._running = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._dispatcher = threading.Thread(target=self._dispatch, name="dispatcher", daemon=True)
+        self._dispatcher.start()
+
+    def session(self) -> FairSession:
+        """
+        建立一個 job 的 executor
+        """
+        return FairSession(self)
+
+    def shutdown(self) -> None:
+        """
+        關閉 process pool (取消所有排隊中的任務，等待執行中的任務完成)
+        """
+        with self._condition:
+            self._closed = True
+            for session in self._sessions:
+                for submitted, _, _, _ in session.queue:
+                    submitted.cancel()
+                session.queue.clear()
+            self._sessions.clear()
+            self._condition.notify_all()
+        self._dispatcher.join()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def _enqueue(self, session: FairSession, task: tuple) -> None:
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            if not session.queue:
+                self._sessions.append(session)
+            session.queue.append(task)
+            self._condition.notify_all()
+
+    def _cancel(self, session: FairSession) -> None:
+        with self._condition:
+            for submitted, _, _, _ in session.queue:
+                submitted.cancel()
+            session.queue.clear()
+            if session in self._sessions:
+                self._sessions.remove(session)
+
+    def _dispatch(self) -> None:
+        """
+        dispatcher thread：輪流從每個 job 取一個任務送進 pool
+        """
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._closed or (self._sessions and self._running < self.window)
+                )
+                if self._closed:
+                    return
+                session = self._sessions.popleft()
+                submitted, fn, args, kwargs = session.queue.popleft()
+                if session.queue:
+                    self._sessions.append(session)  # 排到最後 (round-robin)
+                if not submitted.set_running_or_notify_cancel():  # 已取消
+                    continue
+                self._running += 1
+
+            try:
+                running = self.executor.submit(fn, *args, **kwargs)
+            except BaseException as error:  # 例如 BrokenProcessPool
+                submitted.set_exception(error)
+                self._task_done()
+            else:
+                running.add_done_callback(
+                    lambda done, submitted=submitted: self._copy(done, submitted)
+                )
+
+    def _copy(self, done: future.Future, submitted: future.Future) -> None:
+        """
+        將 pool 中任務的結果交給 job 的 Future
+        (pool 關閉時被取消的任務，job 的 Future 已在執行中，無法取消，改設為 `CancelledError`)
+        """
+        if done.cancelled():
+            submitted.set_exception(future.CancelledError())
+            self._task_done()
+            return
+        error = done.exception()
+        if error is None:
+            submitted.set_result(done.result())
+        else:
+            submitted.set_exception(error)
+        self._task_done()
+
+    def _task_done(self) -> None:
+        with self._condition:
+            self._running -= 1
+            self._condition.notify_all()
@@ -1,4 +1,6 @@
 # standard library
+import copy
+import time
 from multiprocessing.synchronize import RLock
 
 # third party library
@@ -6,9 +8,15 @@ from tqdm import tqdm
 
 # local module
 from ..progress_bar.cli import CLIPbar
+from ..tracing.tracer import Tracer
 
 
-def initializer(pbar_output_lock: RLock, pbar_style: str) -> None:
+def initializer(
+    pbar_output_lock: RLock,
+    pbar_style: str,
+    tracer: Tracer | None = None,
+    created: int = 0,
+) -> None:
     """
     新 process 的初始化設定
 
@@ -18,6 +26,14 @@ def initializer(pbar_output_lock: RLock, pbar_style: str) -> None:
         進度條輸出鎖
     + `pbar_style` : str
         進度條樣式 (詳見 `src.progress_bar.enums.PbarStyle`)
+    + `tracer` : Tracer | None
+        紀錄 worker 啟動耗時
+    + `created` : int
+        建立 process pool 的時間 (`time.perf_counter_ns()`)
     """
     tqdm.set_lock(pbar_output_lock)
     CLIPbar.style = pbar_style
+    if tracer is not None:
+        tracer = copy.copy(tracer)  # fork 時 tracer 未經 pickle，不可帶入主進程已紀錄的 span
+        tracer.add("worker_startup", created, time.perf_counter_ns())
+        tracer.flush()
@@ -1,4 +1,12 @@
 # standard library
+import functools
 import multiprocessing as mp
+from multiprocessing.synchronize import RLock
 
-PBAR_OUTPUT_LOCK = mp.RLock()
+
+@functools.cache
+def get_pbar_output_lock() -> RLock:
+    """
+    進度條輸出鎖 (第一次使用時才建立，import 時不建立 semaphore)
+    """
+    return mp.RLock()
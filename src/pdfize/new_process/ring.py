@@ -0,0 +1,90 @@
+# standard library
+import functools
+from collections import deque
+from multiprocessing import shared_memory
+
+
+class PageRing:
+    def __init__(self, slots: int, slot_size: int) -> None:
+        """
+        共享記憶體中一組可重複使用的 page buffer (ring)
+
+        主進程配置 slot 交給 worker 寫入 (`write`)，再直接以 memoryview 讀取 (zero-copy)，
+        讀完後歸還 slot 供下一頁使用
+
+        Parameters
+        ----------
+        + `slots` : int
+            buffer 數 (即最多同時處理中的頁數)
+        + `slot_size` : int
+            每個 buffer 的大小 (bytes，需容納最大的一頁)
+        """
+        assert slots > 0
+        self.slot_size = max(1, slot_size)
+        self.memory = shared_memory.SharedMemory(create=True, size=slots * self.slot_size)
+        self._free = deque(range(slots))
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def acquire(self) -> int | None:
+        """
+        取得一個空的 slot
+
+        Returns
+        -------
+        + int | None
+            slot 在共享記憶體中的 offset；沒有空的 slot 時為 None
+        """
+        return self._free.popleft() * self.slot_size if self._free else None
+
+    def view(self, offset: int, shape: tuple[int, ...]) -> memoryview:
+        """
+        以 `shape` 讀取 slot 的內容 (不複製)
+        """
+        size = functools.reduce(int.__mul__, shape, 1)
+        return self.memory.buf[offset : offset + size].cast("B", shape)
+
+    def release(self, offset: int, view: memoryview | None = None) -> None:
+        """
+        歸還 slot (並使先前回傳的 `view` 失效)
+        """
+        if view is not None:
+            try:
+                view.release()
+            except BufferError:  # 使用者仍持有以 view 建立的物件 (例如 numpy array)
+                pass
+        self._free.append(offset // self.slot_size)
+
+    def close(self) -> None:
+        """
+        釋放共享記憶體 (所有 worker 都寫完後才可呼叫)
+        """
+        try:
+            self.memory.close()
+        except BufferError:  # 仍有未釋放的 view，留待 garbage collection
+            pass
+        self.memory.unlink()
+
+
+@functools.lru_cache(maxsize=1)
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    worker 中開啟的共享記憶體 (換成新的 ring 時，舊的隨快取淘汰而關閉)
+    """
+    return shared_memory.SharedMemory(name=name)
+
+
+def write(name: str, offset: int, data: memoryview | bytes) -> None:
+    """
+    將一頁寫入 ring 的 slot (在 worker 中執行)
+
+    Parameters
+    ----------
+    + `name` : str
+        `PageRing.name`
+    + `offset` : int
+        `PageRing.acquire` 取得的 slot offset
+    """
+    _attach(name).buf[offset : offset + len(data)] = data
@@ -1,14 +1,16 @@
 # standard library
-import os
 from collections.abc import Iterable
 from pathlib import Path
 
 # local module
+from ..discovery.finder import FileFinder
 from ..progress_bar.base import Pbar
 
 
 class Processor:
-    def __init__(self, path: str | Path, *, pbar_class: type[Pbar]) -> None:
+    def __init__(
+        self, path: str | Path, *, pbar_class: type[Pbar], finder: FileFinder | None = None
+    ) -> None:
         """
         Parameters
         ----------
@@ -16,15 +18,18 @@ class Processor:
             路徑 (可為目錄或檔案)
         + `pbar_class`: Type[Pbar]
             進度條類型
+        + `finder` : FileFinder | None
+            輸入檔案的搜尋方式 (遞迴、glob 過濾；預設只搜尋目錄本身)
         """
         self.path = Path(path)
         self.pbar_class = pbar_class
+        self.finder = finder or FileFinder()
 
     def get_filepaths(self, *, suffix: set[str] | str | None = None) -> Iterable[Path]:
         """
         路徑需存在。
         若為檔案，回傳檔案路徑。
-        若為目錄，回傳目錄中所有檔案與子目錄路徑 (lazy evaluation)。
+        若為目錄，依自然排序回傳目錄中的檔案 (lazy evaluation，邊找邊回傳)。
 
         Parameters
         ----------
@@ -41,18 +46,4 @@ class Processor:
         + FileNotFoundError
             路徑不存在所引起的錯誤
         """
-        filepaths: Iterable[Path]
-
-        if os.path.isfile(self.path):
-            filepaths = (self.path,)
-        elif os.path.isdir(self.path):
-            filepaths = (Path(entry.path) for entry in os.scandir(self.path))
-        else:
-            raise FileNotFoundError(f"'{self.path.resolve()}' does not exist.")
-
-        if isinstance(suffix, str):
-            filepaths = filter(lambda filepath: filepath.suffix == suffix, filepaths)
-        elif isinstance(suffix, set):
-            filepaths = filter(lambda filepath: filepath.suffix in suffix, filepaths)
-
-        return filepaths
+        return self.finder.find(self.path, suffix=suffix)
@@ -1,17 +1,28 @@
 # standard library
+import concurrent.futures as future
+import io
+import os
+from collections import deque
 from pathlib import Path
 
 # third party library
 import fitz
+from PIL import Image
 
 # local module
+from ..discovery.finder import FileFinder
 from ..progress_bar.base import NoPbar, Pbar
+from ..util import image_util
 from .base import Processor
 
+EXIF_ORIENTATION = 0x0112  # EXIF 方向標籤
+
 
 class ImageProcessor(Processor):
-    def __init__(self, path: str | Path, *, pbar_class: type[Pbar]) -> None:
-        super().__init__(path, pbar_class=pbar_class)
+    def __init__(
+        self, path: str | Path, *, pbar_class: type[Pbar], finder: FileFinder | None = None
+    ) -> None:
+        super().__init__(path, pbar_class=pbar_class, finder=finder)
 
     def to_pdf(self, pdf: Path):
         """
@@ -21,8 +32,77 @@ class ImageProcessor(Processor):
 
 
 class ImageSingleProcessor(ImageProcessor):
-    def __init__(self, path: str | Path, *, pbar_class: type[Pbar] = NoPbar) -> None:
-        super().__init__(path, pbar_class=pbar_class)
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        pbar_class: type[Pbar] = NoPbar,
+        finder: FileFinder | None = None,
+    ) -> None:
+        super().__init__(path, pbar_class=pbar_class, finder=finder)
+
+    @staticmethod
+    def _insert_image(pdf_file: fitz.Document, image_path: Path) -> None:
+        """
+        將一張 image 直接嵌入為一頁 (頁面大小同 image)
+
+        JPEG 只讀取 header (頁面大小依其解析度換算)，壓縮資料原封不動複製成 image stream，
+        不解碼、不重新編碼；PNG 交給 MuPDF 嵌入 (重新壓縮後通常比原檔小)，
+        其餘格式則交給 MuPDF 整份轉換 (JPX 同樣原封不動複製)
+        """
+        data = image_path.read_bytes()
+        with Image.open(io.BytesIO(data)) as header:  # 只讀取 header
+            if (
+                header.format not in ("JPEG", "PNG")
+                or getattr(header, "n_frames", 1) > 1
+                # info 中沒有 exif 時 getexif 會解碼整張 PNG 尋找 eXIf chunk，因此先檢查
+                or ("exif" in header.info and header.getexif().get(EXIF_ORIENTATION, 1) != 1)
+            ):
+                # 其餘格式 (如多頁 TIFF)、多影格或帶有 EXIF 方向的 image，交給 MuPDF 整份轉換
+                with (
+                    fitz.open(stream=data, filetype=image_path.name) as image_file,
+                    fitz.open("pdf", image_file.convert_to_pdf()) as one_pdf,
+                ):
+                    pdf_file.insert_pdf(one_pdf)
+                return
+            width, height = image_util.image_page_size(header)
+            xobject = image_util.jpeg_xobject(header, data) if header.format == "JPEG" else None
+
+        page = pdf_file.new_page(width=width, height=height)
+        if xobject is None:
+            page.insert_image(page.rect, stream=data)
+        else:
+            page.insert_image(page.rect, xref=image_util.add_image_xobject(pdf_file, *xobject))
+
+    @classmethod
+    def _image_to_pdfbytes(cls, image_path: Path) -> bytes:
+        """
+        一張 image 轉成一頁 PDF (in memory)
+
+        Returns
+        -------
+        + bytes
+            一頁 PDF 的內容
+
+        Raises
+        ------
+        + ValueError
+            無法轉換此 image 所引起的錯誤 (MuPDF 的例外無法 pickle 回主進程，改以檔名與訊息拋出)
+        """
+        try:
+            with fitz.open() as one_pdf:
+                cls._insert_image(one_pdf, image_path)
+                return one_pdf.tobytes(deflate=True)
+        except Exception as error:
+            raise ValueError(f"{image_path}: {error}") from error
+
+    @staticmethod
+    def _append_pdfbytes(pdf_file: fitz.Document, pdfbytes: bytes) -> None:
+        """
+        附加一頁 PDF
+        """
+        with fitz.open("pdf", pdfbytes) as one_pdf:  # 以 PDF 開啟
+            pdf_file.insert_pdf(one_pdf)  # 空檔案附加一頁 PDF
 
     def to_pdf(self, pdf: Path) -> None:
         """
@@ -39,10 +119,60 @@ class ImageSingleProcessor(ImageProcessor):
 
             with self.pbar_class(total=total_images, unit="image") as pbar:
                 for image_path in image_paths:  # 遍歷每一張 image
-                    with fitz.open(image_path) as image_file:  # 開啟 image
-                        pdfbytes = image_file.convert_to_pdf()  # image 轉成一頁 PDF
-                    with fitz.open("pdf", pdfbytes) as one_pdf:  # 以 PDF 開啟
-                        pdf_file.insert_pdf(one_pdf)  # 空檔案附加一頁 PDF
+                    self._insert_image(pdf_file, image_path)
+                    pbar.update(1)
+
+            pdf_file.save(pdf, deflate=True)  # 壓縮未經壓縮的 stream (image 與頁面內容)
+
+
+class ImageParallelProcessor(ImageSingleProcessor):
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        pbar_class: type[Pbar] = NoPbar,
+        finder: FileFinder | None = None,
+        workers: int | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        + `workers` : int | None
+            worker process 數 (預設: CPU 核心數)
+        """
+        super().__init__(path, pbar_class=pbar_class, finder=finder)
+        if workers is None:
+            cpu_count = os.cpu_count()
+            assert cpu_count is not None
+            self.workers = cpu_count
+        else:
+            self.workers = workers
+
+    def to_pdf(self, pdf: Path) -> None:
+        """
+        將 image 轉為 pdf (multiprocessing)
+
+        workers 平行解碼並轉成一頁 PDF，主進程依檔案順序組裝，
+        最多同時有 `4 * self.workers` 張 image 在處理中 (backpressure)；
+        image 邊找邊提交 (進度條總數隨之增加)
+        """
+        assert pdf.suffix == ".pdf"
+
+        with (
+            fitz.open() as pdf_file,  # 空檔案
+            future.ProcessPoolExecutor(max_workers=self.workers) as pool,
+        ):
+            with self.pbar_class(total=0, unit="image", main=True) as pbar:
+                pending: deque[future.Future] = deque()
+                for image_path in self.get_filepaths():  # 遍歷每一張 image (lazy evaluation)
+                    pending.append(pool.submit(self._image_to_pdfbytes, image_path))
+                    pbar.total += 1
+                    if len(pending) >= 4 * self.workers:  # 佇列已滿，先組裝最早的一頁
+                        self._append_pdfbytes(pdf_file, pending.popleft().result())
+                        pbar.update(1)
+
+                while pending:
+                    self._append_pdfbytes(pdf_file, pending.popleft().result())
                     pbar.update(1)
 
-            pdf_file.save(pdf)
+            pdf_file.save(pdf, deflate=True)
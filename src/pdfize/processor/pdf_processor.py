@@ -1,11 +1,17 @@
 # standard library
 import concurrent.futures as future
-import io
+import contextlib
+import functools
 import itertools
+import math
 import multiprocessing as mp
 import os
 import shutil
-import uuid
+import tempfile
+import time
+import zlib
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from pathlib import Path
 
 # third party library
@@ -13,15 +19,23 @@ import fitz
 from PIL import Image
 
 # local module
-from ..new_process import init, lock
+from ..cache.render_cache import RenderCache
+from ..checkpoint.journal import Journal
+from ..discovery.finder import FileFinder
+from ..new_process import admission, init, lock, ring
+from ..new_process.fair_pool import FairPool
 from ..progress_bar.base import NoPbar, Pbar
-from ..util import path_util, pdf_util
+from ..tracing import tracer as tracing
+from ..tracing.tracer import Tracer
+from ..util import array_util, band_util, image_util, path_util, pdf_util, thumbnail_util
 from .base import Processor
 
 
 class PdfProcessor(Processor):
-    def __init__(self, path: str, *, pbar_class: type[Pbar]) -> None:
-        super().__init__(path, pbar_class=pbar_class)
+    def __init__(
+        self, path: str, *, pbar_class: type[Pbar], finder: FileFinder | None = None
+    ) -> None:
+        super().__init__(path, pbar_class=pbar_class, finder=finder)
 
     def to_images(
         self,
@@ -31,18 +45,61 @@ class PdfProcessor(Processor):
         *,
         name: str | None,
         subdir: bool,
+        specs: Sequence[tuple[int, str, str]] = (),
     ) -> None:
         """
         將 pdf 轉為 image
         """
         raise NotImplementedError
 
+    def iter_images(
+        self,
+        dpi: int,
+        format: str,
+        *,
+        pages: Sequence[int] | None = None,
+        ordered: bool = True,
+    ) -> Iterator[tuple[int, bytes | memoryview]]:
+        """
+        將 pdf 轉為 image (in memory)
+        """
+        raise NotImplementedError
+
+    def to_thumbnails(
+        self,
+        image: Path,
+        box: tuple[int, int],
+        format: str,
+        *,
+        subdir: bool,
+        sprite: bool = False,
+        columns: int = 10,
+        aa_level: int = 2,
+        annots: bool = False,
+    ) -> None:
+        """
+        將 pdf 轉為縮圖
+        """
+        raise NotImplementedError
+
     def split(self, output_pdf: Path, from_page: int, to_page: int) -> None:
         """
         將 pdf 拆分
         """
         raise NotImplementedError
 
+    def split_ranges(self, output_pdf: Path, page_ranges: Sequence[tuple[int, int]]) -> None:
+        """
+        將 pdf 依多個頁碼範圍拆分
+        """
+        raise NotImplementedError
+
+    def burst(self, output_pdf: Path, every: int) -> None:
+        """
+        將 pdf 每 `every` 頁拆分成一份
+        """
+        raise NotImplementedError
+
     def merge(self, output_pdf: Path) -> None:
         """
         將 pdf 合併
@@ -51,8 +108,51 @@ class PdfProcessor(Processor):
 
 
 class PdfSingleProcessor(PdfProcessor):
-    def __init__(self, path: str, *, pbar_class: type[Pbar] = NoPbar) -> None:
-        super().__init__(path, pbar_class=pbar_class)
+    def __init__(
+        self,
+        path: str,
+        *,
+        pbar_class: type[Pbar] = NoPbar,
+        finder: FileFinder | None = None,
+        encoders: int | None = None,
+        encode_params: image_util.EncodeParams | None = None,
+        band_size: int | None = None,
+        cache: RenderCache | None = None,
+        resume: bool = False,
+        tracer: Tracer | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        + `encoders` : int | None
+            每個 process 中負責 image 編碼與寫檔的 thread 數 (預設: CPU 核心數)
+        + `encode_params` : EncodeParams | None
+            各格式的編碼參數 (見 `image_util.build_encode_params`)，預設使用 PIL 預設值
+        + `band_size` : int | None
+            pixmap 超過此大小 (bytes) 的頁面，分成多條水平條帶渲染 (每條不超過此大小)，
+            再以串流 PNG 編碼器依序接成一張 (只支援 png；預設整頁一次渲染)
+        + `cache` : RenderCache | None
+            渲染快取 (命中的頁面不重新渲染)
+        + `resume` : bool
+            於輸出目錄中紀錄已完成的頁面，中斷後可續傳 (只渲染尚未完成的頁面)
+        + `tracer` : Tracer | None
+            紀錄各階段耗時 (包含 worker)
+        """
+        super().__init__(path, pbar_class=pbar_class, finder=finder)
+        if encoders is None:
+            cpu_count = os.cpu_count()
+            assert cpu_count is not None
+            self.encoders = cpu_count
+        else:
+            assert encoders > 0
+            self.encoders = encoders
+        self.encode_params = encode_params or {}
+        self.band_size = band_size
+        self.cache = cache
+        self.resume = resume
+        self.journal: Journal | None = None
+        self.specs: Sequence[tuple[int, str, str]] = ()  # 額外輸出 (dpi, 格式, 檔名後綴)
+        self.tracer = tracer
 
     def _build_image_main_path(
         self, image: Path, pdf_path: Path, name: str | None, subdir: bool
@@ -68,6 +168,7 @@ class PdfSingleProcessor(PdfProcessor):
         # 如果沒有 name
         #   如果輸入是目錄 : (image / pdf_path.stem)
         #     如果有 subdir 選項 : (image / pdf_path.stem / pdf_path.stem)
+        #     (遞迴搜尋時 pdf_path.stem 前加上子目錄的相對路徑)
         #   如果輸入是檔案 : (image / self.path.stem)
         # 如果有 name : (image / name)
 
@@ -75,9 +176,15 @@ class PdfSingleProcessor(PdfProcessor):
 
         if name is None:
             if self.path.is_dir():
-                image_main_path = image_main_path / pdf_path.stem
+                relative_path = pdf_path.relative_to(self.path).with_suffix("")
+                if relative_path.parent != Path("."):  # 遞迴搜尋到的子目錄
+                    os.makedirs(image / relative_path.parent, exist_ok=True)
+                image_main_path = image_main_path / relative_path
                 if subdir:
-                    path_util.try_makedir(image_main_path)
+                    if self.journal is None:
+                        path_util.try_makedir(image_main_path)
+                    else:  # 續傳時子目錄可能已存在
+                        os.makedirs(image_main_path, exist_ok=True)
                     image_main_path = image_main_path / pdf_path.stem
             elif self.path.is_file():
                 image_main_path = image_main_path / self.path.stem
@@ -86,6 +193,122 @@ class PdfSingleProcessor(PdfProcessor):
 
         return image_main_path
 
+    @staticmethod
+    def _build_image_path(image_main_path: Path, count: int, format: str) -> Path:
+        """
+        Returns
+        -------
+        + Path
+            流水號為 `count` 的 image 路徑
+        """
+        return path_util.add_serial(image_main_path, count).with_suffix(f".{format}")
+
+    def _build_outputs(
+        self, image_main_path: Path, dpi: int, format: str
+    ) -> list[tuple[Path, int, str]]:
+        """
+        Returns
+        -------
+        + list[tuple[Path, int, str]]
+            每一頁的所有輸出 (image_main_path, dpi, 格式)：
+            `dpi`、`format` 指定的輸出，以及 `self.specs` 的額外輸出 (主檔名加上後綴)
+        """
+        return [(image_main_path, dpi, format)] + [
+            (image_main_path.with_name(image_main_path.name + suffix), spec_dpi, spec_format)
+            for spec_dpi, spec_format, suffix in self.specs
+        ]
+
+    @staticmethod
+    def _build_sprite_path(image_main_path: Path, format: str) -> Path:
+        """
+        Returns
+        -------
+        + Path
+            `thumbnail --sprite` 時的 sprite sheet 路徑
+        """
+        return image_main_path.parent / f"{image_main_path.name}.{format}"
+
+    @staticmethod
+    def _build_array_path(image_main_path: Path) -> Path:
+        """
+        Returns
+        -------
+        + Path
+            `-f npy` 時的陣列檔案路徑
+        """
+        return image_main_path.parent / f"{image_main_path.name}.{array_util.ARRAY_FORMAT}"
+
+    def _begin_images(
+        self,
+        image: Path,
+        dpi: int,
+        format: str,
+        *,
+        name: str | None,
+        subdir: bool,
+        specs: Sequence[tuple[int, str, str]] = (),
+    ) -> None:
+        """
+        檢查格式並建立 image 目錄 (續傳模式下開始或續傳紀錄)
+
+        Raises
+        ------
+        + ValueError
+            未知的 image 格式所引起的錯誤 (在開始轉換前拋出，而非在 encoder thread 中)
+        """
+        assert self.band_size is None or (format == "png" and not specs)  # 條帶只支援單一 png 輸出
+        if format != array_util.ARRAY_FORMAT:
+            image_util.get_pil_format(format)
+        for _, spec_format, _ in specs:
+            image_util.get_pil_format(spec_format)
+        self.specs = specs
+        if not self.resume:
+            path_util.try_makedir(image)  # 嘗試創建 image 目錄
+            return
+
+        pdf_stats = [  # 輸入 pdf 改變時不可續傳
+            [str(pdf_path), stat.st_size, stat.st_mtime_ns]
+            for pdf_path in sorted(self.get_filepaths(suffix=".pdf"))
+            for stat in (os.stat(pdf_path),)
+        ]
+        job = {"pdfs": pdf_stats, "dpi": dpi, "format": format, "name": name, "subdir": subdir}
+        if specs:
+            job["specs"] = [list(spec) for spec in specs]
+        if self.encode_params:  # 編碼參數不同時不可續傳
+            job["encode"] = self.encode_params
+        self.journal = Journal(image, job)
+        self.journal.begin()
+
+    def _finish_images(self) -> None:
+        """
+        轉換完成 (刪除續傳紀錄、寫回快取)
+        """
+        if self.journal is not None:
+            self.journal.finish()
+            self.journal = None
+        if self.cache is not None:
+            self.cache.close()
+
+    def _pending_pages(
+        self, pdf_path: Path, image_main_path: Path, dpi: int, format: str, *, start: int = 1
+    ) -> list[int] | None:
+        """
+        尚未完成 (任一輸出未完成) 的頁碼 (0-based indexing)；沒有已完成的頁面時為 None (全部頁面)
+        """
+        if self.journal is None or not self.journal.done:
+            return None
+        outputs = self._build_outputs(image_main_path, dpi, format)
+        return [
+            page_index
+            for page_index in range(pdf_util.get_pdf_page_count(pdf_path))
+            if not all(
+                self.journal.is_done(
+                    self._build_image_path(main_path, start + page_index, output_format)
+                )
+                for main_path, _, output_format in outputs
+            )
+        ]
+
     def to_images(
         self,
         image: Path,
@@ -94,270 +317,1927 @@ class PdfSingleProcessor(PdfProcessor):
         *,
         name: str | None = None,
         subdir: bool,
+        specs: Sequence[tuple[int, str, str]] = (),
     ) -> None:
         """
         將 pdf 轉為 image
+
+        Parameters
+        ----------
+        + `specs` : Sequence[tuple[int, str, str]]
+            同一次渲染中額外輸出的 (dpi, 格式, 檔名後綴)，例如 `[(150, "webp", "-web")]`
+            (每一頁只解譯一次，再依各 dpi 點陣化)
         """
         assert not (name and subdir)  # mutual exclusion check
-        path_util.try_makedir(image)  # 嘗試創建 image 目錄
+        assert not (specs and format == array_util.ARRAY_FORMAT)
+        self._begin_images(image, dpi, format, name=name, subdir=subdir, specs=specs)
 
         start = 1
         for pdf_path in self.get_filepaths(suffix=".pdf"):  # 遍歷每一份 PDF
             image_main_path = self._build_image_main_path(image, pdf_path, name, subdir)
+            if format == array_util.ARRAY_FORMAT:  # 每份 pdf 一個陣列檔案
+                self._one_pdf_to_array(pdf_path, self._build_array_path(image_main_path), dpi)
+                continue
             next_start = self._one_pdf_to_images(
-                pdf_path, image_main_path, dpi, format, start=start
+                pdf_path,
+                image_main_path,
+                dpi,
+                format,
+                start=start,
+                pages=self._pending_pages(pdf_path, image_main_path, dpi, format, start=start),
+                document_key=self._document_key(pdf_path),
             )
             if name is not None:
                 start = next_start
 
-    def _one_pdf_to_images(
+        self._finish_images()
+
+    def _document_key(self, pdf_path: Path) -> str | None:
+        """
+        pdf 內容 hash (沒有快取時為 None)
+        """
+        return None if self.cache is None else self.cache.document_key(pdf_path)
+
+    def _page_key(
+        self, document_key: str | None, page_index: int, dpi: int, format: str
+    ) -> str | None:
+        """
+        一頁渲染結果的快取 key (沒有快取時為 None)
+        """
+        if self.cache is None or document_key is None:
+            return None
+        options: dict = {"dpi": dpi, "format": format}
+        params = self.encode_params.get(image_util.get_pil_format(format))
+        if params:  # 預設參數不加入 key (與既有的快取相容)
+            options["encode"] = params
+        if self.band_size is not None:  # 分條帶的 PNG 與整頁編碼的不同 (整頁時不加入 key)
+            options["band"] = self.band_size
+        return self.cache.page_key(document_key, page_index, **options)
+
+    def iter_images(
         self,
-        pdf_path: Path,
-        image_main_path: Path,
         dpi: int,
         format: str,
         *,
-        start: int = 1,
-        leave: bool = True,
-    ) -> int:
+        pages: Sequence[int] | None = None,
+        ordered: bool = True,
+    ) -> Iterator[tuple[int, bytes | memoryview]]:
         """
-        一份 pdf 轉 image
+        將 pdf 轉為 image，不寫到硬碟 (例如直接上傳到 object storage)
+
+        Parameters
+        ----------
+        + `format` : str
+            image 格式；`"raw"` 表示不編碼，回傳 RGB pixel
+            (shape 為 (height, width, 3) 的 memoryview，只在取下一頁之前有效)
+        + `pages` : Sequence[int] | None
+            只渲染這些頁碼 (0-based indexing)，預設為全部頁面
+        + `ordered` : bool
+            是否依頁碼順序回傳 (否則依完成順序回傳，延遲較低)
 
         Returns
         -------
-        int
-            下一個起點頁碼
+        + Iterator[tuple[int, bytes | memoryview]]
+            (頁碼 (0-based indexing), 編碼後的 image 或 RGB pixel)
+
+        Raises
+        ------
+        + ValueError
+            未知的 image 格式所引起的錯誤 (在開始渲染前拋出)
         """
-        try:
-            worker_id = mp.current_process()._identity[0]  # 多進程
-        except IndexError:
-            worker_id = 0  # 單進程
+        assert self.path.suffix == ".pdf"
+        if format != array_util.RAW_FORMAT:
+            image_util.get_pil_format(format)
 
-        with fitz.open(pdf_path) as pdf_file:
-            page_count = pdf_file.page_count
+        with tracing.span(self.tracer, "open", pdf=self.path.name):
+            pdf_file = fitz.open(self.path)
+        with pdf_file:
+            if pages is None:
+                pages = range(pdf_file.page_count)
+            yield from self._iter_pdf_images(pdf_file, dpi, format, pages=pages, ordered=ordered)
 
-            with self.pbar_class(
-                total=page_count,
-                desc=f"#worker {worker_id:0>2}",
-                position=worker_id,
-                unit="page",
-                leave=leave,
-            ) as pbar:
-                for count, page in enumerate(pdf_file.pages(), start=start):
-                    pixmap = page.get_pixmap(dpi=dpi)
-                    image_file = Image.open(io.BytesIO(pixmap.tobytes()))
-                    image_path = path_util.add_serial(image_main_path, count).with_suffix(
-                        f".{format}"
-                    )
-                    image_file.save(image_path)  # 儲存圖片
-                    pbar.update(1)
+    def _iter_pdf_images(
+        self,
+        pdf_file: fitz.Document,
+        dpi: int,
+        format: str,
+        *,
+        pages: Iterable[int],
+        ordered: bool = True,
+        began: dict[int, int] | None = None,
+    ) -> Iterator[tuple[int, bytes | memoryview]]:
+        """
+        一份 pdf 轉 image (in memory，編碼見 `_iter_pdf_outputs`)
 
-        return start + page_count
+        Parameters
+        ----------
+        + `began` : dict[int, int] | None
+            紀錄每一頁開始渲染的時間 (`time.perf_counter_ns()`，用於計算 page latency)
 
-    def split(self, output_pdf: Path, from_page: int, to_page: int) -> None:
+        Returns
+        -------
+        + Iterator[tuple[int, bytes | memoryview]]
+            (頁碼 (0-based indexing), 編碼後的 image 或 RGB pixel)
         """
-        將 pdf 拆分
+        if format == array_util.RAW_FORMAT:  # 不編碼，直接回傳 pixmap 的 raw samples
+            for page_index in pages:
+                with tracing.span(self.tracer, "render", page=page_index):
+                    pixmap = pdf_file[page_index].get_pixmap(dpi=dpi)
+                yield page_index, pixmap.samples_mv.cast("B", (pixmap.h, pixmap.w, pixmap.n))
+            return
+
+        for (page_index, _), image in self._iter_pdf_outputs(
+            pdf_file,
+            [(dpi, format)],
+            pages=((page_index, (0,)) for page_index in pages),
+            ordered=ordered,
+            began=began,
+        ):
+            assert image is not None
+            yield page_index, image
+
+    def _iter_pdf_outputs(
+        self,
+        pdf_file: fitz.Document,
+        outputs: Sequence[tuple[int, str]],
+        *,
+        pages: Iterable[tuple[int, Sequence[int]]],
+        ordered: bool = True,
+        began: dict[int, int] | None = None,
+        store: Callable[[int, int, bytes], None] | None = None,
+    ) -> Iterator[tuple[tuple[int, int], bytes | None]]:
         """
-        assert self.path.suffix == ".pdf" and output_pdf.suffix == ".pdf"
+        一份 pdf 轉為一或多種 (dpi, 格式) 的 image
 
-        with fitz.open(self.path) as old_pdf, fitz.open() as new_pdf:
-            page_count = old_pdf.page_count
-            from_page = pdf_util.zero_base_indexing(from_page, page_count)
-            to_page = pdf_util.zero_base_indexing(to_page, page_count)
-            total_pages = abs(to_page - from_page) + 1  # 計算總頁數
+        渲染 (MuPDF) 在目前 thread 進行，編碼 (PIL) 交給 encoder threads，
+        最多同時有 `2 * self.encoders` 張在編碼中 (backpressure)
 
-            with self.pbar_class(total=total_pages, unit="page") as pbar:
-                new_pdf.insert_pdf(old_pdf, from_page, to_page)
-                new_pdf.save(output_pdf)
-                pbar.update(total_pages)
+        Parameters
+        ----------
+        + `outputs` : Sequence[tuple[int, str]]
+            每種輸出的 (dpi, 格式)
+        + `pages` : Iterable[tuple[int, Sequence[int]]]
+            (頁碼 (0-based indexing), 這一頁要輸出的 `outputs` 索引)
+        + `store` : Callable[[int, int, bytes], None] | None
+            在 encoder thread 中接著處理編碼結果 (頁碼, 輸出索引, image)，例如寫檔，
+            渲染不必等待硬碟；預設將編碼結果傳回 (in memory)
 
-    def merge(self, output_pdf: Path) -> None:
+        Returns
+        -------
+        + Iterator[tuple[tuple[int, int], bytes | None]]
+            ((頁碼, 輸出索引), 編碼後的 image (有 `store` 時為 None))
         """
-        將 pdf 合併
+        with future.ThreadPoolExecutor(self.encoders, thread_name_prefix="encoder") as encoder:
+            # ((頁碼, 輸出索引), 編碼任務)
+            pending: deque[tuple[tuple[int, int], future.Future[bytes | None]]] = deque()
+            try:
+                for page_index, output_indexes in pages:
+                    if began is not None:
+                        began[page_index] = time.perf_counter_ns()
+                    pixmaps = self._render_page(
+                        pdf_file[page_index], [outputs[i][0] for i in output_indexes]
+                    )
+                    for output_index, pixmap in zip(output_indexes, pixmaps, strict=True):
+                        encoding = encoder.submit(
+                            self._encode_output,
+                            pixmap,
+                            outputs[output_index][1],
+                            page_index,
+                            output_index,
+                            store,
+                        )
+                        pending.append(((page_index, output_index), encoding))
+                        if len(pending) >= 2 * self.encoders:  # 佇列已滿，等待一張編碼完成
+                            yield self._next_encoded(pending, ordered, wait_span="backpressure")
+
+                while pending:
+                    yield self._next_encoded(pending, ordered)
+            finally:  # 提早離開時，尚未開始的編碼不再執行
+                for _, encoding in pending:
+                    encoding.cancel()
+
+    def _render_page(self, page: fitz.Page, dpis: Sequence[int]) -> Iterator[fitz.Pixmap]:
         """
-        with fitz.open() as new_pdf:  # 空檔案
-            pdf_paths = self.get_filepaths(suffix=".pdf")  # lazy evaluation
-            total_pdfs = 0
-            if self.pbar_class != NoPbar:  # 有進度條
-                pdf_paths = tuple(pdf_paths)
-                total_pdfs = len(pdf_paths)
+        將一頁依序渲染成每個 dpi 的 pixmap
 
-            with self.pbar_class(total=total_pdfs, unit="pdf") as pbar:
-                for pdf_path in pdf_paths:  # 遍歷每一份 PDF
-                    with fitz.open(pdf_path) as old_pdf:
-                        new_pdf.insert_pdf(old_pdf)  # 檔案附加 PDF
-                    pbar.update(1)
+        多個 dpi 時，頁面內容只解譯一次成 display list，再依各 dpi 點陣化
+        (與分別 `get_pixmap` 的結果相同，省下重複解析內容串流與字型的時間)
+        """
+        if len(dpis) == 1:
+            with tracing.span(self.tracer, "render", page=page.number):
+                pixmap = page.get_pixmap(dpi=dpis[0])
+            yield pixmap
+            return
 
-            new_pdf.save(output_pdf)
+        with tracing.span(self.tracer, "display_list", page=page.number):
+            display_list = page.get_displaylist()
+        for dpi in dpis:
+            with tracing.span(self.tracer, "render", page=page.number, dpi=dpi):
+                zoom = dpi / 72
+                pixmap = display_list.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+                pixmap.set_dpi(dpi, dpi)
+            yield pixmap
 
+    def _encode_image(self, pixmap: fitz.Pixmap, format: str, page_index: int) -> bytes:
+        """
+        編碼一頁 (在 encoder thread 中執行)
+        """
+        with tracing.span(self.tracer, "to_image", page=page_index):
+            image_file = image_util.pixmap_to_image(pixmap)  # 直接使用 raw samples
+        with tracing.span(self.tracer, "encode", page=page_index):
+            # pixmap 需存活至編碼完成
+            return image_util.image_to_bytes(image_file, format, self.encode_params)
 
-class PdfParallelProcessor(PdfSingleProcessor):
-    def __init__(
+    def _encode_output(
         self,
-        path: str,
-        *,
-        pbar_class: type[Pbar] = NoPbar,
-        workers: int | None = None,
-    ) -> None:
-        super().__init__(path, pbar_class=pbar_class)
-        if workers is None:
-            cpu_count = os.cpu_count()
-            assert cpu_count is not None
-            self.workers = cpu_count
-        else:
-            self.workers = workers
+        pixmap: fitz.Pixmap,
+        format: str,
+        page_index: int,
+        output_index: int,
+        store: Callable[[int, int, bytes], None] | None,
+    ) -> bytes | None:
+        """
+        編碼一頁的一種輸出，有 `store` 時直接交給 `store` (在 encoder thread 中執行)
+        """
+        data = self._encode_image(pixmap, format, page_index)
+        if store is None:
+            return data
+        store(page_index, output_index, data)
+        return None
 
-    def to_images(
+    def _next_encoded(
         self,
-        image: Path,
-        dpi: int,
-        format: str,
+        pending: deque[tuple[tuple[int, int], future.Future[bytes | None]]],
+        ordered: bool,
         *,
-        name: str | None = None,
-        subdir: bool,
-    ) -> None:
+        wait_span: str | None = None,
+    ) -> tuple[tuple[int, int], bytes | None]:
         """
-        將 pdf 轉為 image (multiprocessing)
+        取出最早的一張 (`ordered`)，或最先編碼完成的一張
+
+        Returns
+        -------
+        + tuple[tuple[int, int], bytes | None]
+            ((頁碼, 輸出索引), 編碼後的 image (有 `store` 時為 None))
         """
-        assert not (name and subdir)  # mutual exclusion check
-        path_util.try_makedir(image)  # 嘗試創建 image 目錄
-        pdf_paths = tuple(self.get_filepaths(suffix=".pdf"))
+        with tracing.NO_SPAN if wait_span is None else tracing.span(self.tracer, wait_span):
+            if ordered:
+                key, encoding = pending.popleft()
+            else:
+                future.wait(
+                    [encoding for _, encoding in pending], return_when=future.FIRST_COMPLETED
+                )
+                key, encoding = next(item for item in pending if item[1].done())
+                pending.remove((key, encoding))
+            return key, encoding.result()
 
-        if len(pdf_paths) == 1:  # 只有一份 PDF
-            original_pdf_path = self.path  # 原先 PDF 路徑
-            temp_pdf_dir = self._one_pdf_parallel(
-                image,
-                pdf_paths,
-                dpi,
-                format,
-                name=name or pdf_paths[0].stem,
-                subdir=subdir,
-            )
-            shutil.rmtree(temp_pdf_dir, ignore_errors=True)  # 刪除暫時目錄
-            self.path = original_pdf_path  # 回復原先 PDF 路徑
-        else:
-            self._many_pdfs_parallel(image, pdf_paths, dpi, format, name=name, subdir=subdir)
+    def _write_image(self, data: bytes, image_path: Path, page_key: str | None) -> None:
+        """
+        寫出圖片 (並加入快取)
+        """
+        with tracing.span(self.tracer, "write", image=image_path.name):
+            image_path.write_bytes(data)
+        self._store_cached(image_path, page_key)
 
-    def _split(self, pdf_path: Path, temp_pdf_dir: Path) -> list[int]:
+    def _store_cached(self, image_path: Path, page_key: str | None) -> None:
+        """
+        將已寫出的圖片加入快取
         """
-        單一 PDF 切割成多份暫時的小 PDF
+        if self.cache is not None and page_key is not None:
+            with tracing.span(self.tracer, "cache_store"):
+                self.cache.store(page_key, image_path)
 
-        Parameters
-        ----------
-        + `pdf_path` : Path
-            PDF 路徑 (非目錄)
-        + `temp_pdf_dir` : Path
-            暫時目錄
+    def _fetch_cached(
+        self,
+        outputs: Sequence[tuple[Path, int, str]],
+        page_index: int,
+        start: int,
+        document_key: str | None,
+    ) -> list[int]:
+        """
+        從快取取出一頁的各輸出
 
         Returns
         -------
         + list[int]
-            start_pages
+            未命中 (需要渲染) 的 `outputs` 索引
         """
-        with fitz.open(pdf_path) as old_pdf:
-            page_count = old_pdf.page_count
-            page_ranges = pdf_util.divide(page_count, self.workers)
-
-            for from_page, to_page in page_ranges:
-                with fitz.open() as temp_pdf:
-                    from_page = pdf_util.zero_base_indexing(from_page, page_count)
-                    to_page = pdf_util.zero_base_indexing(to_page, page_count)
-                    temp_pdf.insert_pdf(old_pdf, from_page, to_page)
-                    # 讀取一個目錄中檔案時，名稱按字典序，因此流水號需補 0
-                    page_digits = len(str(page_count))
-                    temp_pdf_name = path_util.add_serial(
-                        temp_pdf_dir / pdf_path.stem, from_page, width=page_digits
-                    ).with_suffix(".pdf")
-                    temp_pdf.save(temp_pdf_name)
-
-            start_pages = [page_range[0] for page_range in page_ranges]
-            return start_pages
+        begin = time.perf_counter_ns()
+        output_indexes = []
+        for output_index, (main_path, output_dpi, output_format) in enumerate(outputs):
+            page_key = self._page_key(document_key, page_index, output_dpi, output_format)
+            if self.cache is not None and page_key is not None:
+                image_path = self._build_image_path(main_path, start + page_index, output_format)
+                with tracing.span(self.tracer, "cache_fetch"):
+                    hit = self.cache.fetch(page_key, image_path)
+                if hit:
+                    self._page_done(image_path, begin)
+                    continue
+            output_indexes.append(output_index)
+        return output_indexes
 
-    def _many_pdfs_parallel(
-        self,
-        image: Path,
-        pdf_paths: tuple[Path, ...],
-        dpi: int,
-        format: str,
-        *,
-        name: str | None,
-        subdir: bool,
-        start_pages: list[int] | None = None,
-    ) -> None:
+    def _is_banded(self, page: fitz.Page, dpi: int) -> bool:
         """
-        多份 pdf 平行處理
+        這一頁是否需分條帶渲染 (pixmap 超過 `band_size`)
         """
+        if self.band_size is None:
+            return False
+        return math.prod(array_util.page_shape(page, dpi)) > self.band_size
 
-        if name is None:  # 沒有 name 選項的 many pdfs (流水號都從 1 開始)
-            start_pages = [1] * len(pdf_paths)
-        elif start_pages is None:  # 有 name 選項的 many pdfs (流水號累加)
-            start_pages = list(
-                itertools.accumulate(
-                    [1] + [pdf_util.get_pdf_page_count(pdf_path) for pdf_path in pdf_paths]
-                )
-            )
-        else:  # 否則就是被拆分的 one pdf
-            pass
+    def _band_compression(self) -> tuple[int, int]:
+        """
+        條帶的 zlib (壓縮等級, strategy)
+        (取自 PNG 的編碼參數 `compress_level`、`compress_type`，預設同 PIL)
+        """
+        params = self.encode_params.get("PNG", {})
+        level = int(params.get("compress_level", -1))
+        strategy = int(params.get("compress_type", -1))
+        return (
+            band_util.DEFAULT_LEVEL if level < 0 else level,
+            zlib.Z_DEFAULT_STRATEGY if strategy < 0 else strategy,
+        )
 
-        with future.ProcessPoolExecutor(
-            max_workers=self.workers,
-            initializer=init.initializer,
-            initargs=(lock.PBAR_OUTPUT_LOCK, self.pbar_class.style),
-        ) as pool:
-            futures: list[future.Future] = []
-            for start, pdf_path in zip(start_pages, pdf_paths, strict=False):  # 遍歷每一份 PDF
-                image_main_path = self._build_image_main_path(
-                    image, pdf_path, name, subdir
-                )  # 對被拆分的 one pdf 而言，name 是無流水號的名稱 (或者自訂名稱)
-                futures.append(
-                    pool.submit(
-                        self._one_pdf_to_images,
-                        pdf_path,
-                        image_main_path,
-                        dpi,
-                        format,
-                        start=start,
-                        leave=False,
-                    )
-                )
+    def _compress_band(
+        self, pixmap: fitz.Pixmap, page_index: int, *, last: bool
+    ) -> tuple[bytes, int, int]:
+        """
+        壓縮一條帶 (在 encoder thread 或 worker 中執行)
+        """
+        level, strategy = self._band_compression()
+        with tracing.span(self.tracer, "compress_band", page=page_index):
+            return band_util.compress_band(pixmap, level=level, strategy=strategy, last=last)
 
-            with self.pbar_class(total=len(futures), unit="workers", position=0, main=True) as pbar:
-                for _ in future.as_completed(futures):
-                    pbar.update(1)
+    def _iter_bands(self, page: fitz.Page, dpi: int) -> Iterator[tuple[bytes, int, int]]:
+        """
+        依序渲染並壓縮一頁的每條帶 (渲染在目前 thread，壓縮交給 encoder threads)，
+        最多同時有 `2 * self.encoders` 條在壓縮中 (backpressure)
 
-    def _one_pdf_parallel(
+        Returns
+        -------
+        + Iterator[tuple[bytes, int, int]]
+            依序每條帶的 `band_util.compress_band` 結果
+        """
+        assert self.band_size is not None
+        bands = band_util.band_rows(page, dpi, self.band_size)
+        with future.ThreadPoolExecutor(self.encoders, thread_name_prefix="encoder") as encoder:
+            pending: deque[future.Future[tuple[bytes, int, int]]] = deque()
+            try:
+                for band_index, (top, bottom) in enumerate(bands):
+                    with tracing.span(self.tracer, "render_band", page=page.number, top=top):
+                        pixmap = band_util.render_band(page, dpi, top, bottom)
+                    pending.append(
+                        encoder.submit(
+                            self._compress_band,
+                            pixmap,
+                            page.number,
+                            last=band_index == len(bands) - 1,
+                        )
+                    )
+                    if len(pending) >= 2 * self.encoders:  # 佇列已滿，等待最早的一條
+                        with tracing.span(self.tracer, "backpressure"):
+                            yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:  # 提早離開時，尚未開始的壓縮不再執行
+                for compressing in pending:
+                    compressing.cancel()
+
+    def _write_banded(
         self,
-        image: Path,
-        pdf_paths: tuple[Path, ...],
+        page: fitz.Page,
         dpi: int,
-        format: str,
-        *,
-        name: str,
-        subdir: bool,
-    ) -> Path:
+        image_path: Path,
+        page_key: str | None,
+        bands: Iterable[tuple[bytes, int, int]] | None = None,
+    ) -> None:
         """
-        單份 pdf 平行處理
+        分條帶渲染一頁，依序寫成一張 PNG (記憶體只需容納幾條帶)
 
-        Returns
-        -------
-        + Path
-            暫時目錄路徑
-        """
-        temp_pdf_dir = image / f".tempdir_{uuid.uuid4().hex}"
-        path_util.try_makedir(temp_pdf_dir)  # 嘗試創建暫時 PDF 目錄
-        start_pages = self._split(pdf_paths[0], temp_pdf_dir)  # 拆分 PDF 放到暫時目錄
-        self.path = temp_pdf_dir  # PDF 路徑切換至暫時目錄
-        temp_pdf_paths = tuple(self.get_filepaths(suffix=".pdf"))  # 從暫時目錄拿 PDF
-
-        # 轉為多份 pdf 平行處理任務
-        self._many_pdfs_parallel(
-            image,
-            temp_pdf_paths,
-            dpi,
-            format,
-            name=name,  # 原 PDF 名稱 (或者自訂名稱)
-            subdir=subdir,
-            start_pages=start_pages,
+        Parameters
+        ----------
+        + `bands` : Iterable[tuple[bytes, int, int]] | None
+            依序壓縮好的條帶 (例如由 workers 平行產生)，預設在目前 process 中產生
+        """
+        begin = time.perf_counter_ns()
+        height, width, _ = array_util.page_shape(page, dpi)
+        level, _ = self._band_compression()
+        with (
+            tracing.span(self.tracer, "banded", page=page.number),
+            open(image_path, "wb") as image_file,
+        ):
+            writer = band_util.PngWriter(image_file, width, height, level=level)
+            for band in self._iter_bands(page, dpi) if bands is None else bands:
+                writer.write(*band)
+            writer.close()
+        self._store_cached(image_path, page_key)
+        self._page_done(image_path, begin)
+
+    def _store_output(
+        self,
+        outputs: Sequence[tuple[Path, int, str]],
+        start: int,
+        document_key: str | None,
+        began: dict[int, int] | None,
+        page_index: int,
+        output_index: int,
+        data: bytes,
+    ) -> None:
+        """
+        寫出一頁的一種輸出，加入快取並紀錄完成 (在 encoder thread 中執行)
+        """
+        main_path, output_dpi, output_format = outputs[output_index]
+        image_path = self._build_image_path(main_path, start + page_index, output_format)
+        self._write_image(
+            data, image_path, self._page_key(document_key, page_index, output_dpi, output_format)
+        )
+        self._page_done(image_path, 0 if began is None else began[page_index])
+
+    def _one_pdf_to_images(
+        self,
+        pdf_path: Path,
+        image_main_path: Path,
+        dpi: int,
+        format: str,
+        *,
+        start: int = 1,
+        pages: Sequence[int] | None = None,
+        document_key: str | None = None,
+        leave: bool = True,
+    ) -> int:
+        """
+        一份 pdf 轉 image
+        (以 `_iter_pdf_outputs` 渲染，寫檔、快取與續傳紀錄在 encoder threads 中進行)
+
+        Parameters
+        ----------
+        + `start` : int
+            第一頁的流水號 (第 i 頁 (0-based) 的流水號為 `start + i`)
+        + `pages` : Sequence[int] | None
+            只渲染這些頁碼 (0-based indexing)，預設為全部頁面
+        + `document_key` : str | None
+            pdf 內容 hash (有快取時使用)
+
+        Returns
+        -------
+        int
+            下一個起點頁碼
+        """
+        try:
+            worker_id = mp.current_process()._identity[0]  # 多進程
+        except IndexError:
+            worker_id = 0  # 單進程
+
+        with tracing.span(self.tracer, "open", pdf=pdf_path.name):
+            pdf_file = fitz.open(pdf_path)
+
+        with pdf_file:
+            page_count = pdf_file.page_count
+            if pages is None:
+                pages = range(page_count)
+
+            outputs = self._build_outputs(image_main_path, dpi, format)
+            with self.pbar_class(
+                total=len(pages),
+                desc=f"#worker {worker_id:0>2}",
+                position=worker_id,
+                unit="page",
+                leave=leave,
+            ) as pbar:
+                render_pages: list[tuple[int, list[int]]] = []  # (頁碼, 需渲染的輸出)
+                for page_index in pages:
+                    output_indexes = self._fetch_cached(outputs, page_index, start, document_key)
+                    if not output_indexes:  # 所有輸出都快取命中，不必渲染
+                        pbar.update(1)
+                    elif self._is_banded(pdf_file[page_index], dpi):  # 超大頁面分條帶渲染
+                        main_path, _, _ = outputs[0]
+                        self._write_banded(
+                            pdf_file[page_index],
+                            dpi,
+                            self._build_image_path(main_path, start + page_index, format),
+                            self._page_key(document_key, page_index, dpi, format),
+                        )
+                        pbar.update(1)
+                    else:
+                        render_pages.append((page_index, output_indexes))
+
+                remaining = {page_index: len(indexes) for page_index, indexes in render_pages}
+                began: dict[int, int] | None = None if self.tracer is None else {}
+                for (page_index, _), _ in self._iter_pdf_outputs(
+                    pdf_file,
+                    [(output_dpi, output_format) for _, output_dpi, output_format in outputs],
+                    pages=render_pages,
+                    ordered=False,
+                    began=began,
+                    store=functools.partial(
+                        self._store_output, outputs, start, document_key, began
+                    ),
+                ):
+                    remaining[page_index] -= 1
+                    if not remaining[page_index]:  # 這一頁的所有輸出都已寫出
+                        pbar.update(1)
+
+        if self.journal is not None:
+            self.journal.close()  # worker 中的 journal 是副本，需各自關閉
+        if self.tracer is not None:
+            self.tracer.flush()
+        return start + page_count
+
+    def _one_pdf_to_array(
+        self, pdf_path: Path, array_path: Path, dpi: int, *, leave: bool = True
+    ) -> None:
+        """
+        一份 pdf 轉為未編碼的 RGB 陣列 (`.npy` 與 sidecar index)，不經過 PIL
+        """
+        offsets = self._allocate_array(pdf_path, array_path, dpi)
+        self._pages_to_array(pdf_path, array_path, dpi, list(enumerate(offsets)), leave=leave)
+
+    def _allocate_array(self, pdf_path: Path, array_path: Path, dpi: int) -> list[int]:
+        """
+        依預測的頁面大小預先配置陣列檔案 (不渲染頁面)
+
+        Returns
+        -------
+        + list[int]
+            每一頁在檔案中的 offset (bytes)
+        """
+        with tracing.span(self.tracer, "allocate", pdf=pdf_path.name):
+            with fitz.open(pdf_path) as pdf_file:
+                shapes = [array_util.page_shape(page, dpi) for page in pdf_file]
+            return array_util.allocate_pages(array_path, shapes, pdf_path=pdf_path, dpi=dpi)
+
+    def _pages_to_array(
+        self,
+        pdf_path: Path,
+        array_path: Path,
+        dpi: int,
+        pages: Sequence[tuple[int, int]],
+        *,
+        leave: bool = True,
+    ) -> None:
+        """
+        渲染頁面，將 pixmap 的 raw samples 直接寫入預先配置的陣列檔案
+        (多個 worker 可同時寫入同一個檔案的不同頁面)
+
+        Parameters
+        ----------
+        + `pages` : Sequence[tuple[int, int]]
+            (頁碼 (0-based indexing), 在檔案中的 offset)
+        """
+        try:
+            worker_id = mp.current_process()._identity[0]  # 多進程
+        except IndexError:
+            worker_id = 0  # 單進程
+
+        with tracing.span(self.tracer, "open", pdf=pdf_path.name):
+            pdf_file = fitz.open(pdf_path)
+
+        with (
+            pdf_file,
+            open(array_path, "r+b") as array_file,
+            self.pbar_class(
+                total=len(pages),
+                desc=f"#worker {worker_id:0>2}",
+                position=worker_id,
+                unit="page",
+                leave=leave,
+            ) as pbar,
+        ):
+            for page_index, offset in pages:
+                begin = time.perf_counter_ns()
+                with tracing.span(self.tracer, "render", page=page_index):
+                    pixmap = pdf_file[page_index].get_pixmap(dpi=dpi)
+                with tracing.span(self.tracer, "write", page=page_index):
+                    array_file.seek(offset)
+                    array_file.write(pixmap.samples_mv)
+                self._page_done(array_path, begin)
+                pbar.update(1)
+
+        if self.tracer is not None:
+            self.tracer.flush()
+
+    def to_thumbnails(
+        self,
+        image: Path,
+        box: tuple[int, int],
+        format: str,
+        *,
+        subdir: bool,
+        sprite: bool = False,
+        columns: int = 10,
+        aa_level: int = 2,
+        annots: bool = False,
+    ) -> None:
+        """
+        將 pdf 轉為縮圖 (以 pixel 大小而非 dpi 指定)
+
+        Parameters
+        ----------
+        + `box` : tuple[int, int]
+            縮圖大小上限 (width, height)，頁面等比例縮放至剛好放進
+        + `sprite` : bool
+            每份 pdf 的所有縮圖排成一張 sprite sheet (一次寫檔)，並附上 sidecar index (`.json`)
+        + `columns` : int
+            sprite sheet 每列的格數
+        + `aa_level` : int
+            antialias 等級 (0 ~ 8)
+        + `annots` : bool
+            是否渲染 annotations
+
+        Raises
+        ------
+        + ValueError
+            未知的 image 格式所引起的錯誤 (在開始渲染前拋出)
+        """
+        image_util.get_pil_format(format)
+        path_util.try_makedir(image)
+        for pdf_path in self.get_filepaths(suffix=".pdf"):
+            self._one_pdf_to_thumbnails(
+                pdf_path,
+                self._build_image_main_path(image, pdf_path, None, subdir),
+                box,
+                format,
+                sprite=sprite,
+                columns=columns,
+                aa_level=aa_level,
+                annots=annots,
+            )
+
+    def _one_pdf_to_thumbnails(
+        self,
+        pdf_path: Path,
+        image_main_path: Path,
+        box: tuple[int, int],
+        format: str,
+        *,
+        sprite: bool,
+        columns: int,
+        aa_level: int,
+        annots: bool,
+        leave: bool = True,
+    ) -> None:
+        """
+        一份 pdf 轉為縮圖 (每頁一個檔案，或一張 sprite sheet)
+        """
+        if sprite:
+            thumbnails = self._collect_thumbnails(
+                pdf_path, None, box, aa_level=aa_level, annots=annots, leave=leave
+            )
+            self._write_sprite(
+                pdf_path, self._build_sprite_path(image_main_path, format), thumbnails, box, columns
+            )
+        else:
+            self._write_thumbnails(
+                pdf_path,
+                image_main_path,
+                None,
+                box,
+                format,
+                aa_level=aa_level,
+                annots=annots,
+                leave=leave,
+            )
+
+    def _iter_thumbnails(
+        self,
+        pdf_path: Path,
+        pages: Sequence[int] | None,
+        box: tuple[int, int],
+        *,
+        aa_level: int,
+        annots: bool,
+        leave: bool,
+    ) -> Iterator[tuple[int, Image.Image]]:
+        """
+        依序渲染縮圖
+
+        Parameters
+        ----------
+        + `pages` : Sequence[int] | None
+            只渲染這些頁碼 (0-based indexing)，預設為全部頁面
+
+        Returns
+        -------
+        + Iterator[tuple[int, Image.Image]]
+            (頁碼 (0-based indexing), 縮圖)
+        """
+        try:
+            worker_id = mp.current_process()._identity[0]  # 多進程
+        except IndexError:
+            worker_id = 0  # 單進程
+
+        with tracing.span(self.tracer, "open", pdf=pdf_path.name):
+            pdf_file = fitz.open(pdf_path)
+        with pdf_file:
+            if pages is None:
+                pages = range(pdf_file.page_count)
+            with self.pbar_class(
+                total=len(pages),
+                desc=f"#worker {worker_id:0>2}",
+                position=worker_id,
+                unit="page",
+                leave=leave,
+            ) as pbar:
+                for page_index in pages:
+                    with tracing.span(self.tracer, "render", page=page_index):
+                        thumbnail = thumbnail_util.render_thumbnail(
+                            pdf_file[page_index], box, aa_level=aa_level, annots=annots
+                        )
+                    yield page_index, thumbnail
+                    pbar.update(1)
+
+    def _write_thumbnails(
+        self,
+        pdf_path: Path,
+        image_main_path: Path,
+        pages: Sequence[int] | None,
+        box: tuple[int, int],
+        format: str,
+        *,
+        aa_level: int,
+        annots: bool,
+        leave: bool = True,
+    ) -> None:
+        """
+        渲染縮圖，每頁寫成一個檔案 (流水號為原 pdf 頁碼)
+        """
+        for page_index, thumbnail in self._iter_thumbnails(
+            pdf_path, pages, box, aa_level=aa_level, annots=annots, leave=leave
+        ):
+            image_path = self._build_image_path(image_main_path, page_index + 1, format)
+            with tracing.span(self.tracer, "encode", page=page_index):
+                data = image_util.image_to_bytes(thumbnail, format, self.encode_params)
+            with tracing.span(self.tracer, "write", image=image_path.name):
+                image_path.write_bytes(data)
+        if self.tracer is not None:
+            self.tracer.flush()
+
+    def _collect_thumbnails(
+        self,
+        pdf_path: Path,
+        pages: Sequence[int] | None,
+        box: tuple[int, int],
+        *,
+        aa_level: int,
+        annots: bool,
+        leave: bool = True,
+    ) -> list[tuple[int, Image.Image]]:
+        """
+        渲染縮圖 (in memory，用於 sprite sheet)
+
+        Returns
+        -------
+        + list[tuple[int, Image.Image]]
+            (頁碼 (0-based indexing), 縮圖)
+        """
+        thumbnails = list(
+            self._iter_thumbnails(
+                pdf_path, pages, box, aa_level=aa_level, annots=annots, leave=leave
+            )
+        )
+        if self.tracer is not None:
+            self.tracer.flush()
+        return thumbnails
+
+    def _write_sprite(
+        self,
+        pdf_path: Path,
+        sprite_path: Path,
+        thumbnails: Sequence[tuple[int, Image.Image]],
+        box: tuple[int, int],
+        columns: int,
+    ) -> None:
+        """
+        寫出 sprite sheet 與 index
+        """
+        with tracing.span(self.tracer, "sprite", image=sprite_path.name):
+            thumbnail_util.write_sprite(
+                sprite_path,
+                thumbnails,
+                box,
+                columns=columns,
+                pdf_path=pdf_path,
+                params=self.encode_params,
+            )
+        if self.tracer is not None:
+            self.tracer.flush()
+
+    def _page_done(self, image_path: Path, begin: int) -> None:
+        """
+        一頁已完整寫入 (續傳模式下加入紀錄)
+
+        Parameters
+        ----------
+        + `begin` : int
+            開始處理這一頁的時間 (`time.perf_counter_ns()`)
+        """
+        if self.journal is not None:
+            self.journal.record(image_path)
+        if self.tracer is not None:
+            self.tracer.add(tracing.PAGE_SPAN, begin, time.perf_counter_ns(), image=image_path.name)
+
+    def split(self, output_pdf: Path, from_page: int, to_page: int) -> None:
+        """
+        將 pdf 拆分
+        """
+        self.split_ranges(output_pdf, [(from_page, to_page)])
+
+    def split_ranges(self, output_pdf: Path, page_ranges: Sequence[tuple[int, int]]) -> None:
+        """
+        將 pdf 依多個頁碼範圍拆分 (來源 pdf 只解析一次)
+
+        Parameters
+        ----------
+        + `output_pdf` : Path
+            輸出 pdf (若有多個範圍，依序附加流水號)
+        + `page_ranges` : Sequence[tuple[int, int]]
+            起終點頁碼 (1-based indexing, 支援負數與倒序)
+        """
+        assert self.path.suffix == ".pdf" and output_pdf.suffix == ".pdf"
+
+        with tracing.span(self.tracer, "open", pdf=self.path.name):
+            old_pdf = fitz.open(self.path)
+        with old_pdf:
+            self._split_pdf(old_pdf, output_pdf, page_ranges)
+
+    def burst(self, output_pdf: Path, every: int) -> None:
+        """
+        將 pdf 每 `every` 頁拆分成一份 (來源 pdf 只解析一次)
+
+        Parameters
+        ----------
+        + `output_pdf` : Path
+            輸出 pdf (依序附加流水號)
+        + `every` : int
+            每份的頁數
+        """
+        assert self.path.suffix == ".pdf" and output_pdf.suffix == ".pdf"
+
+        with tracing.span(self.tracer, "open", pdf=self.path.name):
+            old_pdf = fitz.open(self.path)
+        with old_pdf:
+            page_ranges = pdf_util.burst_ranges(old_pdf.page_count, every)
+            self._split_pdf(old_pdf, output_pdf, page_ranges, serial=True)
+
+    @staticmethod
+    def _build_split_paths(output_pdf: Path, count: int, *, serial: bool = False) -> list[Path]:
+        """
+        Returns
+        -------
+        + list[Path]
+            每一份拆分結果的路徑 (只有一份且不需流水號時即為 `output_pdf`)
+        """
+        if count == 1 and not serial:
+            return [output_pdf]
+        width = len(str(count))  # 讀取一個目錄中檔案時，名稱按字典序，因此流水號需補 0
+        return [path_util.add_serial(output_pdf, i, width=width) for i in range(1, count + 1)]
+
+    def _split_pdf(
+        self,
+        old_pdf: fitz.Document,
+        output_pdf: Path,
+        page_ranges: Sequence[tuple[int, int]],
+        *,
+        serial: bool = False,
+    ) -> None:
+        """
+        將已開啟的 pdf 依多個頁碼範圍拆分
+        """
+        page_count = old_pdf.page_count
+        total_pages = sum(  # 計算總頁數 (同時檢查頁碼)
+            pdf_util.count_range_pages(from_page, to_page, page_count)
+            for from_page, to_page in page_ranges
+        )
+        output_pdfs = self._build_split_paths(output_pdf, len(page_ranges), serial=serial)
+
+        with self.pbar_class(total=total_pages, unit="page") as pbar:
+            for new_pdf_path, (from_page, to_page) in zip(output_pdfs, page_ranges, strict=True):
+                pbar.update(self._save_range(old_pdf, new_pdf_path, from_page, to_page))
+
+    def _save_range(
+        self, old_pdf: fitz.Document, output_pdf: Path, from_page: int, to_page: int
+    ) -> int:
+        """
+        將一個頁碼範圍存成新的 pdf
+
+        Returns
+        -------
+        + int
+            頁數
+        """
+        with fitz.open() as new_pdf:
+            page_count = old_pdf.page_count
+            from_page = pdf_util.zero_base_indexing(from_page, page_count)
+            to_page = pdf_util.zero_base_indexing(to_page, page_count)
+            with tracing.span(self.tracer, "insert_pdf", output=output_pdf.name):
+                new_pdf.insert_pdf(old_pdf, from_page, to_page)
+            with tracing.span(self.tracer, "save", output=output_pdf.name):
+                new_pdf.save(output_pdf)
+            return abs(to_page - from_page) + 1
+
+    def _save_ranges(self, pdf_path: Path, jobs: Sequence[tuple[Path, int, int]]) -> int:
+        """
+        開啟一次 pdf，將多個頁碼範圍分別存成新的 pdf
+
+        Parameters
+        ----------
+        + `jobs` : Sequence[tuple[Path, int, int]]
+            (輸出 pdf, 起點頁碼, 終點頁碼)
+
+        Returns
+        -------
+        + int
+            總頁數
+        """
+        with tracing.span(self.tracer, "open", pdf=pdf_path.name):
+            old_pdf = fitz.open(pdf_path)
+        with old_pdf:
+            pages = sum(self._save_range(old_pdf, *job) for job in jobs)
+        if self.tracer is not None:
+            self.tracer.flush()
+        return pages
+
+    def merge(self, output_pdf: Path) -> None:
+        """
+        將 pdf 合併
+        """
+        with fitz.open() as new_pdf:  # 空檔案
+            pdf_paths = self.get_filepaths(suffix=".pdf")  # lazy evaluation
+            total_pdfs = 0
+            if self.pbar_class != NoPbar:  # 有進度條
+                pdf_paths = tuple(pdf_paths)
+                total_pdfs = len(pdf_paths)
+
+            with self.pbar_class(total=total_pdfs, unit="pdf") as pbar:
+                for pdf_path in pdf_paths:  # 遍歷每一份 PDF
+                    with (
+                        tracing.span(self.tracer, "insert_pdf", pdf=pdf_path.name),
+                        fitz.open(pdf_path) as old_pdf,
+                    ):
+                        new_pdf.insert_pdf(old_pdf)  # 檔案附加 PDF
+                    pbar.update(1)
+
+            with tracing.span(self.tracer, "save", output=output_pdf.name):
+                new_pdf.save(output_pdf)
+
+
+class PdfParallelProcessor(PdfSingleProcessor):
+    def __init__(
+        self,
+        path: str,
+        *,
+        pbar_class: type[Pbar] = NoPbar,
+        finder: FileFinder | None = None,
+        workers: int | None = None,
+        encoders: int = 2,
+        encode_params: image_util.EncodeParams | None = None,
+        band_size: int | None = None,
+        merge_group_size: int = 256 * 1024 * 1024,
+        memory_budget: int | None = None,
+        cache: RenderCache | None = None,
+        resume: bool = False,
+        tracer: Tracer | None = None,
+        pool: FairPool | None = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        + `workers` : int | None
+            worker process 數 (預設: CPU 核心數)
+        + `encoders` : int
+            每個 worker 中負責 image 編碼與寫檔的 thread 數 (讓渲染與 I/O 重疊)
+        + `encode_params` : EncodeParams | None
+            各格式的編碼參數 (見 `image_util.build_encode_params`)，預設使用 PIL 預設值
+        + `band_size` : int | None
+            pixmap 超過此大小 (bytes) 的頁面分條帶渲染 (只有一份 pdf 時各條帶由 workers 平行渲染
+            與壓縮，主進程依序接成一張 PNG)
+        + `merge_group_size` : int
+            合併時第一層每組輸入 pdf 的檔案大小總和上限 (bytes，不是 RSS)；
+            之後兩兩合併的中間檔越來越大，最後一次合併需載入整份輸出
+        + `memory_budget` : int | None
+            轉為 image 時，所有 workers 渲染用記憶體的預算 (bytes)：依頁面大小 × DPI² × 通道數
+            估計每個任務的 pixmap 大小，只在預估總和不超過預算時提交 (預設不限制)
+        + `cache` : RenderCache | None
+            渲染快取 (命中的頁面不重新渲染)
+        + `resume` : bool
+            於輸出目錄中紀錄已完成的頁面，中斷後可續傳 (只渲染尚未完成的頁面)
+        + `tracer` : Tracer | None
+            紀錄各階段耗時 (包含 worker)
+        + `pool` : FairPool | None
+            與其他 job 共用的 process pool (例如 `pdfize serve`)，預設每次轉換建立新的 pool
+        """
+        super().__init__(
+            path,
+            pbar_class=pbar_class,
+            finder=finder,
+            encoders=encoders,
+            encode_params=encode_params,
+            band_size=band_size,
+            cache=cache,
+            resume=resume,
+            tracer=tracer,
+        )
+        if workers is None:
+            cpu_count = os.cpu_count()
+            assert cpu_count is not None
+            self.workers = cpu_count
+        else:
+            self.workers = workers
+        self.merge_group_size = merge_group_size
+        self.memory_budget = memory_budget
+        self.pool = pool
+
+    def __getstate__(self) -> dict:
+        """傳給 worker 時不帶共用的 process pool"""
+        state = self.__dict__.copy()
+        state["pool"] = None
+        return state
+
+    def to_images(
+        self,
+        image: Path,
+        dpi: int,
+        format: str,
+        *,
+        name: str | None = None,
+        subdir: bool,
+        specs: Sequence[tuple[int, str, str]] = (),
+    ) -> None:
+        """
+        將 pdf 轉為 image (multiprocessing)
+        """
+        assert not (name and subdir)  # mutual exclusion check
+        assert not (specs and format == array_util.ARRAY_FORMAT)
+        self._begin_images(image, dpi, format, name=name, subdir=subdir, specs=specs)
+        pdf_paths = iter(self.get_filepaths(suffix=".pdf"))  # lazy evaluation
+        first_paths = list(itertools.islice(pdf_paths, 2))  # 只需知道是否只有一份
+
+        if len(first_paths) == 1:  # 只有一份 PDF
+            self._one_pdf_parallel(
+                image,
+                first_paths[0],
+                dpi,
+                format,
+                name=name,
+                subdir=subdir,
+            )
+        else:
+            self._many_pdfs_parallel(
+                image,
+                itertools.chain(first_paths, pdf_paths),
+                dpi,
+                format,
+                name=name,
+                subdir=subdir,
+            )
+
+        self._finish_images()
+
+    def iter_images(
+        self,
+        dpi: int,
+        format: str,
+        *,
+        pages: Sequence[int] | None = None,
+        ordered: bool = True,
+        chunk: int = 4,
+        transport: str = "shm",
+    ) -> Iterator[tuple[int, bytes | memoryview]]:
+        """
+        將 pdf 轉為 image，不寫到硬碟 (multiprocessing)
+
+        頁面依序每 `chunk` 頁切成一個工作單元，由 workers 渲染並編碼後傳回，
+        最多同時有 `2 * self.workers` 個工作單元在處理中 (backpressure)
+
+        Parameters
+        ----------
+        + `format` : str
+            image 格式；`"raw"` 表示不編碼，回傳 RGB pixel
+            (shape 為 (height, width, 3) 的 memoryview，只在取下一頁之前有效)
+        + `pages` : Sequence[int] | None
+            只渲染這些頁碼 (0-based indexing)，預設為全部頁面
+        + `ordered` : bool
+            是否依頁碼順序回傳 (否則依完成順序回傳，延遲較低)
+        + `chunk` : int
+            每個工作單元的頁數
+        + `transport` : str
+            `"raw"` 時 pixel 傳回主進程的方式：
+            `"shm"` 經由共享記憶體 (不複製)，`"pickle"` 經由 result pipe
+
+        Returns
+        -------
+        + Iterator[tuple[int, bytes | memoryview]]
+            (頁碼 (0-based indexing), 編碼後的 image 或 RGB pixel)
+
+        Raises
+        ------
+        + ValueError
+            未知的 image 格式所引起的錯誤 (在開始渲染前拋出)
+        """
+        assert self.path.suffix == ".pdf" and chunk > 0 and transport in ("shm", "pickle")
+        if format != array_util.RAW_FORMAT:
+            image_util.get_pil_format(format)
+        if pages is None:
+            pages = range(pdf_util.get_pdf_page_count(self.path))
+
+        shapes = None
+        if format == array_util.RAW_FORMAT:
+            with fitz.open(self.path) as pdf_file:  # 預測每一頁的大小 (不渲染)
+                shapes = {
+                    page_index: array_util.page_shape(pdf_file[page_index], dpi)
+                    for page_index in pages
+                }
+            if transport == "shm":
+                yield from self._iter_raw_shared(pages, shapes, dpi, ordered=ordered)
+                return
+
+        with tracing.span(self.tracer, "pool"), self._create_pool() as pool:
+            pending: deque[future.Future[list[tuple[int, bytes]]]] = deque()
+            try:
+                for begin in range(0, len(pages), chunk):
+                    unit = pages[begin : begin + chunk]
+                    pending.append(pool.submit(self._render_unit, unit, dpi, format))
+                    if len(pending) >= 2 * self.workers:  # 佇列已滿，先交出一個工作單元
+                        yield from self._next_unit(pending, ordered, shapes)
+
+                while pending:
+                    yield from self._next_unit(pending, ordered, shapes)
+            finally:  # 提早離開時，尚未開始的工作單元不再執行
+                for rendering in pending:
+                    rendering.cancel()
+
+    def _iter_raw_shared(
+        self,
+        pages: Sequence[int],
+        shapes: dict[int, tuple[int, int, int]],
+        dpi: int,
+        *,
+        ordered: bool = True,
+    ) -> Iterator[tuple[int, memoryview]]:
+        """
+        以共享記憶體傳回 RGB pixel (不經過 result pipe)
+
+        workers 將每一頁寫入 ring 中的空 slot，主進程直接回傳 slot 的 memoryview，
+        取下一頁時歸還 slot；slot 數 (`2 * self.workers`) 即處理中的頁數上限 (backpressure)
+        """
+        page_size = max(
+            (height * width * channels for height, width, channels in shapes.values()), default=0
+        )
+        page_ring = ring.PageRing(2 * self.workers, page_size)
+        pending: deque[tuple[int, int, future.Future[None]]] = deque()  # (頁碼, slot, 渲染任務)
+        try:
+            with tracing.span(self.tracer, "pool"), self._create_pool() as pool:
+                try:
+                    page_indexes = iter(pages)
+                    while True:
+                        while (offset := page_ring.acquire()) is not None:
+                            page_index = next(page_indexes, None)
+                            if page_index is None:
+                                page_ring.release(offset)
+                                break
+                            rendering = pool.submit(
+                                self._render_to_ring, page_ring.name, offset, page_index, dpi
+                            )
+                            pending.append((page_index, offset, rendering))
+                        if not pending:
+                            break
+
+                        with tracing.span(self.tracer, "wait"):
+                            if ordered:
+                                item = pending[0]
+                            else:
+                                future.wait(
+                                    [rendering for _, _, rendering in pending],
+                                    return_when=future.FIRST_COMPLETED,
+                                )
+                                item = next(item for item in pending if item[2].done())
+                            pending.remove(item)
+                            page_index, offset, rendering = item
+                            rendering.result()
+                        view = page_ring.view(offset, shapes[page_index])
+                        try:
+                            yield page_index, view
+                        finally:
+                            page_ring.release(offset, view)
+                finally:  # 提早離開時，尚未開始的頁面不再渲染 (其餘等待寫完才釋放共享記憶體)
+                    for _, _, rendering in pending:
+                        rendering.cancel()
+        finally:
+            page_ring.close()
+
+    def _render_to_ring(self, ring_name: str, offset: int, page_index: int, dpi: int) -> None:
+        """
+        渲染一頁並寫入 ring 的 slot (在 worker 中執行)
+        """
+        pdf_file = pdf_util.open_cached(self.path)
+        with tracing.span(self.tracer, "render", page=page_index):
+            pixmap = pdf_file[page_index].get_pixmap(dpi=dpi)
+        with tracing.span(self.tracer, "copy", page=page_index):
+            ring.write(ring_name, offset, pixmap.samples_mv)
+        if self.tracer is not None:
+            self.tracer.flush()
+
+    def _render_unit(self, pages: Sequence[int], dpi: int, format: str) -> list[tuple[int, bytes]]:
+        """
+        渲染並編碼一個工作單元 (在 worker 中執行；RGB pixel 複製成 bytes 以便傳回)
+        """
+        rendered = [
+            (page_index, image if isinstance(image, bytes) else image.tobytes())
+            for page_index, image in PdfSingleProcessor.iter_images(self, dpi, format, pages=pages)
+        ]
+        if self.tracer is not None:
+            self.tracer.flush()
+        return rendered
+
+    def _next_unit(
+        self,
+        pending: deque[future.Future[list[tuple[int, bytes]]]],
+        ordered: bool,
+        shapes: dict[int, tuple[int, int, int]] | None = None,
+    ) -> list[tuple[int, bytes | memoryview]]:
+        """
+        取出最早的工作單元 (`ordered`)，或最先完成的工作單元
+
+        Parameters
+        ----------
+        + `shapes` : dict[int, tuple[int, int, int]] | None
+            RGB pixel 每一頁的 shape (回傳 memoryview)；None 表示編碼後的 image
+        """
+        with tracing.span(self.tracer, "wait"):
+            if ordered:
+                rendering = pending.popleft()
+            else:
+                done, _ = future.wait(pending, return_when=future.FIRST_COMPLETED)
+                rendering = next(iter(done))
+                pending.remove(rendering)
+            rendered = rendering.result()
+        if shapes is None:
+            return list(rendered)
+        return [
+            (page_index, memoryview(image).cast("B", shapes[page_index]))
+            for page_index, image in rendered
+        ]
+
+    def _create_pool(self) -> future.Executor:
+        """
+        建立 process pool (有共用的 pool 時，建立其中的一個 session)
+        """
+        if self.pool is not None:
+            return self.pool.session()
+        return future.ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=init.initializer,
+            initargs=(
+                lock.get_pbar_output_lock(),
+                self.pbar_class.style,
+                self.tracer,
+                time.perf_counter_ns(),  # 用以紀錄 worker 啟動耗時
+            ),
+        )
+
+    def _admit(
+        self, tasks: Iterable[tuple[int, Callable[[], future.Future]]]
+    ) -> Iterator[future.Future]:
+        """
+        提交任務 ((預估記憶體, 提交函式))
+        (有 `memory_budget` 時依預算分批提交，詳見 `admission.admit`)
+        """
+        if self.memory_budget is None:
+            return (submit() for _, submit in tasks)
+        return admission.admit(tasks, self.memory_budget, lookahead=4 * self.workers)
+
+    def _run(self, tasks: Sequence[tuple[int, Callable[[], future.Future]]]) -> None:
+        """
+        提交並等待所有任務 (主進度條)
+        """
+        if self.memory_budget is None:
+            self._wait([submit() for _, submit in tasks])
+        else:
+            self._wait_streaming(self._admit(tasks))
+
+    def _page_rasters(
+        self, pdf_path: Path, dpi: int, pages: Iterable[int] | None = None
+    ) -> list[list[int]]:
+        """
+        每一頁所有輸出 (主輸出與 `self.specs`) 的 pixmap 大小 (沒有 `memory_budget` 時不估計)
+
+        Returns
+        -------
+        + list[list[int]]
+            每一頁 (0-based indexing) 各輸出的 pixmap 大小 (bytes)
+        """
+        if self.memory_budget is None:
+            return []
+        dpis = [dpi] + [spec_dpi for spec_dpi, _, _ in self.specs]
+        with tracing.span(self.tracer, "estimate_memory", pdf=pdf_path.name):
+            sizes = pdf_util.estimate_raster_sizes(
+                pdf_path, dpi, pages=None if pages is None else set(pages)
+            )
+        if self.band_size is not None:  # 分條帶渲染的頁面一次只有幾條帶
+            sizes = [min(size, self.band_size) for size in sizes]
+        return [[int(size * (output_dpi / dpi) ** 2) for output_dpi in dpis] for size in sizes]
+
+    def _images_memory(self, page_rasters: list[list[int]], pages: Iterable[int]) -> int:
+        """
+        一個轉 image 任務的預估記憶體 (渲染中與等待編碼的 pixmap，及編碼中的 PIL image)
+        """
+        if not page_rasters:
+            return 0
+        return pdf_util.estimate_task_memory(
+            [size for page_index in pages for size in page_rasters[page_index]],
+            in_flight=2 * self.encoders,
+            copies=self.encoders,
+        )
+
+    def _array_memory(self, page_rasters: list[list[int]], pages: Iterable[int]) -> int:
+        """
+        一個轉陣列任務的預估記憶體 (一次只有一張 pixmap)
+        """
+        if not page_rasters:
+            return 0
+        return pdf_util.estimate_task_memory(
+            [page_rasters[page_index][0] for page_index in pages], in_flight=1
+        )
+
+    def _wait(self, futures: list[future.Future]) -> None:
+        """
+        等待所有任務完成 (主進度條)
+        """
+        with (
+            tracing.span(self.tracer, "wait", tasks=len(futures)),
+            self.pbar_class(total=len(futures), unit="workers", position=0, main=True) as pbar,
+        ):
+            for done in future.as_completed(futures):
+                done.result()  # 若 worker 出錯，於此拋出
+                pbar.update(1)
+
+    def _wait_streaming(self, futures: Iterable[future.Future]) -> None:
+        """
+        邊提交邊等待 (主進度條，總數隨提交增加)
+
+        `futures` 為 lazy 的提交序列，最多同時有 `4 * self.workers` 個任務未完成 (backpressure)，
+        因此輸入檔案邊找邊處理，不需先收集完所有路徑
+        """
+        pending: set[future.Future] = set()
+
+        def collect(done: set[future.Future]) -> None:
+            for finished in done:
+                finished.result()  # 若 worker 出錯，於此拋出
+                pbar.update(1)
+
+        with (
+            tracing.span(self.tracer, "wait"),
+            self.pbar_class(total=0, unit="workers", position=0, main=True) as pbar,
+        ):
+            for submitted in futures:
+                pending.add(submitted)
+                pbar.total += 1
+                if len(pending) >= 4 * self.workers:  # 佇列已滿，等待最早完成的任務
+                    done, pending = future.wait(pending, return_when=future.FIRST_COMPLETED)
+                    collect(done)
+            collect(future.wait(pending).done)
+
+    def _many_pdfs_parallel(
+        self,
+        image: Path,
+        pdf_paths: Iterable[Path],
+        dpi: int,
+        format: str,
+        *,
+        name: str | None,
+        subdir: bool,
+    ) -> None:
+        """
+        多份 pdf 平行處理 (pdf 邊找邊提交)
+
+        有 name 選項時流水號累加：頁數由 counter processes 預先平行計算，
+        每份 pdf 只需等待前面各份的頁數，不必等所有 pdf 都開啟過才開始渲染
+        """
+
+        def submit_all(
+            pool: future.Executor,
+        ) -> Iterator[tuple[int, Callable[[], future.Future]]]:
+            start = 1  # 沒有 name 選項時流水號都從 1 開始；有 name 選項時流水號累加
+            for pdf_path, page_count in counted_paths:  # 遍歷每一份 PDF
+                image_main_path = self._build_image_main_path(image, pdf_path, name, subdir)
+                if format == array_util.ARRAY_FORMAT:  # 每份 pdf 一個陣列檔案
+                    array_path = self._build_array_path(image_main_path)
+                    page_rasters = self._page_rasters(pdf_path, dpi)
+                    yield (
+                        self._array_memory(page_rasters, range(len(page_rasters))),
+                        functools.partial(
+                            pool.submit,
+                            self._one_pdf_to_array,
+                            pdf_path,
+                            array_path,
+                            dpi,
+                            leave=False,
+                        ),
+                    )
+                    continue
+                pages = self._pending_pages(pdf_path, image_main_path, dpi, format, start=start)
+                if pages != []:  # 未完成 (續傳)
+                    page_rasters = self._page_rasters(pdf_path, dpi, pages)
+                    yield (
+                        self._images_memory(page_rasters, range(len(page_rasters))),
+                        functools.partial(
+                            pool.submit,
+                            self._one_pdf_to_images,
+                            pdf_path,
+                            image_main_path,
+                            dpi,
+                            format,
+                            start=start,
+                            pages=pages,
+                            document_key=self._document_key(pdf_path),
+                            leave=False,
+                        ),
+                    )
+                if page_count is not None:
+                    start += page_count
+
+        with contextlib.ExitStack() as stack:
+            counted_paths: Iterable[tuple[Path, int | None]]
+            if name is None or format == array_util.ARRAY_FORMAT:  # 不需要流水號
+                counted_paths = ((pdf_path, None) for pdf_path in pdf_paths)
+            else:
+                counters = stack.enter_context(
+                    future.ProcessPoolExecutor(self.workers)
+                    if self.pool is None
+                    else self.pool.session()
+                )
+                counted_paths = self._count_pages_ahead(counters, pdf_paths)
+            with tracing.span(self.tracer, "pool"), self._create_pool() as pool:
+                self._wait_streaming(self._admit(submit_all(pool)))
+
+    def _count_pages_ahead(
+        self, counters: future.Executor, pdf_paths: Iterable[Path], *, batch: int = 32
+    ) -> Iterator[tuple[Path, int]]:
+        """
+        依原順序回傳 (pdf, 頁數)，頁數由 `counters` 每 `batch` 份一批平行計算
+
+        最多領先 `4 * self.workers` 批 (避免一次開啟整個目錄樹)
+        """
+        counting: deque[tuple[list[Path], future.Future[list[int]]]] = deque()
+
+        def counted() -> Iterator[tuple[Path, int]]:
+            batch_paths, submitted = counting.popleft()
+            with tracing.span(self.tracer, "count_pages", pdfs=len(batch_paths)):
+                page_counts = submitted.result()
+            yield from zip(batch_paths, page_counts, strict=True)
+
+        pdf_paths = iter(pdf_paths)
+        try:
+            while batch_paths := list(itertools.islice(pdf_paths, batch)):
+                submitted = counters.submit(pdf_util.get_pdf_page_counts, batch_paths)
+                counting.append((batch_paths, submitted))
+                if len(counting) >= 4 * self.workers:
+                    yield from counted()
+            while counting:
+                yield from counted()
+        finally:
+            counters.shutdown(wait=False, cancel_futures=True)
+
+    def _one_pdf_parallel(
+        self,
+        image: Path,
+        pdf_path: Path,
+        dpi: int,
+        format: str,
+        *,
+        name: str | None,
+        subdir: bool,
+    ) -> None:
+        """
+        單份 pdf 平行處理
+
+        頁面依估計成本切成小工作單元，由成本高到低送進 pool 的共享佇列，
+        閒置的 worker 直接開啟原 PDF，渲染下一個工作單元 (不寫出暫時 PDF)
+        """
+        # 輸出路徑同單進程 (含遞迴搜尋的子目錄與 subdir)，流水號即為原 PDF 頁碼
+        image_main_path = self._build_image_main_path(image, pdf_path, name, subdir)
+        if format == array_util.ARRAY_FORMAT:
+            self._one_pdf_to_array_parallel(pdf_path, self._build_array_path(image_main_path), dpi)
+            return
+        pending_pages = self._pending_pages(pdf_path, image_main_path, dpi, format)  # 續傳
+        document_key = self._document_key(pdf_path)
+
+        render_pages = None if pending_pages is None else set(pending_pages)
+        if document_key is not None:  # 有快取時，只估計未命中 (任一輸出) 頁面的成本
+            assert self.cache is not None
+            outputs = self._build_outputs(image_main_path, dpi, format)
+            render_pages = {
+                page_index
+                for page_index in (
+                    range(pdf_util.get_pdf_page_count(pdf_path))
+                    if render_pages is None
+                    else render_pages
+                )
+                if not all(
+                    self.cache.contains(
+                        self._page_key(document_key, page_index, output_dpi, output_format),
+                        f".{output_format}",
+                    )
+                    for _, output_dpi, output_format in outputs
+                )
+            }
+        banded_pages = self._banded_pages(pdf_path, dpi, render_pages)
+        with tracing.span(self.tracer, "estimate"):
+            page_costs = pdf_util.estimate_page_costs(pdf_path, dpi, pages=render_pages)
+        with tracing.span(self.tracer, "schedule"):
+            work_units: list[Sequence[int]] = list(
+                pdf_util.make_work_units(page_costs, self.workers)
+            )
+            if pending_pages is not None or banded_pages:  # 略過已完成 (續傳) 與分條帶渲染的頁面
+                pending = set(range(len(page_costs)) if pending_pages is None else pending_pages)
+                pending -= set(banded_pages)
+                work_units = [
+                    unit_pages
+                    for unit in work_units
+                    if (unit_pages := [page_index for page_index in unit if page_index in pending])
+                ]
+
+        page_rasters = self._page_rasters(pdf_path, dpi, render_pages)
+
+        with tracing.span(self.tracer, "pool"), self._create_pool() as pool:
+            for page_index in banded_pages:  # 先平行渲染超大頁面的條帶
+                self._write_banded_parallel(
+                    pool,
+                    pdf_path,
+                    page_index,
+                    dpi,
+                    self._build_image_path(image_main_path, page_index + 1, format),
+                    self._page_key(document_key, page_index, dpi, format),
+                )
+            self._run(
+                [
+                    (
+                        self._images_memory(page_rasters, pages),
+                        functools.partial(
+                            pool.submit,
+                            self._one_pdf_to_images,
+                            pdf_path,
+                            image_main_path,
+                            dpi,
+                            format,
+                            pages=pages,  # 0-based indexing
+                            document_key=document_key,
+                            leave=False,
+                        ),
+                    )
+                    for pages in work_units
+                ]
+            )
+
+    def _banded_pages(
+        self, pdf_path: Path, dpi: int, render_pages: Iterable[int] | None
+    ) -> list[int]:
+        """
+        需要渲染的頁面中，需分條帶渲染的頁碼 (0-based indexing)
+        """
+        if self.band_size is None:
+            return []
+        with tracing.span(self.tracer, "estimate_bands", pdf=pdf_path.name):
+            sizes = pdf_util.estimate_raster_sizes(pdf_path, dpi, pages=render_pages)
+        return [page_index for page_index, size in enumerate(sizes) if size > self.band_size]
+
+    def _write_banded_parallel(
+        self,
+        pool: future.Executor,
+        pdf_path: Path,
+        page_index: int,
+        dpi: int,
+        image_path: Path,
+        page_key: str | None,
+    ) -> None:
+        """
+        一頁的各條帶由 workers 平行渲染與壓縮，主進程依序寫成一張 PNG
+
+        最多同時有 `2 * self.workers` 條在處理中 (有 `memory_budget` 時再依預算減少)，
+        主進程只保留壓縮後的條帶
+        """
+        assert self.band_size is not None
+        with fitz.open(pdf_path) as pdf_file:
+            page = pdf_file[page_index]
+            bands = band_util.band_rows(page, dpi, self.band_size)
+            window = 2 * self.workers
+            if self.memory_budget is not None:
+                band_memory = pdf_util.estimate_task_memory([self.band_size], in_flight=1)
+                window = max(1, min(window, self.memory_budget // band_memory))
+
+            def compressed() -> Iterator[tuple[bytes, int, int]]:
+                pending: deque[future.Future[tuple[bytes, int, int]]] = deque()
+                with self.pbar_class(
+                    total=len(bands), desc=image_path.name, unit="band", position=0, main=True
+                ) as pbar:
+                    try:
+                        for band_index, (top, bottom) in enumerate(bands):
+                            last = band_index == len(bands) - 1
+                            pending.append(
+                                pool.submit(
+                                    self._render_band, pdf_path, page_index, dpi, top, bottom, last
+                                )
+                            )
+                            if len(pending) >= window:  # 等待最早的一條
+                                yield pending.popleft().result()
+                                pbar.update(1)
+                        while pending:
+                            yield pending.popleft().result()
+                            pbar.update(1)
+                    finally:  # 提早離開時，尚未開始的條帶不再渲染
+                        for rendering in pending:
+                            rendering.cancel()
+
+            self._write_banded(page, dpi, image_path, page_key, compressed())
+
+    def _render_band(
+        self, pdf_path: Path, page_index: int, dpi: int, top: int, bottom: int, last: bool
+    ) -> tuple[bytes, int, int]:
+        """
+        渲染並壓縮一條帶 (在 worker 中執行)
+        """
+        page = pdf_util.open_cached(pdf_path)[page_index]
+        with tracing.span(self.tracer, "render_band", page=page_index, top=top):
+            pixmap = band_util.render_band(page, dpi, top, bottom)
+        band = self._compress_band(pixmap, page_index, last=last)
+        if self.tracer is not None:
+            self.tracer.flush()
+        return band
+
+    def _one_pdf_to_array_parallel(self, pdf_path: Path, array_path: Path, dpi: int) -> None:
+        """
+        單份 pdf 平行轉為未編碼的陣列
+
+        主進程預先配置檔案，workers 依成本排序的工作單元渲染，並直接寫入各頁的 offset
+        """
+        offsets = self._allocate_array(pdf_path, array_path, dpi)
+        with tracing.span(self.tracer, "estimate"):
+            page_costs = pdf_util.estimate_page_costs(pdf_path, dpi)
+        with tracing.span(self.tracer, "schedule"):
+            work_units = pdf_util.make_work_units(page_costs, self.workers)
+
+        page_rasters = self._page_rasters(pdf_path, dpi)
+
+        with tracing.span(self.tracer, "pool"), self._create_pool() as pool:
+            self._run(
+                [
+                    (
+                        self._array_memory(page_rasters, unit),
+                        functools.partial(
+                            pool.submit,
+                            self._pages_to_array,
+                            pdf_path,
+                            array_path,
+                            dpi,
+                            [(page_index, offsets[page_index]) for page_index in unit],
+                            leave=False,
+                        ),
+                    )
+                    for unit in work_units
+                ]
+            )
+
+    def to_thumbnails(
+        self,
+        image: Path,
+        box: tuple[int, int],
+        format: str,
+        *,
+        subdir: bool,
+        sprite: bool = False,
+        columns: int = 10,
+        aa_level: int = 2,
+        annots: bool = False,
+    ) -> None:
+        """
+        將 pdf 轉為縮圖 (multiprocessing)
+
+        只有一份 pdf 時頁面切成工作單元平行渲染 (sprite sheet 由主進程組合)；
+        否則每份 pdf 交給一個 worker
+        """
+        image_util.get_pil_format(format)  # 未知格式在開始渲染前拋出 ValueError
+        path_util.try_makedir(image)
+        pdf_paths = iter(self.get_filepaths(suffix=".pdf"))  # lazy evaluation
+        first_paths = list(itertools.islice(pdf_paths, 2))  # 只需知道是否只有一份
+
+        if len(first_paths) == 1:  # 只有一份 PDF
+            pdf_path = first_paths[0]
+            self._one_pdf_to_thumbnails_parallel(
+                pdf_path,
+                self._build_image_main_path(image, pdf_path, None, subdir),
+                box,
+                format,
+                sprite=sprite,
+                columns=columns,
+                aa_level=aa_level,
+                annots=annots,
+            )
+            return
+
+        def submit_all(pool: future.Executor) -> Iterator[future.Future]:
+            for pdf_path in itertools.chain(first_paths, pdf_paths):
+                yield pool.submit(
+                    self._one_pdf_to_thumbnails,
+                    pdf_path,
+                    self._build_image_main_path(image, pdf_path, None, subdir),
+                    box,
+                    format,
+                    sprite=sprite,
+                    columns=columns,
+                    aa_level=aa_level,
+                    annots=annots,
+                    leave=False,
+                )
+
+        with tracing.span(self.tracer, "pool"), self._create_pool() as pool:
+            self._wait_streaming(submit_all(pool))
+
+    def _one_pdf_to_thumbnails_parallel(
+        self,
+        pdf_path: Path,
+        image_main_path: Path,
+        box: tuple[int, int],
+        format: str,
+        *,
+        sprite: bool,
+        columns: int,
+        aa_level: int,
+        annots: bool,
+    ) -> None:
+        """
+        單份 pdf 平行轉為縮圖
+        """
+        with tracing.span(self.tracer, "schedule"):
+            page_count = pdf_util.get_pdf_page_count(pdf_path)
+            work_units = pdf_util.make_work_units([1] * page_count, self.workers)
+
+        with tracing.span(self.tracer, "pool"), self._create_pool() as pool:
+            if not sprite:
+                futures = [
+                    pool.submit(
+                        self._write_thumbnails,
+                        pdf_path,
+                        image_main_path,
+                        unit,
+                        box,
+                        format,
+                        aa_level=aa_level,
+                        annots=annots,
+                        leave=False,
+                    )
+                    for unit in work_units
+                ]
+                self._wait(futures)
+                return
+
+            futures = [
+                pool.submit(
+                    self._collect_thumbnails,
+                    pdf_path,
+                    unit,
+                    box,
+                    aa_level=aa_level,
+                    annots=annots,
+                    leave=False,
+                )
+                for unit in work_units
+            ]
+            self._wait(futures)
+
+        thumbnails = sorted(
+            (thumbnail for rendering in futures for thumbnail in rendering.result()),
+            key=lambda thumbnail: thumbnail[0],  # 依頁碼排序
         )
+        sprite_path = self._build_sprite_path(image_main_path, format)
+        self._write_sprite(pdf_path, sprite_path, thumbnails, box, columns)
+
+    def merge(self, output_pdf: Path) -> None:
+        """
+        將 pdf 合併 (multiprocessing，tree reduction)
+
+        1. 依序將輸入分組 (每組檔案大小不超過 `self.merge_group_size`)，workers 平行合併成暫時 PDF
+        2. 相鄰的暫時 PDF 兩兩平行合併 (`insert_pdf`)，逐層減半直到剩下一份；
+           最後一次合併以 `garbage=3, deflate=True` 儲存 (整理掉重複與未使用的物件)
+
+        頁面順序與單進程合併相同
+        """
+        pdf_paths = tuple(self.get_filepaths(suffix=".pdf"))
+        with tracing.span(self.tracer, "schedule"):
+            groups = pdf_util.group_by_size(
+                pdf_paths, self.merge_group_size, min_groups=self.workers
+            )
+        if len(groups) <= 1:  # 只有一組，直接合併
+            self._merge_group(groups[0] if groups else [], output_pdf)
+            return
+
+        temp_pdf_dir = Path(tempfile.mkdtemp(prefix=".tempdir_", dir=output_pdf.parent))
+        try:
+            level = [
+                path_util.add_serial(temp_pdf_dir / f"{output_pdf.stem}-0", i).with_suffix(".pdf")
+                for i in range(len(groups))
+            ]
+            with tracing.span(self.tracer, "pool"), self._create_pool() as pool:
+                self._wait(
+                    [
+                        pool.submit(self._merge_group, group, temp_pdf_path)
+                        for group, temp_pdf_path in zip(groups, level, strict=True)
+                    ]
+                )
+                depth = 0
+                while len(level) > 1:  # 兩兩合併 (奇數時最後一份直接進入下一層)
+                    depth += 1
+                    level = self._merge_level(
+                        pool, level, temp_pdf_dir / f"{output_pdf.stem}-{depth}"
+                    )
+            os.replace(level[0], output_pdf)
+        finally:
+            shutil.rmtree(temp_pdf_dir, ignore_errors=True)  # 刪除暫時目錄
+
+    def _merge_level(
+        self, pool: future.Executor, level: Sequence[Path], temp_main_path: Path
+    ) -> list[Path]:
+        """
+        tree reduction 的一層：相鄰的暫時 PDF 兩兩由 workers 平行合併
+
+        Returns
+        -------
+        + list[Path]
+            下一層的暫時 PDF (保持順序)
+        """
+        pairs = [level[i : i + 2] for i in range(0, len(level), 2)]
+        final = len(pairs) == 1
+        next_level = []
+        futures = []
+        for i, pair in enumerate(pairs):
+            if len(pair) == 1:
+                next_level.append(pair[0])
+                continue
+            merged_path = path_util.add_serial(temp_main_path, i).with_suffix(".pdf")
+            futures.append(pool.submit(self._merge_group, pair, merged_path, compact=final))
+            next_level.append(merged_path)
+        self._wait(futures)
+        for pair in pairs:
+            if len(pair) == 2:
+                for temp_pdf_path in pair:
+                    temp_pdf_path.unlink()  # 盡早釋放暫時空間
+        return next_level
+
+    def _merge_group(
+        self, pdf_paths: Sequence[Path], output_pdf: Path, *, compact: bool = False
+    ) -> None:
+        """
+        將一組 pdf 合併 (in memory)
+
+        Parameters
+        ----------
+        + `compact` : bool
+            儲存時整理掉重複與未使用的物件並壓縮 stream (`garbage=3, deflate=True`)
+        """
+        with fitz.open() as new_pdf:  # 空檔案
+            for pdf_path in pdf_paths:
+                with (
+                    tracing.span(self.tracer, "insert_pdf", pdf=pdf_path.name),
+                    fitz.open(pdf_path) as old_pdf,
+                ):
+                    new_pdf.insert_pdf(old_pdf)  # 檔案附加 PDF
+            with tracing.span(self.tracer, "save", output=output_pdf.name):
+                if compact:
+                    new_pdf.save(output_pdf, garbage=3, deflate=True)
+                else:
+                    new_pdf.save(output_pdf)
+        if self.tracer is not None:
+            self.tracer.flush()
+
+    def _split_pdf(
+        self,
+        old_pdf: fitz.Document,
+        output_pdf: Path,
+        page_ranges: Sequence[tuple[int, int]],
+        *,
+        serial: bool = False,
+    ) -> None:
+        """
+        將已開啟的 pdf 依多個頁碼範圍拆分 (multiprocessing)
+
+        頁碼範圍依頁數切成工作單元，每個工作單元由 worker 開啟一次 pdf 後寫出
+        """
+        page_count = old_pdf.page_count
+        range_pages = [  # 每個範圍的頁數 (同時檢查頁碼)
+            pdf_util.count_range_pages(from_page, to_page, page_count)
+            for from_page, to_page in page_ranges
+        ]
+        output_pdfs = self._build_split_paths(output_pdf, len(page_ranges), serial=serial)
+        jobs = [
+            (new_pdf_path, from_page, to_page)
+            for new_pdf_path, (from_page, to_page) in zip(output_pdfs, page_ranges, strict=True)
+        ]
+        with tracing.span(self.tracer, "schedule"):
+            work_units = pdf_util.make_work_units(range_pages, self.workers)
 
-        return temp_pdf_dir
+        with tracing.span(self.tracer, "pool"), self._create_pool() as pool:
+            futures = [
+                pool.submit(self._save_ranges, self.path, [jobs[i] for i in unit])
+                for unit in work_units
+            ]
+            with self.pbar_class(total=sum(range_pages), unit="page", main=True) as pbar:
+                for done in future.as_completed(futures):
+                    pbar.update(done.result())
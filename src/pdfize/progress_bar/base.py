@@ -5,6 +5,7 @@ from typing import Protocol
 
 class Pbar(Protocol):
     style: str
+    total: float | None
 
     def __init__(self, *args, **kwargs) -> None: ...
 
@@ -25,7 +26,7 @@ class NoPbar:
 
     def __init__(self, *args, **kwargs):
         """Dummy 進度條"""
-        pass
+        self.total = kwargs.get("total")
 
     def __enter__(self) -> "NoPbar":
         return self
@@ -0,0 +1,47 @@
+# standard library
+import json
+from multiprocessing.connection import Client, Connection
+
+# 只依賴標準函式庫 (client 模式不 import fitz、PIL，啟動快速)
+
+FAMILY = "AF_UNIX"
+
+
+def send_message(connection: Connection, message: dict) -> None:
+    """
+    傳送一則訊息 (JSON，不使用 pickle：daemon 不反序列化任意物件)
+    """
+    connection.send_bytes(json.dumps(message).encode("utf-8"))
+
+
+def receive_message(connection: Connection) -> dict:
+    """
+    接收一則訊息
+    """
+    return json.loads(connection.recv_bytes().decode("utf-8"))
+
+
+def submit_job(address: str, job: dict) -> dict:
+    """
+    將 job 交給 `pdfize serve` 執行，等待完成
+
+    Parameters
+    ----------
+    + `address` : str
+        daemon 的 Unix domain socket 路徑
+    + `job` : dict
+        {"command": 子命令, ...子命令的參數} (詳見 `daemon.run_job`)
+
+    Returns
+    -------
+    + dict
+        {"ok": 是否成功, "error": 錯誤訊息, "seconds": 耗時}
+
+    Raises
+    ------
+    + OSError
+        無法連線至 daemon 所引起的錯誤 (例如 FileNotFoundError、ConnectionRefusedError)
+    """
+    with Client(address, family=FAMILY) as connection:
+        send_message(connection, job)
+        return receive_message(connection)
@@ -0,0 +1,217 @@
+# standard library
+import concurrent.futures as future
+import os
+import signal
+import stat
+import threading
+import time
+from collections.abc import Callable
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+
+# local module
+from ..cache.render_cache import RenderCache
+from ..discovery.finder import FileFinder
+from ..new_process import init, lock
+from ..new_process.fair_pool import FairPool
+from ..processor.pdf_processor import PdfParallelProcessor
+from ..util import image_util
+from .client import FAMILY, receive_message, send_message
+
+
+def run_job(job: dict, pool: FairPool, workers: int) -> None:
+    """
+    在共用的 process pool 上執行一個 job
+
+    Parameters
+    ----------
+    + `job` : dict
+        {"command": "pdf-to-img", "input": 輸入路徑, "output": 輸出目錄, "dpi", "format",
+        "specs" ([dpi, 格式, 後綴] 的 list), "name", "subdir", "encoders", "encode_profile",
+        "encode_options" ([副檔名, 參數, 值] 的 list), "memory_budget" (bytes), "band_size" (bytes),
+        "cache", "cache_max_size" (bytes), "cache_max_age" (seconds), "resume", "recursive",
+        "include", "exclude", "walkers"}
+        (路徑須為絕對路徑)
+    """
+    if job.get("command") != "pdf-to-img":
+        raise ValueError(f"unknown command: {job.get('command')!r}")
+
+    cache = None
+    if job.get("cache") is not None:
+        cache = RenderCache(
+            job["cache"], max_size=job.get("cache_max_size"), max_age=job.get("cache_max_age")
+        )
+    finder = FileFinder(
+        recursive=job.get("recursive", False),
+        include=job.get("include", ()),
+        exclude=job.get("exclude", ()),
+        walkers=job.get("walkers", 4),
+    )
+    processor = PdfParallelProcessor(
+        job["input"],
+        finder=finder,
+        workers=workers,
+        encoders=2 if job.get("encoders") is None else job["encoders"],
+        encode_params=image_util.build_encode_params(
+            job.get("encode_profile", "balanced"),
+            [tuple(option) for option in job.get("encode_options", ())],
+        ),
+        memory_budget=job.get("memory_budget"),
+        band_size=job.get("band_size"),
+        cache=cache,
+        resume=job.get("resume", False),
+        pool=pool,
+    )
+    processor.to_images(
+        Path(job["output"]),
+        job.get("dpi", 100),
+        job.get("format", "png"),
+        name=job.get("name"),
+        subdir=job.get("subdir", False),
+        specs=[tuple(spec) for spec in job.get("specs", ())],
+    )
+
+
+class Server:
+    def __init__(
+        self,
+        address: str,
+        *,
+        workers: int | None = None,
+        max_jobs: int = 8,
+        log: Callable[[str], None] = lambda message: None,
+    ) -> None:
+        """
+        `pdfize serve`：常駐的 process pool，經由 Unix domain socket 接收 job
+
+        + workers 只在啟動時建立一次 (省下每次轉換建立 process 與 import 的時間)
+        + 同時進行的 job 以 round-robin 的方式公平共用 workers (詳見 `FairPool`)，
+          超過 `max_jobs` 的 job 排隊等待
+        + 收到 SIGINT / SIGTERM 時不再接受新的 job，等待進行中的 job 完成後結束
+          (再收到一次則取消尚未開始的頁面)
+
+        Parameters
+        ----------
+        + `address` : str
+            Unix domain socket 路徑 (只有目前使用者可連線)
+        + `workers` : int | None
+            worker process 數 (預設: CPU 核心數)
+        + `max_jobs` : int
+            同時進行的 job 數上限
+        + `log` : Callable[[str], None]
+            輸出紀錄 (每個 job 的結果)
+        """
+        if workers is None:
+            cpu_count = os.cpu_count()
+            assert cpu_count is not None
+            self.workers = cpu_count
+        else:
+            self.workers = workers
+        assert self.workers > 0 and max_jobs > 0
+        self.address = address
+        self.log = log
+        self._jobs = threading.Semaphore(max_jobs)
+        self._handlers: list[threading.Thread] = []
+
+    def serve_forever(self) -> None:
+        """
+        啟動 workers 並接收 job，直到收到 SIGINT / SIGTERM
+
+        Raises
+        ------
+        + FileExistsError
+            已有 daemon 使用此 socket 所引起的錯誤
+        """
+        self._remove_stale_socket()
+        executor = future.ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=init.initializer,
+            initargs=(lock.get_pbar_output_lock(), ""),
+        )
+        executor.submit(os.getpid).result()  # 在建立任何 thread 前 fork 所有 workers
+        pool = FairPool(executor, window=2 * self.workers)
+
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, signal.default_int_handler)  # 同 Ctrl+C
+
+        try:
+            with self._listen() as listener:
+                self.log(f"listening on {self.address} ({self.workers} workers)")
+                try:
+                    while True:
+                        connection = listener.accept()
+                        handler = threading.Thread(target=self._handle, args=(connection, pool))
+                        handler.start()
+                        self._handlers = [
+                            thread for thread in self._handlers if thread.is_alive()
+                        ] + [handler]
+                except KeyboardInterrupt:
+                    pass
+            # 已關閉 listener (移除 socket)，不再接受新的 job
+            self.log("shutting down: waiting for running jobs")
+            for handler in self._handlers:
+                handler.join()
+        finally:
+            pool.shutdown()
+            self.log("stopped")
+
+    def _handle(self, connection: Connection, pool: FairPool) -> None:
+        """
+        處理一個連線 (一個 job)
+        """
+        with connection:
+            try:
+                job = receive_message(connection)
+            except (EOFError, OSError, ValueError):
+                return
+
+            with self._jobs:  # 超過 job 數上限時在此等待
+                begin = time.perf_counter()
+                try:
+                    run_job(job, pool, self.workers)
+                except Exception as error:
+                    result = {"ok": False, "error": f"{type(error).__name__}: {error}"}
+                else:
+                    result = {"ok": True, "error": None}
+                result["seconds"] = time.perf_counter() - begin
+
+            self.log(
+                f"{job.get('command')} {job.get('input')}: "
+                f"{'done' if result['ok'] else result['error']} ({result['seconds']:.2f}s)"
+            )
+            try:
+                send_message(connection, result)
+            except OSError:  # client 已離開
+                pass
+
+    def _listen(self) -> Listener:
+        """
+        建立 listener (socket 建立時即只有擁有者可讀寫，其他使用者無法連線)
+        """
+        previous = os.umask(stat.S_IXUSR | stat.S_IRWXG | stat.S_IRWXO)  # 0o177
+        try:
+            return Listener(self.address, family=FAMILY)
+        finally:
+            os.umask(previous)
+
+    def _remove_stale_socket(self) -> None:
+        """
+        移除上一個 daemon 異常結束時留下的 socket
+
+        Raises
+        ------
+        + FileExistsError
+            socket 仍有 daemon 使用，或路徑已存在但不是 socket 所引起的錯誤
+        """
+        try:
+            mode = os.lstat(self.address).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):  # 不刪除一般檔案
+            raise FileExistsError(f"{self.address} exists and is not a socket")
+        try:
+            Client(self.address, family=FAMILY).close()
+        except ConnectionRefusedError:
+            os.unlink(self.address)
+        else:
+            raise FileExistsError(f"a server is already listening on {self.address}")
@@ -0,0 +1,156 @@
+# standard library
+import contextlib
+import json
+import math
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import AbstractContextManager
+from pathlib import Path
+
+PAGE_SPAN = "page"  # 一頁從開始渲染到寫檔完成 (用於計算 page latency)
+NO_SPAN = contextlib.nullcontext()
+
+
+class Tracer:
+    def __init__(self, trace_path: str | Path) -> None:
+        """
+        跨進程的分段計時 (輸出為 Chrome trace-event JSON，可用 chrome://tracing 或 Perfetto 開啟)
+
+        每個進程先將 span 暫存在記憶體，`flush` 時寫到暫時目錄中以 pid 命名的檔案，
+        最後由主進程 `close` 合併
+
+        Parameters
+        ----------
+        + `trace_path` : str | Path
+            輸出的 trace 檔案
+        """
+        self.trace_path = Path(trace_path)
+        self.spans_dir = Path(tempfile.mkdtemp(prefix="pdfize-trace-"))
+        self._events: list[dict] = []
+
+    def __getstate__(self) -> dict:
+        """傳給 worker 時不帶已紀錄的 span"""
+        state = self.__dict__.copy()
+        state["_events"] = []
+        return state
+
+    def add(self, name: str, begin: int, end: int, **args) -> None:
+        """
+        紀錄一個 span
+
+        Parameters
+        ----------
+        + `begin`, `end` : int
+            `time.perf_counter_ns()` (系統層級的 monotonic clock，可跨進程比較)
+        """
+        self._events.append(
+            {
+                "name": name,
+                "ph": "X",
+                "ts": begin / 1000,
+                "dur": (end - begin) / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_native_id(),
+                "tname": threading.current_thread().name,
+                "args": args,
+            }
+        )  # list.append 為 thread-safe
+
+    @contextlib.contextmanager
+    def span(self, name: str, **args) -> Iterator[None]:
+        """
+        以 context manager 紀錄一個 span
+        """
+        begin = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(name, begin, time.perf_counter_ns(), **args)
+
+    def flush(self) -> None:
+        """
+        將目前進程的 span 寫到暫時目錄 (worker 於每個任務結束時呼叫)
+        """
+        events, self._events = self._events, []
+        if not events:
+            return
+        with open(self.spans_dir / f"{os.getpid()}.jsonl", "a", encoding="utf-8") as spans:
+            spans.writelines(json.dumps(event) + "\n" for event in events)
+
+    def close(self) -> str:
+        """
+        合併所有進程的 span 並寫出 trace (只在主進程呼叫)
+
+        Returns
+        -------
+        + str
+            摘要 (各階段總時間與 page latency 的 p50 / p95 / p99)
+        """
+        self.flush()
+        events = []
+        for spans_path in sorted(self.spans_dir.iterdir()):
+            with open(spans_path, encoding="utf-8") as spans:
+                events.extend(json.loads(line) for line in spans)
+        shutil.rmtree(self.spans_dir, ignore_errors=True)
+
+        main_pid = os.getpid()
+        metadata = []
+        for pid, tid, tname in sorted({(e["pid"], e["tid"], e.pop("tname")) for e in events}):
+            metadata.append(
+                {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": tname}}
+            )
+        for pid in sorted({event["pid"] for event in events}):
+            process_name = "main" if pid == main_pid else f"worker {pid}"
+            metadata.append(
+                {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": process_name}}
+            )
+
+        with open(self.trace_path, "w", encoding="utf-8") as trace:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, trace)
+        return summarize(events)
+
+
+def span(tracer: Tracer | None, name: str, **args) -> AbstractContextManager:
+    """
+    `tracer` 為 None 時不紀錄 (幾乎沒有額外成本)
+    """
+    return NO_SPAN if tracer is None else tracer.span(name, **args)
+
+
+def percentile(values: list[float], ratio: float) -> float:
+    """
+    nearest-rank percentile (`values` 需已排序)
+    """
+    return values[max(0, math.ceil(ratio * len(values)) - 1)]
+
+
+def summarize(events: list[dict]) -> str:
+    """
+    Returns
+    -------
+    + str
+        各階段的次數、總時間與平均時間，以及 page latency 的 p50 / p95 / p99
+    """
+    durations: defaultdict[str, list[float]] = defaultdict(list)
+    for event in events:
+        durations[event["name"]].append(event["dur"] / 1000)  # ms
+
+    lines = [f"{'stage':<16} {'count':>7} {'total (s)':>10} {'mean (ms)':>10}"]
+    for name, values in sorted(durations.items(), key=lambda item: -sum(item[1])):
+        total = sum(values)
+        lines.append(
+            f"{name:<16} {len(values):>7} {total / 1000:>10.3f} {total / len(values):>10.2f}"
+        )
+
+    latencies = sorted(durations.get(PAGE_SPAN, []))
+    if latencies:
+        lines.append(
+            "page latency (ms): "
+            + "  ".join(f"p{p} {percentile(latencies, p / 100):.2f}" for p in (50, 95, 99))
+        )
+    return "\n".join(lines)
@@ -0,0 +1,104 @@
+# standard library
+import json
+import struct
+from collections.abc import Sequence
+from pathlib import Path
+
+# third party library
+import fitz
+
+ARRAY_FORMAT = "npy"  # `pdf-to-img -f npy`：未編碼的 pixel 直接寫成 NumPy 陣列
+# `iter_images`：未編碼的 pixel (shape 為 (height, width, channels) 的 memoryview)
+RAW_FORMAT = "raw"
+
+NPY_MAGIC = b"\x93NUMPY\x01\x00"  # format version 1.0
+NPY_ALIGNMENT = 64  # 資料起點對齊 (同 NumPy)
+CHANNELS = 3  # RGB (pixmap 不含 alpha)
+
+
+def page_shape(page: fitz.Page, dpi: int) -> tuple[int, int, int]:
+    """
+    不渲染頁面，預測 `page.get_pixmap(dpi=dpi)` 的大小
+
+    Returns
+    -------
+    + tuple[int, int, int]
+        (height, width, channels)
+    """
+    zoom = dpi / 72
+    rect = (page.rect * fitz.Matrix(zoom, zoom)).round()
+    return rect.height, rect.width, CHANNELS
+
+
+def npy_header(shape: Sequence[int]) -> bytes:
+    """
+    `.npy` 檔案 header (uint8、C order)，不需 import NumPy
+
+    Returns
+    -------
+    + bytes
+        header (長度為 `NPY_ALIGNMENT` 的倍數)
+    """
+    dims = ", ".join(str(dim) for dim in shape) + ("," if len(shape) == 1 else "")
+    header = f"{{'descr': '|u1', 'fortran_order': False, 'shape': ({dims}), }}"
+    padding = -(len(NPY_MAGIC) + 2 + len(header) + 1) % NPY_ALIGNMENT
+    header = header + " " * padding + "\n"
+    return NPY_MAGIC + struct.pack("<H", len(header)) + header.encode("latin1")
+
+
+def allocate_pages(
+    array_path: Path, shapes: Sequence[tuple[int, int, int]], *, pdf_path: Path, dpi: int
+) -> list[int]:
+    """
+    預先配置一份 pdf 所有頁面的 `.npy` 檔案，並寫出 sidecar index (`.json`)
+
+    所有頁面大小相同時，陣列 shape 為 (頁數, height, width, channels)；
+    否則為一維 (所有頁面依序串接)，各頁的 offset 與 shape 見 index
+
+    Parameters
+    ----------
+    + `array_path` : Path
+        輸出的 `.npy` 檔案 (不可已存在)
+    + `shapes` : Sequence[tuple[int, int, int]]
+        每一頁的 (height, width, channels)
+
+    Returns
+    -------
+    + list[int]
+        每一頁在檔案中的 offset (bytes)
+
+    Raises
+    ------
+    + FileExistsError
+        檔案已存在所引起的錯誤
+    """
+    sizes = [height * width * channels for height, width, channels in shapes]
+    if shapes and len(set(shapes)) == 1:
+        header = npy_header((len(shapes), *shapes[0]))
+    else:
+        header = npy_header((sum(sizes),))
+
+    offsets = []
+    offset = len(header)
+    for size in sizes:
+        offsets.append(offset)
+        offset += size
+
+    with open(array_path, "xb") as array_file:
+        array_file.write(header)
+        array_file.truncate(offset)  # 預先配置 (sparse file)，由各 worker 直接寫入
+
+    index = {
+        "pdf": str(pdf_path),
+        "dpi": dpi,
+        "dtype": "uint8",
+        "data_offset": len(header),
+        "pages": [
+            {"page": page_index + 1, "offset": page_offset, "shape": list(shape)}
+            for page_index, (page_offset, shape) in enumerate(zip(offsets, shapes, strict=True))
+        ],
+    }
+    with open(array_path.with_suffix(".json"), "w", encoding="utf-8") as index_file:
+        json.dump(index, index_file, indent=2)
+
+    return offsets
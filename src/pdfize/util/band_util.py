@@ -0,0 +1,154 @@
+# standard library
+import struct
+import zlib
+from typing import BinaryIO
+
+# third party library
+import fitz
+
+# local module
+from . import array_util
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_RGB = 2  # color type (8-bit RGB，不含 alpha)
+PNG_FILTER_NONE = b"\x00"  # 每列開頭的 filter type
+ADLER_BASE = 65521
+DEFAULT_LEVEL = 6  # zlib 預設的壓縮等級 (同 PIL)
+
+
+def band_rows(page: fitz.Page, dpi: int, band_size: int) -> list[tuple[int, int]]:
+    """
+    將一頁在 `dpi` 下的 pixmap 切成每條不超過 `band_size` bytes 的水平條帶
+
+    Returns
+    -------
+    + list[tuple[int, int]]
+        每條的 (起始列, 結束列) (pixel，不含結束列)
+    """
+    height, width, channels = array_util.page_shape(page, dpi)
+    rows = max(1, band_size // (width * channels))
+    return [(top, min(top + rows, height)) for top in range(0, height, rows)]
+
+
+def render_band(page: fitz.Page, dpi: int, top: int, bottom: int) -> fitz.Pixmap:
+    """
+    只渲染一頁在 `dpi` 下的第 `top` ~ `bottom` 列 (clip)
+
+    Note
+    ----
+    MuPDF 的 antialias 與 pixmap 的位置有關，條帶接起來與整頁一次渲染的結果
+    在曲線邊緣可能有些微差異 (肉眼不可見)
+    """
+    zoom = dpi / 72
+    rect = page.rect
+    clip = fitz.Rect(rect.x0, rect.y0 + top / zoom, rect.x1, rect.y0 + bottom / zoom)
+    pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip)
+    assert pixmap.height == bottom - top and pixmap.n == array_util.CHANNELS
+    return pixmap
+
+
+def compress_band(
+    pixmap: fitz.Pixmap,
+    *,
+    level: int = DEFAULT_LEVEL,
+    strategy: int = zlib.Z_DEFAULT_STRATEGY,
+    last: bool,
+) -> tuple[bytes, int, int]:
+    """
+    將一條帶壓縮成 PNG 影像資料 (IDAT) 的一段 raw deflate
+
+    各段獨立壓縮 (可在不同 process 平行進行)，依序串接即為完整的 deflate stream：
+    非最後一段以 `Z_SYNC_FLUSH` 結束 (對齊 byte、不結束 stream)，最後一段以 `Z_FINISH` 結束
+
+    Parameters
+    ----------
+    + `level` : int
+        zlib 壓縮等級 (0 ~ 9)
+    + `strategy` : int
+        zlib strategy (同 PNG 的 `compress_type`)
+    + `last` : bool
+        是否為一頁的最後一段
+
+    Returns
+    -------
+    + tuple[bytes, int, int]
+        (壓縮後的資料, 未壓縮資料的 adler32, 未壓縮資料的長度)
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, 8, strategy)
+    samples = pixmap.samples_mv
+    stride = pixmap.stride
+    chunks = []
+    adler = 1
+    for offset in range(0, pixmap.height * stride, stride):
+        row = samples[offset : offset + stride]
+        adler = zlib.adler32(row, zlib.adler32(PNG_FILTER_NONE, adler))
+        chunks.append(compressor.compress(PNG_FILTER_NONE))
+        chunks.append(compressor.compress(row))
+    chunks.append(compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH))
+    return b"".join(chunks), adler, pixmap.height * (stride + 1)
+
+
+def adler32_combine(adler1: int, adler2: int, length2: int) -> int:
+    """
+    由兩段資料各自的 adler32 計算串接後的 adler32 (同 zlib 的 `adler32_combine`)
+
+    Example
+    -------
+    >>> adler32_combine(zlib.adler32(b"ab"), zlib.adler32(b"cde"), 3) == zlib.adler32(b"abcde")
+    True
+    """
+    remainder = length2 % ADLER_BASE
+    sum1 = adler1 & 0xFFFF
+    sum2 = remainder * sum1 % ADLER_BASE
+    sum1 = (sum1 + (adler2 & 0xFFFF) + ADLER_BASE - 1) % ADLER_BASE
+    sum2 = (sum2 + (adler1 >> 16) + (adler2 >> 16) + ADLER_BASE - remainder) % ADLER_BASE
+    return sum1 | sum2 << 16
+
+
+class PngWriter:
+    def __init__(
+        self, file: BinaryIO, width: int, height: int, *, level: int = DEFAULT_LEVEL
+    ) -> None:
+        """
+        依序寫入壓縮好的條帶 (`compress_band`)，串接成一個 PNG (8-bit RGB)
+
+        只保留已寫出資料的 adler32，記憶體用量與圖片大小無關
+
+        Parameters
+        ----------
+        + `file` : BinaryIO
+            輸出檔案
+        + `level` : int
+            zlib 壓縮等級 (只用於 zlib header)
+        """
+        self.file = file
+        self.adler = 1
+        self.file.write(PNG_SIGNATURE)
+        self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, PNG_RGB, 0, 0, 0))
+
+        # zlib header：CM = 8 (deflate)、CINFO = 7 (32K window)，FLEVEL 依壓縮等級
+        cmf = 0x78
+        flevel = 0 if level < 2 else 1 if level < 6 else 2 if level == 6 else 3
+        flg = flevel << 6
+        flg += 31 - (cmf << 8 | flg) % 31
+        self._header = bytes([cmf, flg])
+
+    def write(self, data: bytes, adler: int, length: int) -> None:
+        """
+        寫入下一段 (`compress_band` 的回傳值)
+        """
+        self._write_chunk(b"IDAT", self._header + data)
+        self._header = b""
+        self.adler = adler32_combine(self.adler, adler, length)
+
+    def close(self) -> None:
+        """
+        寫入 zlib trailer (adler32) 與 IEND
+        """
+        self._write_chunk(b"IDAT", self._header + struct.pack(">I", self.adler))
+        self._write_chunk(b"IEND", b"")
+
+    def _write_chunk(self, chunk_type: bytes, data: bytes) -> None:
+        self.file.write(struct.pack(">I", len(data)) + chunk_type)
+        self.file.write(data)
+        self.file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type))))
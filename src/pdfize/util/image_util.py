@@ -0,0 +1,244 @@
+# standard library
+import io
+from collections.abc import Iterable, Mapping
+
+# third party library
+import fitz
+from PIL import Image
+
+# pixmap 的 (通道數, 是否有 alpha) 對應的 PIL mode
+PIXMAP_MODES = {
+    (1, False): "L",
+    (2, True): "LA",
+    (3, False): "RGB",
+    (4, True): "RGBA",
+    (4, False): "CMYK",
+}
+
+
+def pixmap_to_image(pixmap: fitz.Pixmap) -> Image.Image:
+    """
+    直接以 pixmap 的 raw samples 建立 PIL image (不經過 PNG 編碼 / 解碼)
+
+    Parameters
+    ----------
+    + `pixmap` : fitz.Pixmap
+
+    Returns
+    -------
+    + Image.Image
+
+    Note
+    ----
+    若 mode 可被 PIL 直接映射 (例如 L、RGBA、CMYK)，image 會與 pixmap 共用記憶體，
+    使用 image 期間需保持 pixmap 存活；RGB 則會由 PIL 解包 (unpack) 一次。
+    """
+    mode = PIXMAP_MODES[(pixmap.n, bool(pixmap.alpha))]
+    return Image.frombuffer(
+        mode,
+        (pixmap.width, pixmap.height),
+        pixmap.samples_mv,
+        "raw",
+        mode,
+        pixmap.stride,
+        1,
+    )
+
+
+# 編碼參數：{PIL 格式: {參數: 值}} (傳給 `Image.save`，未列出的格式使用 PIL 預設值)
+EncodeParams = Mapping[str, Mapping[str, int | bool]]
+
+# 編碼 profile (balanced 即 PIL 預設值)
+ENCODE_PROFILES: dict[str, dict[str, dict[str, int | bool]]] = {
+    "fast": {
+        "PNG": {"compress_level": 1},
+        "WEBP": {"method": 0},
+    },
+    "balanced": {},
+    "small": {
+        "PNG": {"compress_level": 9},
+        "WEBP": {"method": 6},
+        "JPEG": {"optimize": True, "progressive": True},
+    },
+}
+
+# 可調整的編碼參數 (PIL 格式 -> 參數 -> 型別)
+ENCODE_OPTIONS: dict[str, dict[str, type]] = {
+    "PNG": {"compress_level": int, "compress_type": int, "optimize": bool},
+    "WEBP": {"quality": int, "method": int, "lossless": bool},
+    "JPEG": {"quality": int, "optimize": bool, "progressive": bool, "subsampling": int},
+}
+
+
+def get_pil_format(format: str) -> str:
+    """
+    副檔名對應的 PIL 格式 (for example: "jpg" -> "JPEG")
+
+    Raises
+    ------
+    + ValueError
+        未知或 PIL 無法寫出的格式所引起的錯誤
+    """
+    pil_format = Image.registered_extensions().get(f".{format.lower()}")
+    if pil_format is None or pil_format not in Image.SAVE:  # 例如只能讀取的 psd
+        raise ValueError(f"unknown image format: {format!r}")
+    return pil_format
+
+
+def build_encode_params(
+    profile: str = "balanced", options: Iterable[tuple[str, str, int | bool]] = ()
+) -> dict[str, dict[str, int | bool]]:
+    """
+    以 profile 為基礎，再套用個別指定的參數
+
+    Parameters
+    ----------
+    + `profile` : str
+        "fast" | "balanced" | "small"
+    + `options` : Iterable[tuple[str, str, int | bool]]
+        (副檔名, 參數, 值)，例如 `[("png", "compress_level", 3)]`
+
+    Returns
+    -------
+    + dict[str, dict[str, int | bool]]
+        {PIL 格式: {參數: 值}}
+
+    Raises
+    ------
+    + ValueError
+        未知的 profile、格式或參數，或值的型別不符所引起的錯誤
+    """
+    if profile not in ENCODE_PROFILES:
+        raise ValueError(f"unknown encode profile: {profile!r}")
+    params = {name: dict(values) for name, values in ENCODE_PROFILES[profile].items()}
+    for format, key, value in options:
+        pil_format = Image.registered_extensions().get(f".{format.lower()}")
+        if pil_format not in ENCODE_OPTIONS:
+            raise ValueError(f"no encode options for format: {format!r}")
+        value_type = ENCODE_OPTIONS[pil_format].get(key)
+        if value_type is None:
+            raise ValueError(
+                f"unknown {format} encode option: {key!r} "
+                f"(choose from {', '.join(ENCODE_OPTIONS[pil_format])})"
+            )
+        if type(value) is not value_type:
+            raise ValueError(f"{format} encode option {key!r} must be {value_type.__name__}")
+        params.setdefault(pil_format, {})[key] = value
+    return params
+
+
+def image_to_bytes(
+    image_file: Image.Image, format: str, params: EncodeParams | None = None
+) -> bytes:
+    """
+    將 image 編碼為指定格式 (in memory)
+
+    Parameters
+    ----------
+    + `image_file` : Image.Image
+    + `format` : str
+        副檔名 (for example: "png", "jpg", "webp")
+    + `params` : EncodeParams | None
+        編碼參數 (見 `build_encode_params`)，預設使用 PIL 預設值
+
+    Returns
+    -------
+    + bytes
+        編碼後的檔案內容
+    """
+    pil_format = get_pil_format(format)
+    buffer = io.BytesIO()
+    image_file.save(buffer, pil_format, **(params or {}).get(pil_format, {}))
+    return buffer.getvalue()
+
+
+# MuPDF 的 image 解析度 (DPI)：未記錄時的預設值，與視為合理的範圍
+DEFAULT_DPI = 96
+SANE_DPI = 72
+INSANE_DPI = 4800
+
+
+def image_page_size(header: Image.Image) -> tuple[float, float]:
+    """
+    依 image 解析度換算的頁面大小 (pt)，與 MuPDF 開啟 image 時的頁面大小相同
+
+    Parameters
+    ----------
+    + `header` : Image.Image
+        以 `Image.open` 開啟 (只讀取 header) 的 JPEG 或 PNG
+        (其餘格式 MuPDF 各有不同的解析度處理，不適用)
+
+    Returns
+    -------
+    + tuple[float, float]
+        (寬, 高)
+    """
+    dpi = header.info.get("dpi", (DEFAULT_DPI, DEFAULT_DPI))
+    xres, yres = round(dpi[0]), round(dpi[1])
+    if header.format == "PNG":  # MuPDF 讀取 PNG 時只採用水平解析度
+        yres = xres
+    if xres <= 0 or yres <= 0:
+        xres = yres = SANE_DPI
+    if min(xres, yres) < SANE_DPI or max(xres, yres) > INSANE_DPI:
+        # 不合理的解析度：保留長寬比，將較小者設為 72；仍不合理則一律 72
+        if xres < yres:
+            xres, yres = SANE_DPI, yres * SANE_DPI // xres
+        elif xres > yres:
+            xres, yres = xres * SANE_DPI // yres, SANE_DPI
+        if xres == yres or max(xres, yres) > INSANE_DPI:
+            xres = yres = SANE_DPI
+
+    width, height = header.size
+    return width * 72 / xres, height * 72 / yres
+
+
+# JPEG (PIL mode) 對應的 PDF 色彩空間
+JPEG_COLORSPACES = {"L": "/DeviceGray", "RGB": "/DeviceRGB", "CMYK": "/DeviceCMYK"}
+
+
+def jpeg_xobject(header: Image.Image, data: bytes) -> tuple[str, bytes] | None:
+    """
+    將 JPEG 原封不動作為 image XObject 的 DCTDecode stream
+
+    Parameters
+    ----------
+    + `header` : Image.Image
+        以 `Image.open` 開啟 (只讀取 header) 的 JPEG
+    + `data` : bytes
+        JPEG 檔案內容
+
+    Returns
+    -------
+    + tuple[str, bytes] | None
+        (XObject 字典, stream)；若 JPEG 無法直接嵌入 (如含 ICC profile)，回傳 None
+    """
+    colorspace = JPEG_COLORSPACES.get(header.mode)
+    if colorspace is None or "icc_profile" in header.info:
+        return None
+
+    width, height = header.size
+    decode = ""
+    if header.mode == "CMYK" and "adobe" in header.info:  # Adobe CMYK JPEG 為反相儲存
+        decode = "/Decode[1 0 1 0 1 0 1 0]"
+
+    xobject = (
+        f"<</Type/XObject/Subtype/Image/Width {width}/Height {height}"
+        f"/ColorSpace {colorspace}/BitsPerComponent 8{decode}/Filter/DCTDecode>>"
+    )
+    return xobject, data
+
+
+def add_image_xobject(doc: fitz.Document, xobject: str, stream: bytes) -> int:
+    """
+    將 (已壓縮的) image XObject 寫入 pdf
+
+    Returns
+    -------
+    + int
+        XObject 的 xref
+    """
+    xref = doc.get_new_xref()
+    doc.update_object(xref, xobject)
+    doc.update_stream(xref, stream, compress=False)  # 會移除 Filter 與 DecodeParms
+    doc.update_object(xref, xobject)  # 因此重新寫入字典
+    return xref
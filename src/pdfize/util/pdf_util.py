@@ -1,9 +1,16 @@
 # standard library
+import functools
+import math
+import os
+from collections.abc import Container, Sequence
 from pathlib import Path
 
 # third party library
 import fitz
 
+# local module
+from . import array_util
+
 
 def zero_base_indexing(page_num: int, page_count: int) -> int:
     """
@@ -31,47 +38,256 @@ def zero_base_indexing(page_num: int, page_count: int) -> int:
     return page_num
 
 
-def divide(page_count: int, workers: int) -> list[tuple[int, int]]:
+def count_range_pages(from_page: int, to_page: int, page_count: int) -> int:
+    """
+    計算頁碼範圍 (1-based indexing, 支援負數與倒序) 包含的頁數
+
+    Parameters
+    ----------
+    + `from_page` : int
+    + `to_page` : int
+    + `page_count` : int
+
+    Returns
+    -------
+    + int
+    """
+    from_page = zero_base_indexing(from_page, page_count)
+    to_page = zero_base_indexing(to_page, page_count)
+    return abs(to_page - from_page) + 1
+
+
+def burst_ranges(page_count: int, every: int) -> list[tuple[int, int]]:
     """
-    將給定頁數切成數份分給 workers，回傳每個 worker 負責的起終點頁碼
+    每 `every` 頁切成一份，回傳每一份的起終點頁碼
 
     Parameters
     ----------
     + `page_count` : int
         總頁數
+    + `every` : int
+        每份的頁數
+
+    Returns
+    -------
+    + list[tuple[int, int]]
+        每一份的起終點頁碼 (using 1-based indexing)
+
+    Example
+    -------
+    >>> burst_ranges(7, 3)
+    [(1, 3), (4, 6), (7, 7)]
+    """
+    assert every > 0
+    return [
+        (from_page, min(from_page + every - 1, page_count))
+        for from_page in range(1, page_count + 1, every)
+    ]
+
+
+# 成本估計的權重 (以「輸出像素」為單位)
+CONTENT_BYTE_COST = 500.0  # 每 byte content stream 的解譯成本
+IMAGE_PIXEL_COST = 1.0  # 每個內嵌圖片像素的解碼成本
+
+
+def estimate_page_cost(page: fitz.Page, dpi: int) -> float:
+    """
+    粗估渲染一頁的成本 (不渲染頁面)
+
+    成本 = 輸出像素數 (頁面面積 × DPI²) + content stream 長度 + 內嵌圖片像素數
+
+    Parameters
+    ----------
+    + `page` : fitz.Page
+    + `dpi` : int
+
+    Returns
+    -------
+    + float
+    """
+    doc = page.parent
+    zoom = dpi / 72
+    output_pixels = page.rect.width * page.rect.height * zoom * zoom
+
+    content_bytes = 0
+    for xref in page.get_contents():
+        length_type, length = doc.xref_get_key(xref, "Length")
+        if length_type == "int":
+            content_bytes += int(length)
+        else:  # 間接參照等情況，直接讀取 (未解壓縮的) stream
+            content_bytes += len(doc.xref_stream_raw(xref) or b"")
+
+    image_pixels = sum(image[2] * image[3] for image in page.get_images())
+
+    return output_pixels + content_bytes * CONTENT_BYTE_COST + image_pixels * IMAGE_PIXEL_COST
+
+
+def estimate_page_costs(
+    filepath: str | Path, dpi: int, *, pages: Container[int] | None = None
+) -> list[float]:
+    """
+    粗估一份 pdf 每一頁的渲染成本
+
+    Parameters
+    ----------
+    + `pages` : Container[int] | None
+        只估計這些頁碼 (0-based indexing)，其餘頁面的成本為 0 (例如已有快取)
+
+    Returns
+    -------
+    + list[float]
+        每一頁的成本 (0-based indexing)
+    """
+    with fitz.open(filepath) as doc:
+        return [
+            estimate_page_cost(doc[page_index], dpi)
+            if pages is None or page_index in pages
+            else 0.0
+            for page_index in range(doc.page_count)
+        ]
+
+
+# 記憶體估計：PIL 以 4 bytes/pixel 儲存 RGB image (編碼時 pixmap 之外的一份副本)
+PIL_RGB_BYTES_PER_PIXEL = 4
+
+
+def estimate_raster_sizes(
+    filepath: str | Path, dpi: int, *, pages: Container[int] | None = None
+) -> list[int]:
+    """
+    預測一份 pdf 每一頁在 `dpi` 下的 pixmap 大小 (不渲染頁面)
+
+    大小 = 頁面面積 × DPI² × 通道數
+
+    Parameters
+    ----------
+    + `pages` : Container[int] | None
+        只估計這些頁碼 (0-based indexing)，其餘頁面為 0
+
+    Returns
+    -------
+    + list[int]
+        每一頁的 pixmap 大小 (bytes，0-based indexing)
+    """
+    with fitz.open(filepath) as doc:
+        return [
+            math.prod(array_util.page_shape(doc[page_index], dpi))
+            if pages is None or page_index in pages
+            else 0
+            for page_index in range(doc.page_count)
+        ]
+
+
+def estimate_task_memory(raster_sizes: Sequence[int], *, in_flight: int, copies: int = 0) -> int:
+    """
+    粗估一個任務 (依序渲染 `raster_sizes` 的各頁) 在 worker 中的記憶體峰值
+
+    同時存在最大的 `in_flight` 張 pixmap，其中 `copies` 張正在編碼 (另有一份 PIL image)
+
+    Parameters
+    ----------
+    + `raster_sizes` : Sequence[int]
+        任務中每一張 pixmap 的大小 (bytes)
+    + `in_flight` : int
+        worker 中同時存在的 pixmap 數上限
+    + `copies` : int
+        同時編碼的 image 數上限
+
+    Returns
+    -------
+    + int
+        bytes
+
+    Example
+    -------
+    >>> estimate_task_memory([300, 600, 300], in_flight=2, copies=1)
+    1700
+    """
+    largest = sorted(raster_sizes, reverse=True)
+    copy_bytes = sum(largest[:copies]) * PIL_RGB_BYTES_PER_PIXEL // array_util.CHANNELS
+    return sum(largest[:in_flight]) + copy_bytes
+
+
+def make_work_units(
+    costs: Sequence[float], workers: int, *, units_per_worker: int = 4
+) -> list[range]:
+    """
+    將頁面切成成本相近的連續小工作單元，並依成本由高到低排序
+    (搭配共享的任務佇列，先做大工作，後以小工作填補空檔)
+
+    Parameters
+    ----------
+    + `costs` : Sequence[float]
+        每一頁的成本 (0-based indexing)
     + `workers` : int
         有幾個 workers 要分擔工作
+    + `units_per_worker` : int
+        平均每個 worker 分到的工作單元數 (越多越平均，但排程開銷越大)
 
     Returns
     -------
-    + list[tuple[int, int]]
-        每個 worker 負責的起終點頁碼 (using 1-based indexing)
+    + list[range]
+        每個工作單元負責的頁碼 (using 0-based indexing)
 
     Example
     -------
-    >>> divide(250, 5)
-    [(1, 50), (51, 100), (101, 150), (151, 200), (201, 250)]
-    >>> divide(254, 5)
-    [(1, 51), (52, 102), (103, 153), (154, 204), (205, 254)]
-    >>> divide(3, 5)
-    AssertionError
+    >>> make_work_units([1, 1, 1, 1, 8, 8], 2, units_per_worker=2)
+    [range(4, 5), range(5, 6), range(0, 4)]
     """
-    assert page_count >= workers
+    assert workers > 0 and units_per_worker > 0
+    if not costs:
+        return []
 
-    pages_per_worker = page_count // workers
-    remainder = page_count % workers
+    unit_cost = sum(costs) / (workers * units_per_worker)  # 每個工作單元的目標成本
+    units: list[tuple[float, range]] = []
+    start = 0
+    accumulated = 0.0
+    for page_index, cost in enumerate(costs):
+        # 若加入此頁 (的一半以上) 會超過目標成本，先結束目前的工作單元
+        if page_index > start and accumulated + cost / 2 > unit_cost:
+            units.append((accumulated, range(start, page_index)))
+            start = page_index
+            accumulated = 0.0
+        accumulated += cost
+    units.append((accumulated, range(start, len(costs))))
 
-    page_ranges = []
-    start_page = 1
+    units.sort(key=lambda unit: unit[0], reverse=True)  # 穩定排序，同成本保持頁碼順序
+    return [unit for _, unit in units]
+
+
+def group_by_size(
+    filepaths: Sequence[Path], budget: int, *, min_groups: int = 1
+) -> list[list[Path]]:
+    """
+    依序將檔案分組，每組的檔案大小總和不超過 `budget`
+    (單一檔案超過 `budget` 時自成一組)
 
-    for i in range(workers):
-        end_page = start_page + pages_per_worker - 1
-        if i < remainder:
-            end_page += 1
-        page_ranges.append((start_page, end_page))
-        start_page = end_page + 1
+    Parameters
+    ----------
+    + `filepaths` : Sequence[Path]
+    + `budget` : int
+        每組的檔案大小上限 (bytes)
+    + `min_groups` : int
+        希望至少分成幾組 (檔案夠多時)，以便平行處理
+
+    Returns
+    -------
+    + list[list[Path]]
+        保持原順序的分組
+    """
+    sizes = [os.path.getsize(filepath) for filepath in filepaths]
+    budget = min(budget, math.ceil(sum(sizes) / min_groups))
 
-    return page_ranges
+    groups: list[list[Path]] = []
+    group_size = 0
+    for filepath, size in zip(filepaths, sizes, strict=True):
+        if not groups or group_size + size > budget:
+            groups.append([])
+            group_size = 0
+        groups[-1].append(filepath)
+        group_size += size
+
+    return groups
 
 
 def get_pdf_page_count(filepath: str | Path) -> int:
@@ -82,3 +298,28 @@ def get_pdf_page_count(filepath: str | Path) -> int:
     doc.close()
 
     return page_count
+
+
+def get_pdf_page_counts(filepaths: Sequence[str | Path]) -> list[int]:
+    """
+    多份 pdf 的頁數 (一次計算一批，減少進程間傳遞的次數)
+    """
+    return [get_pdf_page_count(filepath) for filepath in filepaths]
+
+
+@functools.lru_cache(maxsize=8)
+def _open_document(filepath: str, size: int, mtime_ns: int) -> fitz.Document:
+    return fitz.open(filepath)
+
+
+def open_cached(filepath: str | Path) -> fitz.Document:
+    """
+    開啟 pdf 並保留在目前進程中 (同一份 pdf 的後續任務不必重新解析；檔案改變時重新開啟)
+
+    Note
+    ----
+    回傳的 document 由快取共用，不可關閉
+    """
+    filepath = os.path.abspath(filepath)
+    stat = os.stat(filepath)
+    return _open_document(filepath, stat.st_size, stat.st_mtime_ns)
@@ -0,0 +1,117 @@
+# standard library
+import contextlib
+import json
+import math
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+
+# third party library
+import fitz
+from PIL import Image
+
+# local module
+from . import image_util
+
+SPRITE_BACKGROUND = (255, 255, 255)
+
+
+def fit_matrix(rect: fitz.Rect, box: tuple[int, int]) -> fitz.Matrix:
+    """
+    將頁面等比例縮放至剛好放進 `box` 的矩陣
+
+    Parameters
+    ----------
+    + `box` : tuple[int, int]
+        (width, height) pixels
+    """
+    width, height = box
+    zoom = min(width / rect.width, height / rect.height)
+    return fitz.Matrix(zoom, zoom)
+
+
+@contextlib.contextmanager
+def aa_level_context(level: int) -> Iterator[None]:
+    """
+    暫時設定 MuPDF 的 antialias 等級 (0 ~ 8，整個 process 共用)，離開時分別還原圖形與文字的等級
+    """
+    previous = fitz.TOOLS.show_aa_level()
+    fitz.TOOLS.set_aa_level(level)
+    try:
+        yield
+    finally:
+        # fitz.TOOLS 只能同時設定兩者，因此直接呼叫 MuPDF
+        # (設定圖形等級時會一併設定文字，需先還原圖形)
+        fitz.mupdf.fz_set_graphics_aa_level(previous["graphics"])
+        fitz.mupdf.fz_set_text_aa_level(previous["text"])
+
+
+def render_thumbnail(
+    page: fitz.Page, box: tuple[int, int], *, aa_level: int, annots: bool
+) -> Image.Image:
+    """
+    渲染一頁的縮圖 (不超過 `box`，保持長寬比)
+
+    Parameters
+    ----------
+    + `aa_level` : int
+        antialias 等級 (縮圖通常 0 ~ 2 即足夠，等級越低越快)
+    + `annots` : bool
+        是否渲染 annotations
+
+    Returns
+    -------
+    + Image.Image
+        RGB image
+    """
+    with aa_level_context(aa_level):
+        pixmap = page.get_pixmap(matrix=fit_matrix(page.rect, box), annots=annots)
+    return image_util.pixmap_to_image(pixmap)  # RGB 由 PIL 解包 (不與 pixmap 共用記憶體)
+
+
+def write_sprite(
+    sprite_path: Path,
+    thumbnails: Sequence[tuple[int, Image.Image]],
+    box: tuple[int, int],
+    *,
+    columns: int,
+    pdf_path: Path,
+    params: image_util.EncodeParams | None = None,
+) -> None:
+    """
+    將一份 pdf 的所有縮圖排成一張 sprite sheet (每格大小為 `box`)，並寫出 sidecar index (`.json`)
+
+    Parameters
+    ----------
+    + `sprite_path` : Path
+        輸出的 sprite sheet (副檔名即格式)
+    + `thumbnails` : Sequence[tuple[int, Image.Image]]
+        (頁碼 (0-based indexing), 縮圖)，依頁碼排序
+    + `columns` : int
+        每列的格數
+    + `params` : EncodeParams | None
+        編碼參數 (見 `image_util.build_encode_params`)
+    """
+    box_width, box_height = box
+    columns = max(1, min(columns, len(thumbnails)))
+    rows = max(1, math.ceil(len(thumbnails) / columns))
+    sprite = Image.new("RGB", (columns * box_width, rows * box_height), SPRITE_BACKGROUND)
+
+    pages = []
+    for cell, (page_index, thumbnail) in enumerate(thumbnails):
+        x = cell % columns * box_width
+        y = cell // columns * box_height
+        sprite.paste(thumbnail, (x, y))
+        pages.append(
+            {
+                "page": page_index + 1,
+                "x": x,
+                "y": y,
+                "width": thumbnail.width,
+                "height": thumbnail.height,
+            }
+        )
+
+    sprite_path.write_bytes(image_util.image_to_bytes(sprite, sprite_path.suffix[1:], params))
+    index = {"pdf": str(pdf_path), "box": list(box), "columns": columns, "pages": pages}
+    with open(sprite_path.with_suffix(".json"), "w", encoding="utf-8") as index_file:
+        json.dump(index, index_file, indent=2)
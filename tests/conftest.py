@@ -0,0 +1,25 @@
+# standard library
+from pathlib import Path
+
+# third party library
+import fitz
+import pytest
+
+PAGES = 5
+
+
+@pytest.fixture
+def pdf_path(tmp_path: Path) -> Path:
+    """
+    含文字與圖形的 pdf (每一頁內容不同)
+    """
+    path = tmp_path / "input.pdf"
+    with fitz.open() as pdf_file:
+        for page_index in range(PAGES):
+            page = pdf_file.new_page(width=300, height=400)
+            page.insert_text((40, 60 + 10 * page_index), f"page {page_index + 1}", fontsize=24)
+            page.draw_circle(
+                (150, 250), 40 + 10 * page_index, color=(0.2, 0.4, 0.8), fill=(1, 0.8, 0)
+            )
+        pdf_file.save(path)
+    return path
@@ -0,0 +1,29 @@
+# standard library
+import subprocess
+import sys
+
+# third party library
+import pytest
+
+HEAVY_MODULES = {"fitz", "pymupdf", "PIL", "tqdm"}  # 只在需要的子命令中載入
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["-c", "import pdfize.__main__"],
+        ["-m", "pdfize", "--help"],
+        ["-m", "pdfize", "pdf-to-img", "--help"],
+    ],
+)
+def test_cli_help_does_not_import_heavy_modules(args: list[str]) -> None:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args], capture_output=True, text=True, check=True
+    )
+    imported = {
+        line.rsplit("|", 1)[1].strip().split(".")[0]
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    assert "pdfize" in imported
+    assert not imported & HEAVY_MODULES
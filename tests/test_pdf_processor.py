@@ -0,0 +1,159 @@
+# standard library
+import io
+from pathlib import Path
+
+# third party library
+import fitz
+import pytest
+from PIL import Image
+
+# local module
+from pdfize.cache.render_cache import RenderCache
+from pdfize.checkpoint.journal import JOURNAL_NAME, Journal
+from pdfize.processor.pdf_processor import PdfParallelProcessor, PdfSingleProcessor
+
+DPI = 72
+
+
+def read_images(directory: Path) -> dict[str, bytes]:
+    """
+    目錄中的 image (不含續傳紀錄等隱藏檔)
+    """
+    return {
+        path.name: path.read_bytes()
+        for path in sorted(directory.iterdir())
+        if not path.name.startswith(".")
+    }
+
+
+@pytest.fixture
+def rendered(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    """
+    紀錄實際渲染的頁碼
+    """
+    pages: list[int] = []
+    render_page = PdfSingleProcessor._render_page
+
+    def spy(self, page, dpis):
+        pages.append(page.number)
+        return render_page(self, page, dpis)
+
+    monkeypatch.setattr(PdfSingleProcessor, "_render_page", spy)
+    return pages
+
+
+def test_png_is_built_from_pixmap_samples(pdf_path: Path) -> None:
+    with fitz.open(pdf_path) as pdf_file:
+        expected = [page.get_pixmap(dpi=DPI).samples for page in pdf_file]
+
+    images = PdfSingleProcessor(str(pdf_path)).iter_images(DPI, "png")
+    for (_, image), samples in zip(images, expected, strict=True):
+        with Image.open(io.BytesIO(image)) as image_file:
+            assert image_file.mode == "RGB"
+            assert image_file.tobytes() == samples
+
+
+@pytest.mark.parametrize("format", ["png", "jpeg"])
+def test_to_images_writes_iter_images(pdf_path: Path, tmp_path: Path, format: str) -> None:
+    processor = PdfSingleProcessor(str(pdf_path))
+    processor.to_images(tmp_path / "out", DPI, format, subdir=False)
+
+    expected = {
+        f"input-{page_index + 1}.{format}": image
+        for page_index, image in processor.iter_images(DPI, format)
+    }
+    assert read_images(tmp_path / "out") == expected
+
+
+@pytest.mark.parametrize("format", ["png", "jpeg"])
+def test_parallel_matches_single(pdf_path: Path, tmp_path: Path, format: str) -> None:
+    PdfSingleProcessor(str(pdf_path)).to_images(tmp_path / "single", DPI, format, subdir=False)
+    PdfParallelProcessor(str(pdf_path), workers=2).to_images(
+        tmp_path / "parallel", DPI, format, subdir=False
+    )
+
+    assert read_images(tmp_path / "parallel") == read_images(tmp_path / "single")
+
+
+@pytest.mark.parametrize("processor_class", [PdfSingleProcessor, PdfParallelProcessor])
+def test_unknown_format_fails_before_rendering(
+    pdf_path: Path, tmp_path: Path, processor_class: type[PdfSingleProcessor], rendered: list[int]
+) -> None:
+    processor = processor_class(str(pdf_path))
+    with pytest.raises(ValueError, match="unknown image format: 'xyz'"):
+        next(processor.iter_images(DPI, "xyz"))
+    with pytest.raises(ValueError, match="unknown image format: 'psd'"):
+        processor.to_images(tmp_path / "out", DPI, "png", subdir=False, specs=[(DPI, "psd", "-x")])
+
+    assert rendered == []
+    assert not (tmp_path / "out").exists()
+
+
+def test_resume_renders_only_unfinished_pages(
+    pdf_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, rendered: list[int]
+) -> None:
+    PdfSingleProcessor(str(pdf_path)).to_images(tmp_path / "expected", DPI, "png", subdir=False)
+
+    with monkeypatch.context() as interrupted:  # 不刪除紀錄，如同中斷的工作
+        interrupted.setattr(Journal, "finish", Journal.close)
+        PdfSingleProcessor(str(pdf_path), resume=True).to_images(
+            tmp_path / "out", DPI, "png", subdir=False
+        )
+    assert (tmp_path / "out" / JOURNAL_NAME).exists()
+    (tmp_path / "out" / "input-2.png").unlink()  # 未寫入的頁面
+    (tmp_path / "out" / "input-4.png").write_bytes(b"partial")  # 寫到一半的頁面
+
+    rendered.clear()
+    PdfSingleProcessor(str(pdf_path), resume=True).to_images(
+        tmp_path / "out", DPI, "png", subdir=False
+    )
+
+    assert rendered == [1, 3]
+    assert not (tmp_path / "out" / JOURNAL_NAME).exists()
+    assert read_images(tmp_path / "out") == read_images(tmp_path / "expected")
+
+
+def test_resume_rejects_other_jobs(pdf_path: Path, tmp_path: Path) -> None:
+    (tmp_path / "out").mkdir()
+    (tmp_path / "out" / "other.txt").write_text("not ours")
+    with pytest.raises(FileExistsError, match="no journal"):
+        PdfSingleProcessor(str(pdf_path), resume=True).to_images(
+            tmp_path / "out", DPI, "png", subdir=False
+        )
+
+    Journal(tmp_path / "job", {"dpi": DPI}).begin()
+    with pytest.raises(FileExistsError, match="different job"):
+        PdfSingleProcessor(str(pdf_path), resume=True).to_images(
+            tmp_path / "job", DPI, "png", subdir=False
+        )
+
+
+def test_cache_key_includes_band_size(
+    pdf_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    hits: list[bool] = []
+    fetch = RenderCache.fetch
+
+    def spy(self, page_key, image_path):
+        hit = fetch(self, page_key, image_path)
+        hits.append(hit)
+        return hit
+
+    monkeypatch.setattr(RenderCache, "fetch", spy)
+
+    def convert(output: str, band_size: int | None) -> None:
+        hits.clear()
+        PdfSingleProcessor(
+            str(pdf_path), band_size=band_size, cache=RenderCache(tmp_path / "cache")
+        ).to_images(tmp_path / output, DPI, "png", subdir=False)
+
+    convert("whole", None)
+    assert hits == [False] * 5
+    convert("banded", 100_000)  # 整頁為 300 x 400 x 3 bytes，分成 4 條
+    assert hits == [False] * 5  # 整頁編碼的快取不適用
+    convert("banded-again", 100_000)
+    assert hits == [True] * 5
+    convert("whole-again", None)
+    assert hits == [True] * 5
+    assert read_images(tmp_path / "whole-again") == read_images(tmp_path / "whole")
+    assert read_images(tmp_path / "banded-again") == read_images(tmp_path / "banded")